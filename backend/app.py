@@ -8,6 +8,16 @@ from solana.system_program import TransferParams, transfer
 from solana.rpc.types import TxOpts
 import asyncio
 import base64
+import sys
+from pathlib import Path
+
+# Modulele comune (solana_rpc, solana_scan) sunt în rădăcina proiectului
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from solana_rpc import SolanaRpc
+from solana_scan import find_transaction
 
 app = FastAPI()
 
@@ -20,6 +30,28 @@ OWNER_PUBLIC_KEY = OWNER_WALLET.public_key
 # Preț fix NRG în SOL pentru demo
 NRG_PRICE_SOL = 0.01  # de ex 0.01 SOL per 1 NRG
 
+# Un singur client per proces pentru toate cererile, în loc de unul nou la fiecare cumpărare
+rpc = SolanaRpc(SOLANA_RPC)
+solana_client = None
+
+def get_solana_client():
+    global solana_client
+    if solana_client is None:
+        solana_client = AsyncClient(SOLANA_RPC)
+    return solana_client
+
+def has_instructions(tx_data):
+    # Aici se poate analiza dacă instrucțiunea e transfer SOL la owner
+    # (Pentru demo simplificat, să presupunem că buyer confirmă și continuăm)
+    message = (tx_data.get("transaction") or {}).get("message") or {}
+    return bool(message.get("instructions"))
+
+@app.on_event("shutdown")
+async def close_clients():
+    await rpc.close()
+    if solana_client is not None:
+        await solana_client.close()
+
 class BuyRequest(BaseModel):
     buyer_pubkey: str  # Wallet-ul cumpărătorului
     amount_nrg: int    # Câte tokenuri NRG vrea să cumpere
@@ -29,45 +61,28 @@ async def buy_nrg(req: BuyRequest):
     buyer_pk = PublicKey(req.buyer_pubkey)
     amount_sol = req.amount_nrg * NRG_PRICE_SOL
 
-    async with AsyncClient(SOLANA_RPC) as client:
-        # Verifică dacă buyer a trimis suficient SOL la owner
-        # Caută tranzacții recente de transfer SOL de la buyer la owner
-        confirmed = False
-        resp = await client.get_signatures_for_address(buyer_pk, limit=10)
-        if not resp["result"]:
-            raise HTTPException(status_code=400, detail="Nu s-au găsit tranzacții recente")
-
-        # Verifică dacă vreo tranzacție e transfer SOL către owner cu suma necesară
-        for sig_info in resp["result"]:
-            tx_sig = sig_info["signature"]
-            tx_resp = await client.get_transaction(tx_sig)
-            if not tx_resp["result"]:
-                continue
-            tx = tx_resp["result"]["transaction"]
-            message = tx["message"]
-            for instr in message["instructions"]:
-                # Aici se poate analiza dacă instrucțiunea e transfer SOL la owner
-                # (Pentru demo simplificat, să presupunem că buyer confirmă și continuăm)
-                confirmed = True
-                break
-            if confirmed:
-                break
-        if not confirmed:
-            raise HTTPException(status_code=400, detail="Nu s-a confirmat plata")
+    # Verifică dacă buyer a trimis suficient SOL la owner: ultimele 10 tranzacții
+    # se cer în paralel și căutarea se oprește la prima potrivire
+    scan = await find_transaction(rpc, str(buyer_pk), has_instructions, limit=10)
+    if not scan.signatures:
+        raise HTTPException(status_code=400, detail="Nu s-au găsit tranzacții recente")
+    if not scan.found:
+        raise HTTPException(status_code=400, detail="Nu s-a confirmat plata")
 
-        # Trimite tokenii NRG către buyer (simplificat: trimitere SOL înapoi ca demo)
-        # În realitate, folosește program token SPL să trimiți token NRG
-        tx = Transaction()
-        transfer_instruction = transfer(
-            TransferParams(
-                from_pubkey=OWNER_PUBLIC_KEY,
-                to_pubkey=buyer_pk,
-                lamports=int(amount_sol * 1_000_000_000),  # convert SOL to lamports
-            )
+    client = get_solana_client()
+    # Trimite tokenii NRG către buyer (simplificat: trimitere SOL înapoi ca demo)
+    # În realitate, folosește program token SPL să trimiți token NRG
+    tx = Transaction()
+    transfer_instruction = transfer(
+        TransferParams(
+            from_pubkey=OWNER_PUBLIC_KEY,
+            to_pubkey=buyer_pk,
+            lamports=int(amount_sol * 1_000_000_000),  # convert SOL to lamports
         )
-        tx.add(transfer_instruction)
-        try:
-            res = await client.send_transaction(tx, OWNER_WALLET, opts=TxOpts(skip_confirmation=False))
-            return {"success": True, "tx_signature": res["result"]}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    )
+    tx.add(transfer_instruction)
+    try:
+        res = await client.send_transaction(tx, OWNER_WALLET, opts=TxOpts(skip_confirmation=False))
+        return {"success": True, "tx_signature": res["result"]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
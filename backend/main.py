@@ -1,22 +1,22 @@
 import os
-import json
 from pathlib import Path
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from solana.rpc.api import Client
-from solana.publickey import PublicKey
 from pydantic import BaseModel
-from tensorflow.keras.models import load_model
 from predict_lstm_pro import predict as get_prediction_for_symbol
+from quota_store import QuotaStore
+from symbol_catalog import SymbolCatalog
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
 SOLANA_RPC = "https://api.mainnet-beta.solana.com"
-NRG_TOKEN_MINT = PublicKey("CBTuVEM1Z5z5ddfQVEGAAHPN1ckj6j97zHvKtrc78suj")
+NRG_TOKEN_MINT = "CBTuVEM1Z5z5ddfQVEGAAHPN1ckj6j97zHvKtrc78suj"
 
 BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
 
 app = FastAPI()
 app.add_middleware(
@@ -27,7 +27,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-solana_client = Client(SOLANA_RPC)
+solana_client = None
+
+def get_solana_client():
+    # Clientul Solana (și importul lui) doar la prima verificare de plată
+    global solana_client
+    if solana_client is None:
+        from solana.rpc.api import Client
+        solana_client = Client(SOLANA_RPC)
+    return solana_client
 
 class PredictRequest(BaseModel):
     wallet: str
@@ -35,30 +43,14 @@ class PredictRequest(BaseModel):
     days: int
 
 PREDICTION_LIMIT = 5
-STORAGE_FILE = BASE_DIR / "usage.json"
-
-def load_usage():
-    if not STORAGE_FILE.exists():
-        return {}
-    with STORAGE_FILE.open("r") as f:
-        return json.load(f)
-
-def save_usage(data):
-    with STORAGE_FILE.open("w") as f:
-        json.dump(data, f)
-
-def increment_usage(user_id):
-    data = load_usage()
-    data[user_id] = data.get(user_id, 0) + 1
-    save_usage(data)
-    return max(0, PREDICTION_LIMIT - data[user_id])
-
-def get_remaining_predictions(user_id):
-    data = load_usage()
-    return max(0, PREDICTION_LIMIT - data.get(user_id, 0))
+# usage.json din backend (format vechi wallet -> int) se migrează la prima utilizare
+quota_store = QuotaStore(BASE_DIR / "usage.db", PREDICTION_LIMIT, BASE_DIR / "usage.json")
 
 def check_nrg_payment(wallet_address: str) -> bool:
+    from solana.publickey import PublicKey
+
     try:
+        solana_client = get_solana_client()
         pubkey = PublicKey(wallet_address)
         transactions = solana_client.get_signatures_for_address(pubkey).get("result", [])
         for tx in transactions:
@@ -71,7 +63,7 @@ def check_nrg_payment(wallet_address: str) -> bool:
             meta = tx_data.get("meta", {})
             post_token_balances = meta.get("postTokenBalances", [])
             for balance in post_token_balances:
-                if balance.get("mint") == str(NRG_TOKEN_MINT) and balance.get("owner") == wallet_address:
+                if balance.get("mint") == NRG_TOKEN_MINT and balance.get("owner") == wallet_address:
                     return True
         return False
     except Exception as e:
@@ -82,17 +74,20 @@ def check_nrg_payment(wallet_address: str) -> bool:
 def root():
     return {"status": "Backend NRG FastAPI online"}
 
+# /symbols răspunde din memorie; validatorul din fundal scoate modelele corupte
+catalog = SymbolCatalog(MODELS_DIR, SCALERS_DIR, DATA_DIR)
+
+@app.on_event("startup")
+def start_catalog():
+    catalog.start()
+
+@app.on_event("shutdown")
+def stop_catalog():
+    catalog.stop()
+
 @app.get("/symbols")
 def get_symbols():
-    symbols = []
-    for model_file in MODELS_DIR.glob("*_lstm_model.keras"):
-        try:
-            load_model(model_file, compile=False)
-            symbol = model_file.name.replace("_lstm_model.keras", "")
-            symbols.append(symbol)
-        except Exception as e:
-            print(f"❌ Model corupt: {model_file.name} → {e}")
-    return {"symbols": sorted(symbols)}
+    return {"symbols": catalog.symbols()}
 
 @app.post("/predict-lstm")
 async def predict_endpoint(request: PredictRequest):
@@ -108,14 +103,14 @@ async def predict_endpoint(request: PredictRequest):
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    remaining = get_remaining_predictions(user_id)
-    if remaining <= 0:
+    quota = quota_store.reserve(user_id)
+    if quota is None:
         return {"message": "Free predictions exhausted", "free_predictions_left": 0}
 
     try:
         result = get_prediction_for_symbol(request.symbol, request.wallet, request.days)
-        free_left = increment_usage(user_id)
-        return {"prediction": result, "free_predictions_left": free_left}
+        return {"prediction": result, "free_predictions_left": quota["remaining"]}
     except Exception as e:
+        quota_store.refund(user_id)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,39 @@
+import asyncio
+import sys
+import time
+from forecast_engine import forecast
+from inference_batcher import MicroBatcher, forecast_async
+from predict_lstm_pro import load_inputs
+
+# N cereri concurente pe același simbol, cu și fără micro-batching:
+#   python bench_batching.py bitcoin 64 30
+
+async def run(symbol, clients, days):
+    forward, scaler, window = load_inputs(symbol)
+    forecast(forward, scaler, window, 1)  # trace
+
+    start = time.perf_counter()
+    for _ in range(clients):
+        forecast(forward, scaler, window, days)
+    t_single = time.perf_counter() - start
+
+    batcher = MicroBatcher()
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        forecast_async(batcher, forward, scaler, window, days) for _ in range(clients)
+    ])
+    t_batched = time.perf_counter() - start
+
+    print(f"{clients} clients x {days}d on {symbol}:")
+    print(f"  batch-of-one: {t_single:.2f} s ({clients * days / t_single:.0f} steps/s)")
+    print(f"  micro-batched: {t_batched:.2f} s ({clients * days / t_batched:.0f} steps/s, x{t_single / t_batched:.1f})")
+    print(f"  {batcher.stats()}")
+
+def main():
+    symbol = sys.argv[1] if len(sys.argv) > 1 else "bitcoin"
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    asyncio.run(run(symbol, clients, days))
+
+if __name__ == "__main__":
+    main()
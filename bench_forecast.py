@@ -0,0 +1,50 @@
+import sys
+import time
+import numpy as np
+from model_registry import get_model
+from forecast_engine import forecast, get_forward
+from feature_store import last_window
+
+# Compară bucla veche (model.predict pe fiecare zi) cu motorul de rollout:
+#   python bench_forecast.py bitcoin 30
+
+def legacy_rollout(model, scaler, last_sequence, days):
+    lookback, n_features = last_sequence.shape
+    prices = []
+    for i in range(days):
+        input_seq = np.reshape(last_sequence, (1, lookback, n_features))
+        pred_scaled = model.predict(input_seq, verbose=0)[0][0]
+
+        last_day = last_sequence[-1].copy()
+        last_day[0] = pred_scaled
+        prices.append(scaler.inverse_transform([last_day])[0][0])
+
+        new_scaled_row = last_sequence[-1].copy()
+        new_scaled_row[0] = pred_scaled
+        last_sequence = np.vstack([last_sequence[1:], new_scaled_row])
+    return np.array(prices)
+
+def main():
+    symbol = sys.argv[1] if len(sys.argv) > 1 else "bitcoin"
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    loaded = get_model(symbol)
+    window = loaded.scaler.transform(last_window(symbol))
+    forward = get_forward(loaded.model)
+    forecast(forward, loaded.scaler, window, 1)  # trace
+
+    start = time.perf_counter()
+    old = legacy_rollout(loaded.model, loaded.scaler, window, days)
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = forecast(forward, loaded.scaler, window, days)
+    t_new = time.perf_counter() - start
+
+    same = np.array_equal(np.round(old, 2), np.round(new, 2))
+    print(f"{symbol} {days}d: model.predict {t_old * 1000:.1f} ms, rollout {t_new * 1000:.1f} ms "
+          f"(x{t_old / t_new:.1f}), max abs diff {np.max(np.abs(old - new)):.2e}, rounded equal: {same}")
+    sys.exit(0 if same else 1)
+
+if __name__ == "__main__":
+    main()
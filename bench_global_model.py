@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+
+# Modelul global vs. câte un LSTM per simbol, antrenate pe aceleași date fără ultimele
+# --holdout zile (într-un director temporar; models/ și scalers/ nu se ating):
+#  - timpul de antrenare (per simbol: secvențial, în același proces)
+#  - eroarea pe zilele reținute: pas cu pas (fereastra reală) și rollout pe tot orizontul
+#  - memoria rezidentă a unui proces care servește toate simbolurile, per mod
+#   python bench_global_model.py [--epochs 50] [--holdout 30] [simboluri...]
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure_rss(mode, symbols, models_dir, scalers_dir):
+    # Rulează în subproces, cu MODEL_MODE=mode: registrul încarcă modelele pentru toate simbolurile
+    from forecast_engine import get_forward
+    from model_registry import ModelRegistry
+
+    before = rss_mb()
+    start = time.perf_counter()
+    registry = ModelRegistry(max_bytes=1 << 40)
+    for symbol in symbols:
+        loaded = registry.get(symbol, models_dir, scalers_dir)
+        _, lookback, n_features = loaded.model.input_shape
+        get_forward(loaded.model)(np.zeros((1, lookback, n_features), dtype=np.float32))
+    print(json.dumps({
+        "mode": mode,
+        "load_seconds": time.perf_counter() - start,
+        "rss_before_mb": before,
+        "rss_after_mb": rss_mb(),
+        "loaded": registry.stats()["loaded"],
+    }))
+
+
+def train_per_symbol(series, models_dir, scalers_dir, epochs):
+    # Aceeași rețetă ca train_all_symbols.train_model (antrenament complet)
+    import joblib
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.callbacks import EarlyStopping
+    import windowing
+    from train_all_symbols import BATCH_SIZE, LOOKBACK, PATIENCE, build_model
+
+    start = time.perf_counter()
+    for symbol, data in series.items():
+        scaler = MinMaxScaler()
+        scaled = scaler.fit_transform(data)
+        model = build_model((LOOKBACK, data.shape[1]))
+        model.fit(windowing.dataset(scaled, LOOKBACK, BATCH_SIZE), epochs=epochs, verbose=0,
+                  callbacks=[EarlyStopping(monitor="loss", patience=PATIENCE, restore_best_weights=True)])
+        model.save(models_dir / f"{symbol}_lstm_model.keras")
+        joblib.dump(scaler, scalers_dir / f"{symbol}_lstm_scaler.save")
+    return time.perf_counter() - start
+
+
+def holdout_errors(forward, scaler, data, holdout, lookback):
+    # MAPE (%) pe ultimele `holdout` zile: un pas din ferestrele reale și rollout-ul complet
+    import windowing
+    from forecast_engine import forecast
+
+    scaled = scaler.transform(data)
+    actual = data[-holdout:, 0]
+    X, _ = windowing.windows(scaled[-(holdout + lookback):], lookback)
+    step = forward(np.ascontiguousarray(X, dtype=np.float32))[:, 0]
+    step = step * scaler.data_range_[0] + scaler.data_min_[0]
+    rollout = forecast(forward, scaler, scaled[-(holdout + lookback):-holdout], holdout)
+    mape = lambda predicted: float(np.mean(np.abs(predicted - actual) / np.abs(actual)) * 100)
+    return mape(step), mape(rollout)
+
+
+def disk_mb(paths):
+    return sum(p.stat().st_size for p in paths if p.exists()) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--holdout", type=int, default=30)
+    parser.add_argument("--rss", choices=["symbol", "global"], help=argparse.SUPPRESS)
+    parser.add_argument("--models", help=argparse.SUPPRESS)
+    parser.add_argument("--scalers", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    import global_model
+    if options.rss:
+        measure_rss(options.rss, options.symbols, Path(options.models), Path(options.scalers))
+        return
+
+    import joblib
+    import feature_store
+    from forecast_engine import get_forward
+    from tensorflow.keras.models import load_model
+
+    symbols = options.symbols or global_model.data_symbols()
+    series = global_model.load_series(symbols, holdout=options.holdout)
+    symbols = list(series)
+    tmp = Path(tempfile.mkdtemp(prefix="bench_global_"))
+    models_dir, scalers_dir = tmp / "models", tmp / "scalers"
+    models_dir.mkdir()
+    scalers_dir.mkdir()
+    print(f"{len(symbols)} simboluri, {options.epochs} epoci max, ultimele {options.holdout} zile reținute")
+
+    per_symbol_seconds = train_per_symbol(series, models_dir, scalers_dir, options.epochs)
+    start = time.perf_counter()
+    shared_info = global_model.train(symbols, models_dir, scalers_dir, epochs=options.epochs,
+                                     holdout=options.holdout, force=True, verbose=0)
+    global_seconds = time.perf_counter() - start
+    shared = global_model.GlobalModel(*global_model.global_paths(models_dir, scalers_dir))
+
+    print(f"\n  {'simbol':<22}{'per simbol: pas':>17}{'rollout':>9}{'global: pas':>13}{'rollout':>9}")
+    rows = []
+    for symbol in symbols:
+        data = np.asarray(feature_store.load(symbol))
+        own = load_model(models_dir / f"{symbol}_lstm_model.keras", compile=False)
+        own_scaler = joblib.load(scalers_dir / f"{symbol}_lstm_scaler.save")
+        view = shared.view(symbol)
+        own_err = holdout_errors(get_forward(own), own_scaler, data, options.holdout, global_model.LOOKBACK)
+        shared_err = holdout_errors(view.forward, view.scaler, data, options.holdout, global_model.LOOKBACK)
+        rows.append((*own_err, *shared_err))
+        print(f"  {symbol:<22}{own_err[0]:>16.2f}%{own_err[1]:>8.2f}%{shared_err[0]:>12.2f}%{shared_err[1]:>8.2f}%")
+    errors = np.array(rows)
+
+    print(f"\nAntrenare: per simbol {per_symbol_seconds:.0f}s, global {global_seconds:.0f}s "
+          f"({shared_info['epochs']} epoci, {shared_info['windows']} ferestre)")
+    print(f"MAPE median pas: per simbol {np.median(errors[:, 0]):.2f}%, global {np.median(errors[:, 2]):.2f}% "
+          f"(global mai bun la {int((errors[:, 2] < errors[:, 0]).sum())}/{len(rows)})")
+    print(f"MAPE median rollout {options.holdout} zile: per simbol {np.median(errors[:, 1]):.2f}%, "
+          f"global {np.median(errors[:, 3]):.2f}% (global mai bun la {int((errors[:, 3] < errors[:, 1]).sum())}/{len(rows)})")
+    own_files = [d / f"{s}{suffix}" for s in symbols
+                 for d, suffix in ((models_dir, "_lstm_model.keras"), (scalers_dir, "_lstm_scaler.save"))]
+    print(f"Pe disc: per simbol {disk_mb(own_files):.1f} MB, global "
+          f"{disk_mb(global_model.global_paths(models_dir, scalers_dir)):.1f} MB")
+
+    print("\nMemorie rezidentă servind toate simbolurile (proces separat per mod, backend Keras):")
+    for mode in ("symbol", "global"):
+        env = dict(os.environ, MODEL_MODE=mode, MODEL_BACKEND="keras", TF_CPP_MIN_LOG_LEVEL="3")
+        out = subprocess.run([sys.executable, __file__, "--rss", mode, "--models", str(models_dir),
+                              "--scalers", str(scalers_dir), *symbols], cwd=BASE_DIR, env=env,
+                             capture_output=True, text=True)
+        lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if not lines:
+            print(f"  ❌ {mode}: {(out.stderr.strip().splitlines() or ['eșec'])[-1]}")
+            continue
+        r = json.loads(lines[-1])
+        print(f"  {mode:<7} RSS {r['rss_after_mb']:>7.0f} MB (+{r['rss_after_mb'] - r['rss_before_mb']:.0f} MB "
+              f"pentru modele), {r['loaded']} intrări în registru, încărcare {r['load_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import indicators
+import price_store
+
+# Compară calculul vechi cu pandas (un DataFrame per simbol) cu indicators.py
+# pe toate simbolurile deodată:  python bench_indicators.py [repetări_date]
+
+DATA_DIR = Path(__file__).parent / "data"
+
+def legacy_rsi(series, period=14):
+    delta = series.diff()
+    gain = np.where(delta > 0, delta, 0)
+    loss = np.where(delta < 0, -delta, 0)
+    avg_gain = pd.Series(gain).rolling(window=period).mean()
+    avg_loss = pd.Series(loss).rolling(window=period).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+def legacy_macd_hist(price):
+    try:
+        import pandas_ta as ta
+        return ta.macd(price, fast=12, slow=26, signal=9)['MACDh_12_26_9']
+    except ImportError:
+        # Aceeași rețetă ca pandas_ta.ema: media primelor valori, apoi ewm(adjust=False)
+        def ema(close, length):
+            close = close.copy()
+            sma_nth = close[0:length].mean()
+            close[:length - 1] = np.nan
+            close.iloc[length - 1] = sma_nth
+            return close.ewm(span=length, adjust=False).mean()
+        macd = ema(price, 12) - ema(price, 26)
+        return macd - ema(macd.loc[macd.first_valid_index():], 9)
+
+def legacy_features(price):
+    df = pd.DataFrame({"price": price})
+    df['sma_10'] = df['price'].rolling(window=10).mean()
+    df['sma_50'] = df['price'].rolling(window=50).mean()
+    df['rsi_14'] = legacy_rsi(df['price'], 14)
+    df['macd_hist'] = legacy_macd_hist(df['price'])
+    df['volatility'] = df['price'].pct_change().rolling(window=20).std()
+    return df[indicators.FEATURES].to_numpy()
+
+def load_prices(repeat):
+    series = [np.array(price_store.load(s, DATA_DIR)[1]) for s in price_store.symbols(DATA_DIR)]
+    series = [np.tile(s, repeat) for s in series]
+    days = max(len(s) for s in series)
+    prices = np.full((len(series), days), np.nan)
+    for i, s in enumerate(series):
+        prices[i, days - len(s):] = s
+    return series, prices
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    series, prices = load_prices(repeat)
+    print(f"{len(series)} simboluri × {prices.shape[1]} zile")
+
+    # Importurile leneșe (scipy.signal) nu intră în măsurătoare
+    indicators.feature_matrix(prices[:, -100:])
+    legacy_features(pd.Series(series[0]))
+
+    start = time.perf_counter()
+    legacy = [legacy_features(pd.Series(s)) for s in series]
+    t_pandas = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = indicators.feature_matrix(prices)
+    t_numpy = time.perf_counter() - start
+
+    worst = 0.0
+    for i, ref in enumerate(legacy):
+        got = matrix[i, prices.shape[1] - len(ref):]
+        if not np.array_equal(np.isnan(ref), np.isnan(got)):
+            print(f"❌ NaN diferit pentru rândul {i}")
+            sys.exit(1)
+        scale = np.maximum(np.nanmax(np.abs(ref), axis=0), 1e-12)
+        worst = max(worst, float(np.nanmax(np.abs(got - ref) / scale)))
+
+    print(f"pandas: {t_pandas * 1000:.1f} ms, numpy: {t_numpy * 1000:.1f} ms (x{t_pandas / t_numpy:.1f})")
+    print(f"eroare relativă maximă: {worst:.2e}")
+    sys.exit(0 if worst < 1e-8 else 1)
+
+if __name__ == "__main__":
+    main()
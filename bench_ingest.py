@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+import httpx
+import coingecko_client
+import coingecko_stub
+import price_store
+
+# Descarcă toate simbolurile din data/ de pe serverul local (coingecko_stub), o dată
+# cu bucla veche (un GET secvențial + pauză fixă între cereri) și o dată cu clientul
+# async, apoi a doua oară incremental (If-Modified-Since -> 304).
+#   python bench_ingest.py --rate 10 --latency-ms 300 --error-rate 0.05
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def legacy(url, symbols, days, interval):
+    ok = 0
+    for symbol in symbols:
+        try:
+            response = httpx.get(f"{url}/coins/{symbol}/market_chart?vs_currency=usd&days={days}&interval=daily",
+                                 headers=coingecko_client.HEADERS)
+            response.raise_for_status()
+            ok += bool(response.json().get("prices"))
+        except Exception as e:
+            print(f"   legacy ❌ {symbol}: {e}")
+        time.sleep(interval)
+    return ok
+
+
+async def concurrent(url, symbols, days, options, state_dir, incremental=False):
+    client = coingecko_client.CoinGeckoClient(
+        base_url=url, rate=options.client_rate, burst=options.burst, connections=options.connections,
+        backoff_base=0.2, backoff_cap=5.0, data_dir=state_dir,
+    )
+    async with client:
+        results = await client.fetch_many({s: days for s in symbols}, incremental)
+    return results, client.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=10.0, help="limita serverului, cereri/s")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--client-rate", type=float, default=None, help="implicit: 90%% din limita serverului")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--legacy-interval", type=float, default=None,
+                        help="pauza buclei vechi; implicit 1/rate, cea mai mică pauză fără 429")
+    parser.add_argument("--days", type=int, default=365)
+    options = parser.parse_args()
+    options.client_rate = options.client_rate or options.rate * 0.9
+    interval = options.legacy_interval if options.legacy_interval is not None else 1.0 / options.rate
+
+    symbols = price_store.symbols(DATA_DIR)
+    stub = coingecko_stub.start(rate=options.rate, burst=options.burst,
+                                latency_ms=options.latency_ms, error_rate=options.error_rate)
+    print(f"{len(symbols)} simboluri, server {options.rate}/s (burst {options.burst}), "
+          f"{options.latency_ms:.0f} ms latență, {options.error_rate:.0%} erori 5xx")
+
+    start = time.perf_counter()
+    ok = legacy(stub.url, symbols, options.days, interval)
+    t_legacy = time.perf_counter() - start
+    print(f"legacy:      {ok}/{len(symbols)} în {t_legacy:.2f}s ({ok / t_legacy:.1f} simboluri/s)")
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        start = time.perf_counter()
+        results, stats = asyncio.run(concurrent(stub.url, symbols, options.days, options, state_dir))
+        t_async = time.perf_counter() - start
+        ok = sum(1 for df in results.values() if df is not None)
+        print(f"async:       {ok}/{len(symbols)} în {t_async:.2f}s ({ok / t_async:.1f} simboluri/s, "
+              f"x{t_legacy / t_async:.1f}) {stats}")
+
+        start = time.perf_counter()
+        results, stats = asyncio.run(concurrent(stub.url, symbols, options.days, options, state_dir, True))
+        t_inc = time.perf_counter() - start
+        unchanged = sum(1 for df in results.values() if df is coingecko_client.NOT_MODIFIED)
+        print(f"incremental: {unchanged}/{len(symbols)} nemodificate (304) în {t_inc:.2f}s {stats}")
+
+    print(f"server: {stub.state.counts}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
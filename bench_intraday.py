@@ -0,0 +1,154 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+
+# Clientul CoinGecko din ingest vorbește cu serverul local, fără limită de rată
+os.environ.setdefault("COINGECKO_RATE", "1000")
+os.environ.setdefault("COINGECKO_BURST", "1000")
+
+import price_store
+
+# Istoric intraday sintetic (prețurile zilnice ale unui simbol interpolate la
+# rezoluția cerută, cu zgomot), într-un director temporar:
+#  - features: build-ul vechi (frame pandas + compute_features + replay pentru stare)
+#    vs. build-ul pe bucăți din feature_store, timp și memorie de vârf
+#  - resample la zilnic: pandas pe tot istoricul vs. intraday.resample pe bucăți
+#  - ingest orar cap-coadă prin coingecko_stub (/market_chart/range), verificat
+#    față de sursă și față de un build complet
+#   python bench_intraday.py [--symbol bitcoin] [--hourly-years 5] [--minute-years 1] [--ingest-symbols 4]
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def synthetic(daily, resolution, years, end, seed=0):
+    import intraday
+
+    rng = np.random.default_rng(seed)
+    per_day = 86400 // intraday.RESOLUTIONS[resolution]
+    rows = int(years * 365 * per_day)
+    days = int(np.ceil(rows / per_day / len(daily))) + 1
+    daily = np.tile(daily, days)
+    price = np.interp(np.arange(len(daily) * per_day) / per_day, np.arange(len(daily)), daily)[:rows]
+    price = price * np.exp(rng.normal(0, 0.002, rows).cumsum() * 0.1)
+    timestamps = end - np.arange(rows)[::-1] * intraday.step(resolution)
+    return timestamps, price
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def legacy_build(symbol, directory):
+    # Ca feature_store.build înainte: tot istoricul prin pandas, apoi replay pentru stare
+    from feature_store import FEATURES, compute_features
+    from streaming_indicators import replay
+
+    df = price_store.frame(symbol, directory)
+    matrix = compute_features(df.copy())[FEATURES].to_numpy(dtype=np.float64)
+    replay(df["price"].to_numpy(dtype=np.float64))
+    return matrix
+
+
+def legacy_resample(symbol, directory):
+    import pandas as pd
+
+    df = price_store.frame(symbol, directory)
+    day = pd.to_datetime(df["timestamp"], format="ISO8601").dt.floor("D")
+    first = df.groupby(day, sort=True)["price"].first()
+    return first.index.to_numpy().astype("datetime64[s]"), first.to_numpy()
+
+
+def bench_features(symbol, resolution, years, tmp):
+    import feature_store
+    import intraday
+
+    directory = intraday.data_dir(resolution, tmp)
+    daily = np.array(price_store.load(symbol, DATA_DIR)[1])
+    end = intraday.floor([np.datetime64("now", "s")], resolution)[0] - intraday.step(resolution)
+    timestamps, prices = synthetic(daily, resolution, years, end)
+    price_store.write(symbol, timestamps, prices, directory)
+    print(f"\n{resolution} × {years:g} ani: {len(prices)} bare ({prices.nbytes / 2**20:.0f} MB prețuri)")
+
+    old, old_s, old_peak = measure(lambda: legacy_build(symbol, directory))
+    new, new_s, new_peak = measure(lambda: np.array(feature_store.build(symbol, directory)))
+    assert old.shape == new.shape, f"{old.shape} != {new.shape}"
+    err = np.max(np.abs(old - new) / np.max(np.abs(old), axis=0))
+    print(f"   features vechi  {old_s:>7.2f}s, vârf {old_peak / 2**20:>7.1f} MB")
+    print(f"   features bucăți {new_s:>7.2f}s, vârf {new_peak / 2**20:>7.1f} MB   (dif. rel. max {err:.1e})")
+
+    (old_days, old_prices), old_s, old_peak = measure(lambda: legacy_resample(symbol, directory))
+    (days, values), new_s, new_peak = measure(lambda: intraday.resample(symbol, resolution, "1d", tmp))
+    assert np.array_equal(old_days, days) and np.array_equal(old_prices, values), "resample diferit"
+    print(f"   resample pandas {old_s:>7.2f}s, vârf {old_peak / 2**20:>7.1f} MB")
+    print(f"   resample bucăți {new_s:>7.2f}s, vârf {new_peak / 2**20:>7.1f} MB   ({len(days)} zile, identic)")
+
+
+def bench_ingest(symbols, years, tmp):
+    import coingecko_stub
+    import feature_store
+    import intraday
+
+    source, target = tmp / "source", tmp / "target"
+    end = intraday.floor([np.datetime64("now", "s")], "1h")[0] - intraday.step("1h")
+    for i, symbol in enumerate(symbols):
+        daily = np.array(price_store.load(symbol, DATA_DIR)[1])
+        price_store.write(symbol, *synthetic(daily, "1h", years, end, seed=i), intraday.data_dir("1h", source))
+    server = coingecko_stub.start(data_dir=source)
+    # Înainte de primul import: URL-ul e citit la importul clientului
+    os.environ["COINGECKO_API_URL"] = server.url
+    import coingecko_client
+
+    days = int(years * 365)
+    _, seconds, peak = measure(lambda: [intraday.ingest(s, "1h", days, target) for s in symbols])
+    _, client = coingecko_client._background_client()
+    print(f"\ningest 1h × {years:g} ani, {len(symbols)} simboluri: {seconds:.1f}s, vârf {peak / 2**20:.1f} MB, "
+          f"{client.requests} cereri /market_chart/range")
+
+    for symbol in symbols:
+        src_ts, src_prices = price_store.load(symbol, intraday.data_dir("1h", source))
+        ts, prices = price_store.load(symbol, intraday.data_dir("1h", target))
+        start = np.searchsorted(src_ts, ts[0])
+        assert np.array_equal(src_ts[start:], ts) and np.array_equal(src_prices[start:], prices), symbol
+        incremental = np.array(feature_store.load(symbol, intraday.data_dir("1h", target)))
+        rebuilt = np.array(feature_store.build(symbol, intraday.data_dir("1h", target)))
+        err = np.max(np.abs(incremental - rebuilt) / np.max(np.abs(rebuilt), axis=0))
+        assert incremental.shape == rebuilt.shape and err < 1e-8, (symbol, err)
+        added = intraday.sync_daily(symbol, "1h", target)
+        daily = price_store.load(symbol, target)[1]
+        reference = legacy_resample(symbol, intraday.data_dir("1h", target))[1]
+        assert np.array_equal(daily, reference[:len(daily)]), symbol
+        print(f"   ✅ {symbol}: {len(ts)} bare = sursa, features incrementale = build (dif. {err:.1e}), "
+              f"{added} zile în seria zilnică")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="bitcoin")
+    parser.add_argument("--hourly-years", type=float, default=5)
+    parser.add_argument("--minute-years", type=float, nargs="*", default=[1])
+    parser.add_argument("--ingest-symbols", type=int, default=4)
+    parser.add_argument("--ingest-years", type=float, default=2)
+    options = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_intraday_"))
+    bench_features(options.symbol, "1h", options.hourly_years, tmp)
+    for years in options.minute_years:
+        bench_features(options.symbol, "1m", years, tmp)
+    if options.ingest_symbols:
+        symbols = price_store.symbols(DATA_DIR)[:options.ingest_symbols]
+        bench_ingest(symbols, options.ingest_years, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+# Keras (tf.function) vs. TFLite pe toate simbolurile din models/:
+#  - latența unui pas (fereastră 30×6, batch 1) și diferența pe o prognoză de 30 de zile
+#  - throughput-ul sub concurență: --clients cereri simultane prin micro-batcher,
+#    pe pool-ul de inferență al serverului (TFLite rulează lotul rând cu rând)
+#  - memoria rezidentă a unui proces care ține toate modelele încărcate, per backend
+#   python bench_lite.py [--export] [--steps 200] [--clients 32] [--days 30] [simboluri...]
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def step_latency(forward, window, steps):
+    x = window[None, ...].astype(np.float32)
+    forward(x)
+    times = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        forward(x)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def throughput(forward, scaler, window, clients, days):
+    # (pași/s, batch mediu) pentru `clients` rollout-uri simultane de `days` pași
+    import asyncio
+    from inference_batcher import MicroBatcher, forecast_async
+    from inference_pool import pool
+
+    async def run():
+        batcher = MicroBatcher(executor=pool.executor)
+        start = time.perf_counter()
+        await asyncio.gather(*[forecast_async(batcher, forward, scaler, window, days) for _ in range(clients)])
+        return time.perf_counter() - start, batcher.stats()["mean_batch_size"]
+
+    seconds, mean_batch = asyncio.run(run())
+    return clients * days / seconds, mean_batch
+
+
+def measure_rss(backend, symbols):
+    # Rulează în subproces: registrul cu MODEL_BACKEND=backend încarcă toate modelele
+    from forecast_engine import get_forward
+    from model_registry import ModelRegistry
+
+    before = rss_mb()
+    start = time.perf_counter()
+    registry = ModelRegistry(max_bytes=1 << 40)
+    for symbol in symbols:
+        loaded = registry.get(symbol)
+        _, lookback, n_features = loaded.model.input_shape
+        get_forward(loaded.model)(np.zeros((1, lookback, n_features), dtype=np.float32))
+    print(json.dumps({
+        "backend": backend,
+        "load_seconds": time.perf_counter() - start,
+        "rss_before_mb": before,
+        "rss_after_mb": rss_mb(),
+        "lite": registry.stats()["lite"],
+        "tensorflow": "tensorflow" in sys.modules,
+    }))
+
+
+def compare(symbols, steps, export, clients, days):
+    import joblib
+    from tensorflow.keras.models import load_model
+    import lite_model
+    from feature_store import last_window
+    from forecast_engine import forecast, get_forward
+
+    rows = []
+    for symbol in symbols:
+        model_path = BASE_DIR / "models" / f"{symbol}_lstm_model.keras"
+        model = load_model(model_path, compile=False)
+        if export and lite_model.usable(model_path, "auto") is None:
+            lite_model.try_export(model, model_path)
+        path = lite_model.usable(model_path, "auto")
+        if path is None:
+            print(f"⚠️  {symbol}: fără .tflite la zi (rulează cu --export)")
+            continue
+        lite = lite_model.LiteModel(path)
+        scaler = joblib.load(BASE_DIR / "scalers" / f"{symbol}_lstm_scaler.save")
+        window = scaler.transform(last_window(symbol))
+        keras_forward, lite_forward = get_forward(model), get_forward(lite)
+        keras_step = step_latency(keras_forward, window, steps)
+        lite_step = step_latency(lite_forward, window, steps)
+        keras_prices = forecast(keras_forward, scaler, window, 30)
+        diff = np.max(np.abs(forecast(lite_forward, scaler, window, 30) - keras_prices) / np.abs(keras_prices))
+        keras_rate, keras_batch = throughput(keras_forward, scaler, window, clients, days)
+        lite_rate, lite_batch = throughput(lite_forward, scaler, window, clients, days)
+        rows.append((symbol, keras_step, lite_step, diff, model_path.stat().st_size, path.stat().st_size,
+                     keras_rate, lite_rate))
+        print(f"  {symbol:<22}{keras_step * 1e6:>9.0f}µs{lite_step * 1e6:>9.0f}µs  x{keras_step / lite_step:>4.1f}"
+              f"{keras_rate:>10.0f}/s{lite_rate:>9.0f}/s  x{lite_rate / keras_rate:>4.2f}"
+              f"  (batch {keras_batch:.0f}/{lite_batch:.0f})  Δpreț relativ max {diff:.1e}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32, help="cereri simultane pentru throughput")
+    parser.add_argument("--days", type=int, default=30, help="orizontul fiecărei cereri simultane")
+    parser.add_argument("--export", action="store_true", help="exportă .tflite unde lipsește")
+    parser.add_argument("--rss", choices=["keras", "lite"], help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    from model_integrity import available_symbols
+    symbols = options.symbols or available_symbols()
+    if options.rss:
+        measure_rss(options.rss, symbols)
+        return
+
+    print(f"{len(symbols)} simboluri, latența unui pas (mediana din {options.steps}) și pași/s cu "
+          f"{options.clients} cereri simultane de {options.days} zile:")
+    print(f"  {'simbol':<22}{'keras':>11}{'tflite':>11}{'':>7}{'keras':>12}{'tflite':>11}")
+    rows = compare(symbols, options.steps, options.export, options.clients, options.days)
+    if rows:
+        keras_steps, lite_steps, diffs, keras_rates, lite_rates = (np.array([r[i] for r in rows])
+                                                                   for i in (1, 2, 3, 6, 7))
+        print(f"\n  mediană pas: keras {np.median(keras_steps) * 1e6:.0f}µs, tflite {np.median(lite_steps) * 1e6:.0f}µs"
+              f" (x{np.median(keras_steps / lite_steps):.1f}); Δpreț relativ max pe 30 zile {diffs.max():.1e}")
+        print(f"  mediană sub concurență: keras {np.median(keras_rates):.0f} pași/s, tflite "
+              f"{np.median(lite_rates):.0f} pași/s (x{np.median(lite_rates / keras_rates):.2f})")
+        print(f"  pe disc: .keras {sum(r[4] for r in rows) / 2**20:.1f} MB, .tflite {sum(r[5] for r in rows) / 2**20:.1f} MB")
+
+    print("\nMemorie rezidentă cu toate modelele încărcate (proces separat per backend):")
+    for backend in ("keras", "lite"):
+        env = dict(os.environ, MODEL_BACKEND=backend, TF_CPP_MIN_LOG_LEVEL="3")
+        out = subprocess.run([sys.executable, __file__, "--rss", backend, *symbols], cwd=BASE_DIR, env=env,
+                             capture_output=True, text=True)
+        lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if not lines:
+            print(f"  ❌ {backend}: {(out.stderr.strip().splitlines() or ['eșec'])[-1]}")
+            continue
+        r = json.loads(lines[-1])
+        print(f"  {backend:<6} RSS {r['rss_after_mb']:>7.0f} MB (+{r['rss_after_mb'] - r['rss_before_mb']:.0f} MB "
+              f"pentru modele), încărcare {r['load_seconds']:.1f}s, modele TFLite: {r['lite']}, "
+              f"TensorFlow importat: {'da' if r['tensorflow'] else 'nu'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import price_store
+
+# CSV per simbol (pd.read_csv, cum citeau ingestul, antrenarea și train_daily) vs.
+# price_store, pe toate simbolurile: ultima zi, fereastra de la coadă, tot istoricul și
+# append-ul unei zile. Rulează pe o copie într-un director temporar, pe istoricul
+# zilnic și pe istorice mai lungi (aceleași prețuri repetate până la --rows rânduri).
+#   python bench_price_store.py [--rows 26280 87600] [--repeat 5]
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def timed(fn, symbols, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for symbol in symbols:
+            fn(symbol)
+        best = min(best, time.perf_counter() - start)
+    return best / len(symbols)
+
+
+def make_copy(symbols, rows, tmp):
+    # Aceleași prețuri, repetate până la `rows` rânduri orare dacă se cere un istoric mai lung
+    for symbol in symbols:
+        timestamps, prices = (np.array(a) for a in price_store.load(symbol, DATA_DIR))
+        if rows:
+            prices = np.resize(prices, rows)
+            timestamps = timestamps[-1] - np.arange(rows)[::-1] * np.timedelta64(1, "h")
+        price_store.write(symbol, timestamps, prices, tmp)
+        price_store.export_csv(symbol, tmp / f"{symbol}.csv", tmp)
+
+
+def run(symbols, rows, repeat):
+    tmp = Path(tempfile.mkdtemp(prefix="bench_price_store_"))
+    make_copy(symbols, rows, tmp)
+    csv = lambda s: tmp / f"{s}.csv"
+    n = price_store.entry(symbols[0], tmp)["rows"]
+    print(f"\n{len(symbols)} simboluri × {n} rânduri")
+
+    cases = [
+        ("ultima zi", lambda s: pd.to_datetime(pd.read_csv(csv(s))["timestamp"], format="ISO8601").max(),
+         lambda s: price_store.last_timestamp(s, tmp)),
+        ("fereastra de 30", lambda s: pd.read_csv(csv(s))["price"].to_numpy()[-30:],
+         lambda s: price_store.tail(s, 30, tmp)),
+        ("tot istoricul", lambda s: pd.read_csv(csv(s)),
+         lambda s: price_store.frame(s, tmp)),
+    ]
+    for label, old, new in cases:
+        old_s, new_s = timed(old, symbols, repeat), timed(new, symbols, repeat)
+        print(f"  {label:<18} CSV {old_s * 1e3:>8.2f} ms   store {new_s * 1e3:>8.3f} ms   x{old_s / new_s:>7.0f}")
+
+    # Append: o zi nouă per simbol; CSV-ul vechi verifica întâi ultima zi citind tot fișierul
+    def csv_append(s):
+        last = pd.to_datetime(pd.read_csv(csv(s))["timestamp"], format="ISO8601").max()
+        with open(csv(s), "a") as f:
+            f.write(f"{last + pd.Timedelta(days=1)},1.0\n")
+
+    def store_append(s):
+        last = price_store.last_timestamp(s, tmp)
+        price_store.append(s, [last + np.timedelta64(1, "D")], [1.0], tmp)
+
+    old_s, new_s = timed(csv_append, symbols, 1), timed(store_append, symbols, 1)
+    print(f"  {'append o zi':<18} CSV {old_s * 1e3:>8.2f} ms   store {new_s * 1e3:>8.3f} ms   x{old_s / new_s:>7.0f}")
+    csv_bytes = sum(csv(s).stat().st_size for s in symbols)
+    store_bytes = sum(p.stat().st_size for p in price_store.store_dir(tmp).glob("*.npy"))
+    print(f"  pe disc: CSV {csv_bytes / 2**20:.1f} MB, store {store_bytes / 2**20:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="*", default=[26280, 87600],
+                        help="lungimi suplimentare (orar: 3 ani = 26280, 10 ani = 87600)")
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+    symbols = price_store.symbols(DATA_DIR)
+    for rows in [0, *options.rows]:
+        run(symbols, rows, options.repeat)
+
+
+if __name__ == "__main__":
+    main()
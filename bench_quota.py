@@ -0,0 +1,90 @@
+import json
+import multiprocessing as mp
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from quota_store import QuotaStore
+
+# Compară usage.json (citire + rescriere completă la fiecare cerere) cu quota_store
+# pe N portofele și verifică că rezervările concurente din mai multe procese nu
+# pierd actualizări:  python bench_quota.py [portofele]
+
+LIMIT = 5
+
+
+def legacy_increment(path, wallet):
+    with open(path) as f:
+        data = json.load(f)
+    entry = data.setdefault(wallet, {"count": 0, "limit": LIMIT})
+    entry["count"] += 1
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return max(0, entry["limit"] - entry["count"])
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def hammer(db, wallet, attempts, out):
+    store = QuotaStore(db, LIMIT, legacy_json=None)
+    out.put(sum(1 for _ in range(attempts) if store.reserve(wallet) is not None))
+
+
+def main():
+    wallets = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = {f"wallet{i:08d}": ({"count": i % LIMIT, "limit": LIMIT} if i % 2 else i % LIMIT)
+                for i in range(wallets)}
+        legacy_path = tmp / "usage.json"
+        with open(legacy_path, "w") as f:
+            json.dump(data, f, indent=2)
+        names = list(data)
+        del data
+
+        ops = 3
+        start = time.perf_counter()
+        for _ in range(ops):
+            legacy_increment(legacy_path, random.choice(names))
+        t_legacy = (time.perf_counter() - start) / ops
+        print(f"{wallets} portofele, usage.json {legacy_path.stat().st_size / 1e6:.0f} MB")
+        print(f"usage.json:  {t_legacy * 1000:.1f} ms / increment")
+
+        store = QuotaStore(tmp / "usage.db", LIMIT, legacy_json=legacy_path)
+        start = time.perf_counter()
+        store.quota("warmup")
+        print(f"migrare:     {time.perf_counter() - start:.1f}s (format vechi int + dict)")
+
+        latencies = []
+        for _ in range(20_000):
+            wallet = random.choice(names)
+            start = time.perf_counter()
+            if store.reserve(wallet) is not None:
+                store.refund(wallet)
+            latencies.append(time.perf_counter() - start)
+        mean = sum(latencies) / len(latencies)
+        print(f"quota_store: {mean * 1e6:.0f} µs / reserve+refund "
+              f"(p50 {percentile(latencies, 0.5) * 1e6:.0f} µs, p99 {percentile(latencies, 0.99) * 1e6:.0f} µs, "
+              f"x{t_legacy / mean:.0f})")
+
+        # 8 procese încearcă de 50 de ori fiecare pe același portofel cu limita 5
+        store.reset("contended", LIMIT)
+        ctx = mp.get_context("spawn")
+        out = ctx.Queue()
+        procs = [ctx.Process(target=hammer, args=(tmp / "usage.db", "contended", 50, out)) for _ in range(8)]
+        for p in procs:
+            p.start()
+        granted = sum(out.get() for _ in procs)
+        for p in procs:
+            p.join()
+        print(f"concurență:  {granted} rezervări acordate din {8 * 50} încercări (limita {LIMIT})")
+        store.close()
+        sys.exit(0 if granted == LIMIT else 1)
+
+
+if __name__ == "__main__":
+    main()
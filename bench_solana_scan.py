@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import time
+import solana_rpc_stub
+from payment_cache import is_nrg_payment, scan_sequential
+from solana_rpc import SolanaRpc
+from solana_scan import find_transaction
+
+# Latența verificării plății pe serverul RPC local cu întârziere per cerere:
+# bucla veche (o tranzacție după alta) vs. cereri paralele vs. batch JSON-RPC.
+#   python bench_solana_scan.py --latency-ms 50 --history 200
+
+
+def wallets(history):
+    # (nume, poziția plății NRG numărată de la cea mai nouă tranzacție)
+    return [
+        ("plată recentă", 0),
+        ("plată veche", history * 3 // 4),
+        ("fără plată", None),
+    ]
+
+
+async def measure(rpc, ledger, wallet, scan):
+    before = ledger.counts["getTransaction"]
+    start = time.perf_counter()
+    paid = await scan(rpc, wallet)
+    return paid, time.perf_counter() - start, ledger.counts["getTransaction"] - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--history", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=25)
+    options = parser.parse_args()
+
+    server = solana_rpc_stub.start(latency_ms=options.latency_ms)
+    cases = wallets(options.history)
+    for i, (_, paid_at) in enumerate(cases):
+        server.ledger.add_wallet(f"Bench{i}" + "1" * 38, options.history, paid_at)
+
+    async def sequential(rpc, wallet):
+        return (await scan_sequential(rpc, wallet))[0]
+
+    def concurrent(concurrency, batch=0):
+        async def scan(rpc, wallet):
+            predicate = lambda tx: is_nrg_payment(tx, wallet)
+            return (await find_transaction(rpc, wallet, predicate, concurrency=concurrency, batch=batch)).found
+        return scan
+
+    modes = [
+        ("secvențial", sequential),
+        (f"paralel x{options.concurrency}", concurrent(options.concurrency)),
+        (f"batch {options.batch} x4", concurrent(4, options.batch)),
+    ]
+
+    async def run():
+        rpc = SolanaRpc(server.url, connections=options.concurrency)
+        print(f"{options.history} tranzacții per portofel, {options.latency_ms:.0f} ms per cerere RPC")
+        print(f"  {'portofel':<16}{'mod':<16}{'timp':>10}{'getTransaction':>16}")
+        for i, (name, _) in enumerate(cases):
+            wallet = f"Bench{i}" + "1" * 38
+            baseline = None
+            for label, scan in modes:
+                paid, seconds, fetched = await measure(rpc, server.ledger, wallet, scan)
+                baseline = baseline or seconds
+                print(f"  {name:<16}{label:<16}{seconds * 1000:>8.0f}ms{fetched:>16}"
+                      f"  x{baseline / seconds:.1f}{'' if paid == (cases[i][1] is not None) else '  ❌'}")
+        await rpc.close()
+
+    asyncio.run(run())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
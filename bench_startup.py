@@ -0,0 +1,120 @@
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import httpx
+import solana_rpc_stub
+from solders.keypair import Keypair
+
+# Timpul de pornire al main.py și latența primei cereri per simbol, cu și fără warmup.
+# Serverul rulează în subproces cu uvicorn; plata e confirmată de solana_rpc_stub, iar
+# cota, prognozele precalculate și statistica de cereri stau în fișiere temporare,
+# ca fiecare predicție să ruleze modelul. predictions/*.csv și purchased.json, pe care
+# predicția le scrie, se restaurează la final.
+#   python bench_startup.py --symbols bitcoin ethereum solana
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def snapshot():
+    paths = [BASE_DIR / "purchased.json", *(BASE_DIR / "predictions").glob("*.csv")]
+    return {p: p.read_bytes() for p in paths if p.exists()}
+
+
+def restore(saved):
+    for path in [BASE_DIR / "purchased.json", *(BASE_DIR / "predictions").glob("*.csv")]:
+        if path in saved:
+            path.write_bytes(saved[path])
+        else:
+            path.unlink(missing_ok=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, deadline, status=200):
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == status:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def run(label, symbols, warm, rpc_url, wallet, timeout):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    tmp = Path(tempfile.mkdtemp(prefix="bench_startup_"))
+    env = dict(
+        os.environ,
+        SOLANA_RPC=rpc_url,
+        QUOTA_DB=str(tmp / "usage.db"),
+        FORECASTS_DB=str(tmp / "forecasts.db"),
+        WARMUP_HITS_FILE=str(tmp / "symbol_hits.json"),
+        WARMUP_SYMBOLS=",".join(symbols) if warm else "",
+        WARMUP_TOP_N=str(len(symbols)) if warm else "0",
+    )
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    try:
+        deadline = start + timeout
+        if not wait_for(f"{base}/", deadline):
+            raise RuntimeError(f"{label}: serverul nu a pornit în {timeout}s")
+        listening = time.perf_counter() - start
+        if not wait_for(f"{base}/ready", deadline):
+            raise RuntimeError(f"{label}: /ready nu a devenit 200 în {timeout}s")
+        ready = time.perf_counter() - start
+
+        first = {}
+        with httpx.Client(base_url=base, timeout=timeout) as client:
+            for symbol in symbols:
+                t = time.perf_counter()
+                r = client.post("/predict-lstm", json={"wallet": wallet, "symbol": symbol, "days": 7})
+                first[symbol] = (time.perf_counter() - t, r.status_code)
+        return listening, ready, first
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", nargs="+", default=["bitcoin", "ethereum", "solana"])
+    parser.add_argument("--timeout", type=float, default=180.0)
+    options = parser.parse_args()
+
+    rpc = solana_rpc_stub.start()
+    wallet = str(Keypair().pubkey())
+    rpc.ledger.add_wallet(wallet, 1, paid_at=0)
+
+    results = {}
+    saved = snapshot()
+    try:
+        for label, warm in (("fără warmup", False), ("cu warmup", True)):
+            results[label] = run(label, options.symbols, warm, rpc.url, wallet, options.timeout)
+    finally:
+        restore(saved)
+        rpc.shutdown()
+
+    print(f"{'':<14}{'ascultă':>10}{'ready':>10}  prima cerere per simbol")
+    for label, (listening, ready, first) in results.items():
+        requests = "  ".join(f"{s} {sec * 1000:.0f}ms" + ("" if code == 200 else f" ❌{code}")
+                             for s, (sec, code) in first.items())
+        worst = max(sec for sec, _ in first.values())
+        print(f"{label:<14}{listening:>9.2f}s{ready:>9.2f}s  {requests}  (max {worst * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
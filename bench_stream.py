@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+import httpx
+import solana_rpc_stub
+from bench_startup import restore, snapshot
+from solders.keypair import Keypair
+
+# /predict-lstm vs. /predict-lstm/stream pe același orizont, cu serverul în proces
+# (uvicorn pe un thread) ca să putem citi cota, pool-ul și micro-batcher-ul:
+#  - timpul până la primul rând și până la ultimul, cu prognoza necalculată
+#  - rândurile din stream = predicția clasică
+#  - clientul care se deconectează după --read rânduri oprește rollout-ul
+#  - cota se taxează o dată per stream și se restituie la eroarea dinaintea primului rând
+#   python bench_stream.py [--symbol bitcoin] [--days 365] [--read 10]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def stream(client, payload, limit=None):
+    # (status, secunde până la primul rând, secunde total, rânduri)
+    start = time.perf_counter()
+    first, rows = None, []
+    with client.stream("POST", "/predict-lstm/stream", json=payload) as response:
+        if response.status_code != 200:
+            response.read()
+            return response.status_code, None, time.perf_counter() - start, response.json()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            first = first or time.perf_counter() - start
+            rows.append(json.loads(line))
+            if limit and len(rows) >= limit:
+                break
+    return 200, first, time.perf_counter() - start, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="bitcoin")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--read", type=int, default=10, help="rânduri citite înainte de deconectare")
+    options = parser.parse_args()
+
+    rpc = solana_rpc_stub.start()
+    tmp = Path(tempfile.mkdtemp(prefix="bench_stream_"))
+    os.environ.update(
+        SOLANA_RPC=rpc.url,
+        QUOTA_DB=str(tmp / "usage.db"),
+        FORECASTS_DB=str(tmp / "forecasts.db"),
+        WARMUP_HITS_FILE=str(tmp / "symbol_hits.json"),
+        WARMUP_SYMBOLS="",
+        WARMUP_TOP_N="0",
+    )
+    import uvicorn
+    import main as app_main
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app_main.app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    # Portofel neplătit: predicțiile trec prin cotă
+    wallet = str(Keypair().pubkey())
+    payload = {"wallet": wallet, "symbol": options.symbol, "days": options.days}
+    remaining = lambda: app_main.quota_store.remaining(wallet)
+    app_main.quota_store.reset(wallet, 100)
+    saved = snapshot()
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=120) as client:
+            # Modelul încărcat și trasat înainte de măsurători
+            client.post("/predict-lstm", json={**payload, "days": 1}).raise_for_status()
+
+            app_main.forecasts.invalidate()
+            start = time.perf_counter()
+            classic = client.post("/predict-lstm", json=payload).json()["prediction"]["prediction"]
+            classic_s = time.perf_counter() - start
+
+            app_main.forecasts.invalidate()
+            before = remaining()
+            status, first_s, total_s, rows = stream(client, payload)
+            assert status == 200 and rows == classic, "stream diferit de /predict-lstm"
+            assert before - remaining() == 1, "cota trebuie taxată o singură dată"
+            _, cached_first, cached_total, _ = stream(client, payload)
+            start = time.perf_counter()
+            client.post("/predict-lstm", json=payload).raise_for_status()
+            cached_classic_s = time.perf_counter() - start
+
+            print(f"{options.symbol}, {options.days} zile, prognoză necalculată:")
+            print(f"   /predict-lstm         răspuns după {classic_s * 1000:>7.0f} ms")
+            print(f"   /predict-lstm/stream  primul rând {first_s * 1000:>7.1f} ms, ultimul {total_s * 1000:>7.0f} ms "
+                  f"({len(rows)} rânduri = /predict-lstm, cotă taxată o dată)")
+            print(f"   din cache: /predict-lstm {cached_classic_s * 1000:.0f} ms; stream primul rând "
+                  f"{cached_first * 1000:.1f} ms, ultimul {cached_total * 1000:.0f} ms")
+
+            app_main.forecasts.invalidate()
+            steps = app_main.batcher._items
+            before = remaining()
+            stream(client, payload, limit=options.read)
+            time.sleep(0.5)
+            ran = app_main.batcher._items - steps
+            print(f"   deconectare după {options.read} rânduri: {ran} pași rulați din {options.days}, "
+                  f"pool in_flight {app_main.pool.in_flight}, cotă taxată {before - remaining()}")
+            assert ran < options.days and app_main.pool.in_flight == 0
+
+            before = remaining()
+            status, _, _, body = stream(client, {**payload, "symbol": "nu-exista"})
+            print(f"   simbol inexistent: HTTP {status} ({body.get('detail')}), cotă restituită: {before == remaining()}")
+    finally:
+        restore(saved)
+        server.should_exit = True
+        thread.join()
+        rpc.shutdown()
+
+
+if __name__ == "__main__":
+    main()
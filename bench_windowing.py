@@ -0,0 +1,97 @@
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import price_store
+import windowing
+from indicators import FEATURES, add_features
+
+# Ferestrele de antrenare: bucla veche (listă de felii + np.array) vs. windowing.py,
+# pe seria zilnică și pe istorice orare (prețul zilnic interpolat la 24 de puncte pe zi,
+# cu zgomot, repetat până la lungimea cerută). Măsoară timpul și memoria de vârf a
+# pregătirii lui X și durata unei epoci model.fit pe array-uri vs. pe tf.data.
+#   python bench_windowing.py [--symbol bitcoin] [--years 1 3] [--epochs 1] [--no-fit]
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+LOOKBACK = 30
+BATCH_SIZE = 32
+
+
+def legacy_windows(data, lookback=LOOKBACK):
+    X, y = [], []
+    for i in range(lookback, len(data)):
+        X.append(data[i - lookback:i])
+        y.append(data[i][0])
+    return np.array(X), np.array(y)
+
+
+def hourly_prices(daily, hours, seed=0):
+    rng = np.random.default_rng(seed)
+    days = int(np.ceil(hours / 24 / len(daily))) + 1
+    daily = np.tile(daily, days)
+    price = np.interp(np.arange(len(daily) * 24) / 24, np.arange(len(daily)), daily)
+    return price[:hours] * np.exp(rng.normal(0, 0.002, hours).cumsum() * 0.1)
+
+
+def scaled_features(price):
+    from sklearn.preprocessing import MinMaxScaler
+
+    df = add_features(pd.DataFrame({"price": price}))
+    return MinMaxScaler().fit_transform(df.dropna()[FEATURES].values)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def fit_epoch(data, epochs, use_dataset):
+    from train_lstm_pro import build_model
+
+    model = build_model((LOOKBACK, data.shape[1]))
+    start = time.perf_counter()
+    if use_dataset:
+        model.fit(windowing.dataset(data, LOOKBACK, BATCH_SIZE, seed=0), epochs=epochs, verbose=0)
+    else:
+        X, y = legacy_windows(data)
+        model.fit(X, y, epochs=epochs, batch_size=BATCH_SIZE, verbose=0)
+    return (time.perf_counter() - start) / epochs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="bitcoin")
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 3])
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--no-fit", action="store_true", help="doar pregătirea ferestrelor")
+    options = parser.parse_args()
+
+    daily = np.array(price_store.load(options.symbol, DATA_DIR)[1])
+    series = [("zilnic", daily)] + [(f"orar {y:g} ani", hourly_prices(daily, int(y * 365 * 24)))
+                                    for y in options.years]
+
+    for label, price in series:
+        data = scaled_features(price)
+        (X_old, y_old), old_s, old_peak = measure(lambda: legacy_windows(data))
+        (X_new, y_new), new_s, new_peak = measure(lambda: windowing.windows(data))
+        assert np.array_equal(X_old, X_new) and np.array_equal(y_old, y_new), "ferestre diferite"
+        assert np.shares_memory(X_new, data), "windows() a copiat seria"
+        print(f"{label:<14} {len(X_new):>7} ferestre, serie {data.nbytes / 2**20:.1f} MB")
+        print(f"   listă+np.array {old_s * 1000:>8.1f} ms, vârf {old_peak / 2**20:>7.1f} MB")
+        print(f"   windows()      {new_s * 1000:>8.3f} ms, vârf {new_peak / 2**20:>7.3f} MB")
+        if options.no_fit:
+            continue
+        old_epoch = fit_epoch(data, options.epochs, use_dataset=False)
+        new_epoch = fit_epoch(data, options.epochs, use_dataset=True)
+        print(f"   epocă fit: array-uri {old_epoch:.2f}s (cu pregătirea X), tf.data {new_epoch:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Profil `python -X importtime` pentru API și uneltele CLI + verificarea că modulele
+# grele (TensorFlow, pandas, clientul Solana) nu se importă la pornire și nici la
+# cererile care nu fac predicții (/, /symbols, /reset-usage, /ready, /metrics).
+#   python check_imports.py [--top 15] [--max-ms 2000]
+
+BASE_DIR = Path(__file__).resolve().parent
+HEAVY = ("tensorflow", "keras", "pandas", "pandas_ta", "sklearn", "joblib", "solana", "solders")
+
+# Cod rulat în subproces; afișează modulele grele prezente după pas
+REQUESTS_CODE = """
+import sys
+import time
+from fastapi.testclient import TestClient
+import main
+
+with TestClient(main.app) as client:
+    for method, path, body in [
+        ("get", "/", None),
+        ("get", "/symbols", None),
+        ("get", "/symbols/catalog", None),
+        ("post", "/reset-usage", {"wallet": "check_imports", "newLimit": 5}),
+        ("get", "/ready", None),
+        ("get", "/metrics", None),
+    ]:
+        r = getattr(client, method)(path, **({"json": body} if body else {}))
+        assert r.status_code < 500, (path, r.status_code, r.text)
+    # Validatorul catalogului rulează în fundal: îl așteptăm să termine toate modelele
+    deadline = time.monotonic() + 120
+    while main.catalog.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not main.catalog.stats()["pending"], "validatorul catalogului nu a terminat"
+print("HEAVY", ",".join(sorted(m for m in %r if m in sys.modules)))
+""" % (HEAVY,)
+
+
+def parse_importtime(stderr):
+    # Linii "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def top_level(rows, skip=("main", "site", "encodings")):
+    # Primele două niveluri de importuri (fiecare nivel adaugă 2 spații) cu timpul cumulat
+    return [(cum, name.strip()) for _, cum, name in rows
+            if len(name) - len(name.lstrip()) <= 3 and name.strip() not in skip]
+
+
+def run(args, env):
+    return subprocess.run([sys.executable, "-X", "importtime", *args], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def check(label, args, env, top, max_ms):
+    result = run(args, env)
+    rows = parse_importtime(result.stderr)
+    imported = {name.strip() for _, _, name in rows}
+    heavy = sorted(m for m in HEAVY if m in imported)
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    ok = result.returncode == 0 and not heavy and (max_ms is None or total_ms <= max_ms)
+    print(f"{'✅' if ok else '❌'} {label}: {total_ms:.0f} ms importuri, {len(rows)} module"
+          + (f", module grele: {heavy}" if heavy else ""))
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else f"exit {result.returncode}")
+    for cum, name in sorted(top_level(rows), reverse=True)[:top]:
+        print(f"     {cum / 1000:>8.1f} ms  {name}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil de import și module grele la pornire")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="bugetul de import pentru fiecare țintă")
+    options = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="check_imports_"))
+    # Fără warmup (încarcă intenționat modele); catalogul și validatorul lui rămân pe setările implicite
+    env = dict(os.environ, QUOTA_DB=str(tmp / "usage.db"), WARMUP_TOP_N="0", WARMUP_SYMBOLS="",
+               WARMUP_HITS_FILE=str(tmp / "symbol_hits.json"))
+    env.pop("CATALOG_DEEP_VALIDATE", None)
+
+    results = [
+        check("import main", ["-c", "import main"], env, options.top, options.max_ms),
+        check("verify_models.py --help", ["verify_models.py", "--help"], env, options.top, options.max_ms),
+        check("precompute_forecasts.py --help", ["precompute_forecasts.py", "--help"], env, options.top,
+              options.max_ms),
+    ]
+
+    result = subprocess.run([sys.executable, "-c", REQUESTS_CODE], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True)
+    lines = [l for l in result.stdout.splitlines() if l.startswith("HEAVY ")]
+    heavy = lines[-1][len("HEAVY "):] if lines else None
+    ok = result.returncode == 0 and heavy == ""
+    print(f"{'✅' if ok else '❌'} cereri fără predicție: "
+          + (f"module grele importate: {heavy}" if heavy else "niciun modul greu importat" if ok else
+             (result.stderr.strip().splitlines() or ["eșec"])[-1]))
+    results.append(ok)
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
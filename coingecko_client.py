@@ -0,0 +1,252 @@
+import asyncio
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# COINGECKO_API_URL poate indica serverul local din coingecko_stub.py pentru teste
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+COINGECKO_RATE = float(os.getenv("COINGECKO_RATE", "0.4"))  # cereri pe secundă
+COINGECKO_BURST = int(os.getenv("COINGECKO_BURST", "3"))
+COINGECKO_CONNECTIONS = int(os.getenv("COINGECKO_CONNECTIONS", "4"))
+COINGECKO_MAX_RETRIES = int(os.getenv("COINGECKO_MAX_RETRIES", "5"))
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; NRGBot/1.0; +https://nrgai.com)"
+}
+
+NOT_MODIFIED = "not-modified"
+
+
+class TokenBucket:
+    def __init__(self, rate=COINGECKO_RATE, capacity=COINGECKO_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds):
+        # După un 429 oprim toți clienții, nu doar cererea care l-a primit
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class CoinGeckoClient:
+    def __init__(self, base_url=COINGECKO_API_URL, rate=COINGECKO_RATE, burst=COINGECKO_BURST,
+                 connections=COINGECKO_CONNECTIONS, max_retries=COINGECKO_MAX_RETRIES,
+                 backoff_base=1.0, backoff_cap=60.0, timeout=30.0, data_dir=None):
+        self.base_url = base_url.rstrip("/")
+        self.data_dir = data_dir
+        self.bucket = TokenBucket(rate, burst)
+        self.connections = connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self._http = None
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.not_modified = 0
+
+    async def open(self):
+        import httpx
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                headers=HEADERS,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.connections, max_keepalive_connections=self.connections),
+            )
+        return self
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _backoff(self, attempt):
+        # Full jitter: clienții care au primit 429 simultan nu revin toți deodată
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def market_chart(self, symbol, days=365, interval="daily", if_modified_since=None):
+        params = {"vs_currency": "usd", "days": days}
+        if interval:
+            params["interval"] = interval
+        headers = {"If-Modified-Since": if_modified_since} if if_modified_since else {}
+        return await self._get(f"{self.base_url}/coins/{symbol}/market_chart", params, headers, symbol)
+
+    async def market_chart_range(self, symbol, start, end):
+        # start/end în secunde UNIX; granularitatea o alege CoinGecko după lungimea
+        # intervalului (≤1 zi: 5 minute, ≤90 de zile: orar, altfel zilnic)
+        params = {"vs_currency": "usd", "from": int(start), "to": int(end)}
+        payload, _ = await self._get(f"{self.base_url}/coins/{symbol}/market_chart/range", params, {}, symbol)
+        return payload
+
+    async def _get(self, url, params, headers, symbol):
+        import httpx
+
+        await self.open()
+        error = None
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.requests += 1
+            try:
+                response = await self._http.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                error = e
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code == 304:
+                    self.not_modified += 1
+                    return NOT_MODIFIED, response.headers.get("Last-Modified")
+                if response.status_code == 429 or response.status_code >= 500:
+                    error = httpx.HTTPStatusError(
+                        f"{response.status_code} for {symbol}", request=response.request, response=response)
+                    delay = max(_retry_after(response), self._backoff(attempt))
+                    if response.status_code == 429:
+                        self.throttled += 1
+                        self.bucket.block(delay)
+                else:
+                    response.raise_for_status()
+                    return response.json(), response.headers.get("Last-Modified")
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(delay)
+        raise error
+
+    async def fetch_prices(self, symbol, days=365, incremental=False):
+        # incremental=True trimite If-Modified-Since din ultima descărcare a simbolului
+        state = read_ingest_state(symbol, self.data_dir)
+        since = state.get("last_modified") if incremental else None
+        payload, last_modified = await self.market_chart(symbol, days, if_modified_since=since)
+        if payload == NOT_MODIFIED:
+            return NOT_MODIFIED
+        write_ingest_state(symbol, {"last_modified": last_modified, "fetched_at": time.time(), "days": days},
+                           self.data_dir)
+        return prices_frame(payload.get("prices", []))
+
+    async def fetch_range(self, symbol, start, end):
+        # Punctele brute [[ms, preț], ...]; intraday.bars le aliniază pe rezoluție
+        payload = await self.market_chart_range(symbol, start, end)
+        return payload.get("prices", [])
+
+    async def fetch_many(self, requests, incremental=False):
+        # requests: {symbol: days}; rezultatele vin în paralel, limitate de token bucket
+        async def one(symbol, days):
+            try:
+                return symbol, await self.fetch_prices(symbol, days, incremental)
+            except Exception as e:
+                print(f"❌ Eroare la {symbol}: {e}")
+                return symbol, None
+
+        results = await asyncio.gather(*(one(s, d) for s, d in requests.items()))
+        return dict(results)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "not_modified": self.not_modified,
+        }
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+
+
+def prices_frame(prices):
+    import pandas as pd
+
+    if not prices:
+        return None
+    df = pd.DataFrame(prices, columns=["timestamp", "price"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms").dt.floor("D")
+    df = df.sort_values("timestamp")
+    df = df.drop_duplicates(subset="timestamp", keep="last")
+    return df
+
+
+def ingest_state_path(symbol, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{symbol}.ingest.json"
+
+
+def read_ingest_state(symbol, data_dir=None):
+    try:
+        with open(ingest_state_path(symbol, data_dir)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_ingest_state(symbol, state, data_dir=None):
+    path = ingest_state_path(symbol, data_dir)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+# Fațada sincronă: un singur client (pool de conexiuni + token bucket comun) pe un
+# event loop de fundal, folosit de scripturile de antrenare din mai multe thread-uri.
+_loop = None
+_client = None
+_lock = threading.Lock()
+
+
+def _background_client():
+    global _loop, _client
+    with _lock:
+        if _client is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="coingecko", daemon=True).start()
+            _client = asyncio.run_coroutine_threadsafe(CoinGeckoClient().open(), _loop).result()
+    return _loop, _client
+
+
+def fetch_prices_sync(symbol, days=365, incremental=False):
+    loop, client = _background_client()
+    return asyncio.run_coroutine_threadsafe(client.fetch_prices(symbol, days, incremental), loop).result()
+
+
+def fetch_range_sync(symbol, start, end):
+    loop, client = _background_client()
+    return asyncio.run_coroutine_threadsafe(client.fetch_range(symbol, start, end), loop).result()
@@ -0,0 +1,183 @@
+import argparse
+import email.utils
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import intraday
+import price_store
+
+# Server local care imită /api/v3/coins/{id}/market_chart (și /market_chart/range) din CoinGecko, cu
+# payload-urile înregistrate în store-ul de prețuri (price_store, data/prices/). Limita de rată, latența și erorile
+# 5xx se pot regla, ca throughput-ul și backoff-ul clientului să poată fi testate
+# fără rețea:
+#   python coingecko_stub.py --port 8765 --rate 5 --burst 5 --latency-ms 50
+#   COINGECKO_API_URL=http://127.0.0.1:8765/api/v3 python train_daily.py
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+
+class StubState:
+    def __init__(self, data_dir=DATA_DIR, rate=None, burst=5, latency_ms=0.0, error_rate=0.0, retry_after=1):
+        self.data_dir = Path(data_dir)
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "not_modified": 0, "throttled": 0, "errors": 0, "not_found": 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def allow(self):
+        if self.rate is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def payload(self, symbol, days):
+        version = price_store.version(symbol, self.data_dir)
+        if version is None:
+            return None, None
+        timestamps, values = price_store.load(symbol, self.data_dir)
+        if days != "max":
+            # Cu interval=daily CoinGecko întoarce days + 1 puncte (inclusiv ziua curentă)
+            timestamps, values = timestamps[-(int(days) + 1):], values[-(int(days) + 1):]
+        millis = timestamps.astype("datetime64[ms]").astype(np.int64)
+        prices = [[int(t), float(p)] for t, p in zip(millis, values)]
+        body = {"prices": prices, "market_caps": [], "total_volumes": []}
+        return body, version[0] / 1e9
+
+    def range_payload(self, symbol, start, end):
+        # Granularitatea după lungimea intervalului, ca CoinGecko: cel mai fin store
+        # intraday disponibil (data_dir/intraday/<rezoluție>), altfel cel zilnic
+        span = end - start
+        choices = ["5m", "1h", "1d"] if span <= 86400 else ["1h", "1d"] if span <= 90 * 86400 else ["1d"]
+        for resolution in choices:
+            directory = intraday.data_dir(resolution, self.data_dir)
+            version = price_store.version(symbol, directory)
+            if version is not None:
+                break
+        else:
+            return None, None
+        timestamps, values = price_store.load(symbol, directory)
+        seconds = timestamps.astype(np.int64)
+        lo, hi = np.searchsorted(seconds, start), np.searchsorted(seconds, end, side="right")
+        prices = [[int(t) * 1000, float(p)] for t, p in zip(seconds[lo:hi], values[lo:hi])]
+        return {"prices": prices, "market_caps": [], "total_volumes": []}, version[0] / 1e9
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=None, headers=None):
+            data = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            if url.path == "/stats":
+                return self._send(200, state.counts)
+            state.count("requests")
+            if state.latency:
+                time.sleep(state.latency)
+            if (len(parts) not in (5, 6) or parts[:3] != ["api", "v3", "coins"] or parts[4] != "market_chart"
+                    or (len(parts) == 6 and parts[5] != "range")):
+                state.count("not_found")
+                return self._send(404, {"error": "not found"})
+            if not state.allow():
+                state.count("throttled")
+                return self._send(429, {"status": {"error_code": 429}}, {"Retry-After": str(state.retry_after)})
+            if state.error_rate and random.random() < state.error_rate:
+                state.count("errors")
+                return self._send(503, {"error": "unavailable"})
+
+            query = parse_qs(url.query)
+            if len(parts) == 6:
+                try:
+                    start, end = int(query["from"][0]), int(query["to"][0])
+                except (KeyError, ValueError):
+                    return self._send(422, {"error": "from/to lipsă"})
+                body, mtime = state.range_payload(parts[3], start, end)
+            else:
+                body, mtime = state.payload(parts[3], query.get("days", ["365"])[0])
+            if body is None:
+                state.count("not_found")
+                return self._send(404, {"error": "coin not found"})
+
+            last_modified = email.utils.formatdate(int(mtime), usegmt=True)
+            since = self.headers.get("If-Modified-Since")
+            if since:
+                try:
+                    if email.utils.parsedate_to_datetime(since).timestamp() >= int(mtime):
+                        state.count("not_modified")
+                        return self._send(304, headers={"Last-Modified": last_modified})
+                except (TypeError, ValueError):
+                    pass
+            state.count("ok")
+            self._send(200, body, {"Last-Modified": last_modified})
+
+    return Handler
+
+
+def start(port=0, host="127.0.0.1", **options):
+    # Pornește serverul pe un thread de fundal; server.url este baza pentru COINGECKO_API_URL
+    state = StubState(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    server.url = f"http://{host}:{server.server_address[1]}/api/v3"
+    threading.Thread(target=server.serve_forever, name="coingecko-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server local cu payload-uri market_chart înregistrate")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    parser.add_argument("--rate", type=float, default=None, help="cereri/s permise înainte de 429")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+    server = start(args.port, data_dir=args.data_dir, rate=args.rate, burst=args.burst,
+                   latency_ms=args.latency_ms, error_rate=args.error_rate, retry_after=args.retry_after)
+    print(f"🧪 CoinGecko stub pe {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ try:
 except Exception as e:
     raise Exception(f"❌ Eroare la citirea ARY din .env: {e}")
 
-# Opțional: afișare pentru debug
-print(f"✅ ARY încărcat cu succes: {ARY}")
-print(f"🔢 Număr de elemente: {len(ARY)}")
+# Opțional: afișare pentru debug (doar la rulare directă, nu la import)
+if __name__ == "__main__":
+    print(f"✅ ARY încărcat cu succes: {ARY}")
+    print(f"🔢 Număr de elemente: {len(ARY)}")
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import numpy as np
+from pathlib import Path
+import price_store
+import streaming_indicators
+from indicators import FEATURES, add_features, valid_rows
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# Se incrementează când se schimbă definiția vreunui indicator
+FEATURE_VERSION = 2
+# Rânduri de prețuri per bucată la build: memoria nu depinde de lungimea istoricului
+CHUNK_ROWS = int(os.getenv("FEATURE_CHUNK_ROWS", str(1 << 16)))
+
+# Matricea de features (rânduri × 6, float64) stă în data/ ca .npy, ca predict să
+# citească doar ultimele rânduri prin mmap, fără pandas. Fișierul .json ține
+# versiunea prețurilor (price_store) din care a fost calculată.
+
+
+def features_path(symbol, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{symbol}.features.npy"
+
+
+def meta_path(symbol, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{symbol}.features.json"
+
+
+def source_version(symbol, data_dir=None):
+    version = price_store.version(symbol, data_dir)
+    if version is None:
+        raise FileNotFoundError(f"Nu există prețuri pentru {symbol}")
+    return list(version)
+
+
+def compute_features(df):
+    import pandas as pd
+
+    if 'price' not in df.columns:
+        if 'close' in df.columns:
+            df['price'] = df['close']
+        elif 'Close' in df.columns:
+            df['price'] = df['Close']
+        else:
+            raise ValueError("'price' column not found in data.")
+
+    df['price'] = pd.to_numeric(df['price'], errors='coerce')
+    df = df.dropna(subset=['price']).reset_index(drop=True)
+    df = add_features(df)
+    df = df.dropna().reset_index(drop=True)
+    return df
+
+
+def build(symbol, data_dir=None, chunk_rows=CHUNK_ROWS):
+    # Prețurile din store trec prin starea incrementală câte chunk_rows odată, iar
+    # rândurile valide se adaugă la .npy: memorie O(chunk) și pentru ani de lumânări
+    # orare sau la minut. Starea salvată iese din aceeași trecere.
+    version = source_version(symbol, data_dir)
+    timestamps, prices = price_store.load(symbol, data_dir)
+    state = streaming_indicators.IndicatorState()
+    path = features_path(symbol, data_dir)
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        np.save(f, np.empty((0, len(FEATURES))))
+    rows_total, first, last = 0, None, None
+    for start in range(0, len(prices), chunk_rows):
+        rows = state.update_many(prices[start:start + chunk_rows])
+        valid = np.flatnonzero(valid_rows(rows))
+        if len(valid):
+            first = timestamps[start + valid[0]] if first is None else first
+            last = timestamps[start + valid[-1]]
+            price_store.append_rows(tmp, rows[valid])
+            rows_total += len(valid)
+    os.replace(tmp, path)
+
+    bounds = price_store.format_timestamps([first, last]).tolist() if rows_total else [None, None]
+    _write_json(meta_path(symbol, data_dir), {
+        "source_version": version,
+        "feature_version": FEATURE_VERSION,
+        "features": FEATURES,
+        "rows": rows_total,
+        "first_timestamp": bounds[0],
+        "last_timestamp": bounds[1],
+    })
+    if len(prices):
+        state.last_timestamp = str(price_store.format_timestamps(timestamps[-1:])[0])
+        streaming_indicators.save_state(symbol, state, data_dir)
+    else:
+        streaming_indicators.state_path(symbol, data_dir).unlink(missing_ok=True)
+    return np.load(path, mmap_mode="r")
+
+
+def append(symbol, timestamps, prices, data_dir=None):
+    # Adaugă rânduri noi fără să reproceseze istoricul: store-ul de prețuri primește doar
+    # rândurile noi, indicatorii continuă din starea salvată, matricea .npy crește pe loc.
+    if not price_store.has(symbol, data_dir):
+        added = price_store.write(symbol, timestamps, prices, data_dir)
+        build(symbol, data_dir=data_dir)
+        return added
+    state = streaming_indicators.load_state(symbol, data_dir)
+    meta = read_meta(symbol, data_dir)
+    if state is None or not is_fresh(symbol, data_dir):
+        build(symbol, data_dir=data_dir)
+        state = streaming_indicators.load_state(symbol, data_dir)
+        meta = read_meta(symbol, data_dir)
+        if state is None:
+            raise ValueError(f"Cannot append to {symbol}: indicator state unavailable")
+
+    new_timestamps, new_prices = price_store.append(symbol, timestamps, prices, data_dir)
+    if not len(new_prices):
+        return 0
+    labels = price_store.format_timestamps(new_timestamps).tolist()
+
+    rows = state.update_many(new_prices, labels[-1])
+    valid = np.flatnonzero(valid_rows(rows))
+
+    price_store.append_rows(features_path(symbol, data_dir), rows[valid])
+    streaming_indicators.save_state(symbol, state, data_dir)
+
+    meta["source_version"] = source_version(symbol, data_dir)
+    meta["rows"] += len(valid)
+    if len(valid):
+        meta["last_timestamp"] = labels[valid[-1]]
+        meta["first_timestamp"] = meta["first_timestamp"] or labels[valid[0]]
+    _write_json(meta_path(symbol, data_dir), meta)
+    return len(labels)
+
+
+def invalidate(symbol, data_dir=None):
+    for path in (features_path(symbol, data_dir), meta_path(symbol, data_dir)):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def read_meta(symbol, data_dir=None):
+    try:
+        with open(meta_path(symbol, data_dir)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_fresh(symbol, data_dir=None):
+    meta = read_meta(symbol, data_dir)
+    return (
+        meta is not None
+        and meta.get("feature_version") == FEATURE_VERSION
+        and meta.get("features") == FEATURES
+        and meta.get("source_version") == source_version(symbol, data_dir)
+        and features_path(symbol, data_dir).exists()
+    )
+
+
+def load(symbol, data_dir=None):
+    # Reconstruiește doar dacă prețurile din store s-au schimbat de la ultimul build
+    if not is_fresh(symbol, data_dir):
+        build(symbol, data_dir=data_dir)
+    return np.load(features_path(symbol, data_dir), mmap_mode="r")
+
+
+def last_window(symbol, lookback=30, data_dir=None):
+    return np.array(load(symbol, data_dir)[-lookback:])
+
+
+def _tmp_path(path):
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _write_json(path, data):
+    tmp = _tmp_path(path)
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
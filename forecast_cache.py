@@ -0,0 +1,224 @@
+import asyncio
+import os
+import threading
+from contextlib import aclosing
+from pathlib import Path
+import numpy as np
+import forecast_store
+import global_model
+import lite_model
+import price_store
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
+
+# Prognoza depinde doar de simbol, orizont și versiunea datelor + modelului, iar
+# rollout-ul e autoregresiv: primele N zile dintr-o prognoză mai lungă sunt exact
+# prognoza pe N zile. Păstrăm deci o singură prognoză per simbol, de cel puțin
+# FORECAST_CACHE_HORIZON zile, și răspundem la orizonturile mai scurte din prefix.
+# La un miss se caută întâi în prognozele precalculate (forecast_store), apoi abia
+# se rulează modelul.
+FORECAST_CACHE_HORIZON = int(os.getenv("FORECAST_CACHE_HORIZON", "30"))
+
+
+def version(symbol, models_dir=None, scalers_dir=None, data_dir=None):
+    # Amprenta (mtime, size) a modelului, scalerului și prețurilor; un retrain sau un
+    # ingest o schimbă. None dacă lipsește vreun fișier. Exportul .tflite intră și el
+    # când există (în modul lite se servește din el), ca un re-export să invalideze cache-ul.
+    paths = global_model.paths(symbol, models_dir or MODELS_DIR, scalers_dir or SCALERS_DIR)
+    try:
+        files = tuple((st.st_mtime_ns, st.st_size) for st in (p.stat() for p in paths))
+    except FileNotFoundError:
+        return None
+    try:
+        st = lite_model.lite_path(paths[0]).stat()
+        files += ((st.st_mtime_ns, st.st_size),)
+    except FileNotFoundError:
+        pass
+    prices = price_store.version(symbol, data_dir or DATA_DIR)
+    return None if prices is None else files + (prices,)
+
+
+class ForecastCache:
+    def __init__(self, min_horizon=FORECAST_CACHE_HORIZON, precomputed=None):
+        self.min_horizon = min_horizon
+        self.precomputed = precomputed
+        self._entries = {}      # simbol -> (versiune, prețuri)
+        self._inflight = {}     # (simbol, versiune) -> (orizont, future)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.prefix_hits = 0
+        self.precomputed_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, symbol, version, days):
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                # Retrain sau ingest: prognoza veche nu mai e valabilă
+                del self._entries[symbol]
+                self.invalidations += 1
+                return None
+            prices = entry[1]
+            if len(prices) < days:
+                return None
+            self.hits += 1
+            if len(prices) > days:
+                self.prefix_hits += 1
+            return prices[:days]
+
+    def store(self, symbol, version, prices):
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None or entry[0] != version or len(entry[1]) < len(prices):
+                self._entries[symbol] = (version, prices)
+
+    def horizon(self, days):
+        return max(days, self.min_horizon)
+
+    def _load_precomputed(self, symbol, version, days):
+        if self.precomputed is None:
+            return None
+        try:
+            prices = self.precomputed.load(symbol, version, days)
+        except Exception as e:
+            print(f"⚠️  Prognoze precalculate indisponibile: {e}")
+            return None
+        if prices is None:
+            return None
+        self.store(symbol, version, prices)
+        with self._lock:
+            self.precomputed_hits += 1
+        return prices[:days]
+
+    def cached(self, symbol, version, days):
+        # Din memorie sau din prognozele precalculate; None dacă trebuie calculată
+        prices = self.lookup(symbol, version, days)
+        if prices is None:
+            prices = self._load_precomputed(symbol, version, days)
+        return prices
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def get(self, symbol, version, days, compute):
+        # compute(orizont) -> prețuri; varianta sincronă
+        prices = self.cached(symbol, version, days)
+        if prices is not None:
+            return prices
+        self.record_miss()
+        prices = compute(self.horizon(days))
+        self.store(symbol, version, prices)
+        return prices[:days]
+
+    async def _shared(self, symbol, version, days):
+        # Din cache sau dintr-un rollout deja pornit cu orizont suficient; None dacă
+        # cererea trebuie să-și pornească propriul rollout
+        while True:
+            prices = self.cached(symbol, version, days)
+            if prices is not None:
+                return prices
+            inflight = self._inflight.get((symbol, version))
+            if inflight is None or inflight[0] < days:
+                return None
+            try:
+                prices = await asyncio.shield(inflight[1])
+            except asyncio.CancelledError:
+                # Rollout-ul abandonat (clientul lui s-a deconectat): reluăm de la capăt
+                if not inflight[1].cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+            with self._lock:
+                self.hits += 1
+            return prices[:days]
+
+    def _begin(self, symbol, version, days):
+        self.record_miss()
+        horizon = self.horizon(days)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(symbol, version)] = (horizon, future)
+        return horizon, future
+
+    def _end(self, symbol, version, future, prices=None, error=None):
+        key = (symbol, version)
+        if self._inflight.get(key, (None, None))[1] is future:
+            del self._inflight[key]
+        if error is None:
+            future.set_result(prices)
+            self.store(symbol, version, prices)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+            # Excepția e deja ridicată la apelant; evităm avertismentul „never retrieved”
+            future.exception()
+        else:
+            future.cancel()
+
+    async def get_async(self, symbol, version, days, compute):
+        # Cererile simultane pentru același simbol așteaptă un singur rollout
+        prices = await self._shared(symbol, version, days)
+        if prices is not None:
+            return prices
+        horizon, future = self._begin(symbol, version, days)
+        try:
+            prices = await compute(horizon)
+        except BaseException as e:
+            self._end(symbol, version, future, error=e)
+            raise
+        self._end(symbol, version, future, prices)
+        return prices[:days]
+
+    async def stream_async(self, symbol, version, days, rollout):
+        # Ca get_async, dar prețurile ies pe rând: rollout(orizont) e un generator async
+        # care produce prețul fiecărei zile. Primele `days` ies imediat ce sunt calculate,
+        # restul orizontului se termină înainte de store, ca o cerere ulterioară mai lungă
+        # să fie un hit. Consumatorul care închide generatorul oprește rollout-ul; cererile
+        # care îl așteptau îl reiau.
+        prices = await self._shared(symbol, version, days)
+        if prices is not None:
+            for price in prices:
+                yield price
+            return
+        horizon, future = self._begin(symbol, version, days)
+        prices = np.empty(horizon)
+        try:
+            async with aclosing(rollout(horizon)) as steps:
+                i = 0
+                async for price in steps:
+                    prices[i] = price
+                    i += 1
+                    if i <= days:
+                        yield price
+        except BaseException as e:
+            self._end(symbol, version, future, error=e)
+            raise
+        self._end(symbol, version, future, prices)
+
+    def invalidate(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.precomputed_hits + self.misses
+            return {
+                "hits": self.hits,
+                "prefix_hits": self.prefix_hits,
+                "precomputed_hits": self.precomputed_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.precomputed_hits) / total, 4) if total else 0.0,
+                "invalidations": self.invalidations,
+                "symbols": len(self._entries),
+                "min_horizon": self.min_horizon,
+            }
+
+
+forecasts = ForecastCache(precomputed=forecast_store.store)
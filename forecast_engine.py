@@ -0,0 +1,97 @@
+import weakref
+import numpy as np
+
+# Funcțiile forward compilate, câte una per model încărcat
+_forward_fns = weakref.WeakKeyDictionary()
+
+
+def get_forward(model):
+    # Modelele TFLite (lite_model.LiteModel) și vederile modelului global
+    # (global_model.SymbolView) au deja un forward pe numpy
+    forward = getattr(model, "forward", None)
+    if forward is not None:
+        return forward
+    fn = _forward_fns.get(model)
+    if fn is not None:
+        return fn
+
+    import tensorflow as tf
+
+    model_ref = weakref.ref(model)
+    _, lookback, n_features = model.input_shape
+
+    # Un singur trace pentru orice batch size; evităm overhead-ul fix al model.predict
+    @tf.function(input_signature=[tf.TensorSpec([None, lookback, n_features], tf.float32)])
+    def compiled(x):
+        return model_ref()(x, training=False)
+
+    def fn(x):
+        return compiled(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+
+    _forward_fns[model] = fn
+    return fn
+
+
+class Rollout:
+    # Fereastra glisantă trăiește într-un buffer prealocat de lookback + days rânduri:
+    # inputul pasului i este view-ul buffer[i:i + lookback], fără vstack sau copii.
+    def __init__(self, window, days):
+        window = np.asarray(window, dtype=np.float64)
+        self.lookback, self.n_features = window.shape
+        # Un orizont negativ dă o prognoză goală, ca bucla veche
+        self.days = days = max(int(days), 0)
+        self.step = 0
+        self.buffer = np.empty((self.lookback + days, self.n_features))
+        self.buffer[:self.lookback] = window
+
+    @property
+    def done(self):
+        return self.step >= self.days
+
+    def next_input(self):
+        return self.buffer[self.step:self.step + self.lookback]
+
+    def push(self, pred_scaled):
+        # Ziua prezisă copiază ultimul rând și înlocuiește doar prețul (coloana 0)
+        pos = self.lookback + self.step
+        self.buffer[pos] = self.buffer[pos - 1]
+        self.buffer[pos, 0] = pred_scaled
+        self.step += 1
+
+    def scaled_predictions(self):
+        return self.buffer[self.lookback:self.lookback + self.step]
+
+    def prices(self, scaler):
+        # O singură inversare vectorizată pentru tot orizontul
+        if self.step == 0:
+            return np.empty(0)
+        return scaler.inverse_transform(self.scaled_predictions())[:, 0]
+
+
+def scaled_to_price(scaler, value):
+    # Inversa MinMaxScaler doar pe coloana prețului (aceleași operații ca inverse_transform),
+    # fără validarea sklearn: se poate apela pe event loop la fiecare pas
+    return (value - scaler.min_[0]) / scaler.scale_[0]
+
+
+def step_batch(forward, rollouts):
+    active = [r for r in rollouts if not r.done]
+    if not active:
+        return 0
+    batch = np.stack([r.next_input() for r in active])
+    preds = forward(batch)
+    for r, pred in zip(active, preds):
+        r.push(pred[0])
+    return len(active)
+
+
+def run_batch(forward, rollouts):
+    while step_batch(forward, rollouts):
+        pass
+    return rollouts
+
+
+def forecast(forward, scaler, window, days):
+    rollout = Rollout(window, days)
+    run_batch(forward, [rollout])
+    return rollout.prices(scaler)
@@ -0,0 +1,73 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Prognozele precalculate noaptea (precompute_forecasts.py): un rând per simbol, cu
+# prețurile pe tot orizontul ca blob float64 și versiunea datelor + modelului din
+# care au fost calculate. API-ul citește un singur rând după cheia primară.
+FORECASTS_DB = Path(os.getenv("FORECASTS_DB", str(BASE_DIR / "predictions" / "forecasts.db")))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    symbol TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    horizon INTEGER NOT NULL,
+    prices BLOB NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def encode_version(version):
+    return json.dumps(version, separators=(",", ":"))
+
+
+class ForecastStore:
+    def __init__(self, path=FORECASTS_DB):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def write(self, symbol, version, prices):
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO forecasts (symbol, version, horizon, prices, created_at) VALUES (?, ?, ?, ?, ?)",
+            (symbol, encode_version(version), len(prices), prices.tobytes(), time.time()),
+        )
+
+    def load(self, symbol, version, days=None):
+        # None dacă lipsește, e calculată pe altă versiune sau are orizontul prea scurt
+        row = self._connect().execute(
+            "SELECT version, horizon, prices FROM forecasts WHERE symbol = ?", (symbol,)).fetchone()
+        if row is None or row[0] != encode_version(version) or (days is not None and row[1] < days):
+            return None
+        return np.frombuffer(row[2], dtype=np.float64)
+
+    def entries(self):
+        return {
+            symbol: {"horizon": horizon, "created_at": created_at}
+            for symbol, horizon, created_at in self._connect().execute(
+                "SELECT symbol, horizon, created_at FROM forecasts ORDER BY symbol")
+        }
+
+    def delete(self, symbol):
+        self._connect().execute("DELETE FROM forecasts WHERE symbol = ?", (symbol,))
+
+
+store = ForecastStore()
@@ -4,13 +4,13 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
-import joblib
-import pandas_ta as ta
-from tensorflow.keras.models import load_model
 from pathlib import Path
 from datetime import datetime, timedelta
 import os
 import traceback
+from model_registry import get_model
+from forecast_engine import forecast, get_forward
+from indicators import FEATURES, add_features
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Dezactivează warningurile TensorFlow
 
@@ -37,15 +37,6 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 def read_index():
     return FileResponse(STATIC_DIR / "index.html")
 
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=period).mean()
-    avg_loss = pd.Series(loss).rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
 def predict(symbol: str, wallet: str, days: int):
     symbol = symbol.lower()
     wallet = wallet.lower()
@@ -71,8 +62,8 @@ def predict(symbol: str, wallet: str, days: int):
         }
 
     try:
-        model = load_model(model_path)
-        scaler = joblib.load(scaler_path)
+        loaded = get_model(symbol, MODELS_DIR, SCALERS_DIR)
+        model, scaler = loaded.model, loaded.scaler
         df = pd.read_csv(data_path)
 
         if 'price' not in df.columns:
@@ -89,43 +80,25 @@ def predict(symbol: str, wallet: str, days: int):
         df['price'] = pd.to_numeric(df['price'], errors='coerce')
         df = df.dropna().reset_index(drop=True)
 
-        df['sma_10'] = df['price'].rolling(window=10).mean()
-        df['sma_50'] = df['price'].rolling(window=50).mean()
-        df['rsi_14'] = compute_rsi(df['price'], 14)
-
-        macd = ta.macd(df['price'], fast=12, slow=26, signal=9)
-        df['macd_hist'] = macd['MACDh_12_26_9']
-
-        df['volatility'] = df['price'].pct_change().rolling(window=20).std()
+        df = add_features(df)
         df = df.dropna().reset_index(drop=True)
 
-        features = ['price', 'sma_10', 'sma_50', 'rsi_14', 'macd_hist', 'volatility']
-        data = df[features].values
+        data = df[FEATURES].values
         scaled_data = scaler.transform(data)
 
         lookback = 30
         if len(scaled_data) < lookback:
             return JSONResponse(status_code=400, content={"error": f"Not enough data. Need {lookback} days, but only have {len(scaled_data)}"})
 
-        last_sequence = scaled_data[-lookback:]
+        prices = forecast(get_forward(model), scaler, scaled_data[-lookback:], days)
+        today = datetime.today()
+        df['timestamp_dt'] = pd.to_datetime(df['timestamp'])
         predictions = []
 
-        for i in range(days):
-            input_seq = np.reshape(last_sequence, (1, lookback, len(features)))
-            pred_scaled = model.predict(input_seq, verbose=0)[0][0]
-            last_day = last_sequence[-1].copy()
-            last_day[0] = pred_scaled
-            inv_scaled = scaler.inverse_transform([last_day])[0]
-            predicted_price = inv_scaled[0]
-
-            new_scaled_row = last_sequence[-1].copy()
-            new_scaled_row[0] = pred_scaled
-            last_sequence = np.vstack([last_sequence[1:], new_scaled_row])
-
-            pred_date = (datetime.today() + timedelta(days=i+1)).strftime("%Y-%m-%d")
+        for i, predicted_price in enumerate(prices):
+            pred_date = (today + timedelta(days=i+1)).strftime("%Y-%m-%d")
 
             real_price = None
-            df['timestamp_dt'] = pd.to_datetime(df['timestamp'])
             real_row = df[df['timestamp_dt'] == pred_date]
             if not real_row.empty:
                 real_price = float(real_row.iloc[0]['price'])
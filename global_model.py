@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import model_manifest
+import windowing
+from indicators import FEATURES
+from model_integrity import file_checksum
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
+
+# Modul global: un singur LSTM antrenat pe ferestrele tuturor simbolurilor, cu un
+# embedding învățat al simbolului concatenat la fiecare pas al ferestrei. Scalerele
+# rămân per simbol (prețurile diferă cu ordine de mărime). Cu MODEL_MODE=global,
+# registrul servește orice simbol din vocabularul modelului din același model
+# încărcat; simbolurile din afara lui rămân pe modelele per simbol.
+#   python global_model.py [--epochs 50] [--force] [simboluri...]
+MODEL_MODE = os.getenv("MODEL_MODE", "symbol")
+GLOBAL_MODEL = "global_model.keras"
+GLOBAL_SCALERS = "global_scalers.save"
+GLOBAL_INFO = "global_model.json"
+# Cheia modelului comun în registru
+GLOBAL_KEY = "global_model"
+LOOKBACK = 30
+EPOCHS = 50
+BATCH_SIZE = 32
+PATIENCE = 5
+EMBEDDING_DIM = int(os.getenv("GLOBAL_EMBEDDING_DIM", "8"))
+
+_info_cache = {}
+_info_lock = threading.Lock()
+
+
+def global_paths(models_dir=None, scalers_dir=None):
+    return (
+        Path(models_dir or MODELS_DIR) / GLOBAL_MODEL,
+        Path(scalers_dir or SCALERS_DIR) / GLOBAL_SCALERS,
+    )
+
+
+def info(models_dir=None):
+    # global_model.json (simboluri, config, integritate), recitit doar când se schimbă
+    path = Path(models_dir or MODELS_DIR) / GLOBAL_INFO
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _info_lock:
+        cached = _info_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except ValueError:
+        return None
+    with _info_lock:
+        _info_cache[path] = (mtime, data)
+    return data
+
+
+def serves(symbol, models_dir=None, mode=None):
+    if (mode or MODEL_MODE) != "global":
+        return False
+    data = info(models_dir)
+    return data is not None and symbol in data.get("symbols", ())
+
+
+def symbols(models_dir=None, mode=None):
+    data = info(models_dir) if (mode or MODEL_MODE) == "global" else None
+    return list(data.get("symbols", ())) if data else []
+
+
+def paths(symbol, models_dir=None, scalers_dir=None, mode=None):
+    # Fișierele din care se servește simbolul: modelul comun sau perechea per simbol
+    if serves(symbol, models_dir, mode):
+        return global_paths(models_dir, scalers_dir)
+    return (
+        Path(models_dir or MODELS_DIR) / f"{symbol}_lstm_model.keras",
+        Path(scalers_dir or SCALERS_DIR) / f"{symbol}_lstm_scaler.save",
+    )
+
+
+def build_model(n_symbols, lookback=LOOKBACK, n_features=len(FEATURES), embedding_dim=EMBEDDING_DIM):
+    from tensorflow.keras import Model
+    from tensorflow.keras.layers import LSTM, Concatenate, Dense, Dropout, Embedding, Input, RepeatVector
+
+    window = Input((lookback, n_features), name="window")
+    symbol = Input((), dtype="int32", name="symbol")
+    embedded = RepeatVector(lookback)(Embedding(n_symbols, embedding_dim)(symbol))
+    x = Concatenate()([window, embedded])
+    x = Dropout(0.3)(LSTM(128, return_sequences=True)(x))
+    x = Dropout(0.3)(LSTM(64)(x))
+    model = Model([window, symbol], Dense(1)(x))
+    model.compile(optimizer="adam", loss="mse")
+    return model
+
+
+def training_config(n_symbols, epochs=EPOCHS, batch_size=BATCH_SIZE):
+    return {
+        "script": "global_model",
+        "features": FEATURES,
+        "lookback": LOOKBACK,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "patience": PATIENCE,
+        "embedding_dim": EMBEDDING_DIM,
+        "architecture": model_manifest.architecture(build_model(n_symbols)),
+    }
+
+
+def load_series(symbols, data_dir=None, holdout=0):
+    # Matricea de features a fiecărui simbol, fără ultimele `holdout` rânduri
+    import feature_store
+
+    series = {}
+    for symbol in symbols:
+        try:
+            data = np.asarray(feature_store.load(symbol, data_dir))
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            print(f"⚠️  {symbol}: fără date ({e})")
+            continue
+        if holdout:
+            data = data[:-holdout]
+        if windowing.count(data, LOOKBACK) == 0:
+            print(f"⚠️  Prea puține date pentru {symbol}")
+            continue
+        series[symbol] = data
+    return series
+
+
+def train(symbols, models_dir=None, scalers_dir=None, data_dir=None, epochs=EPOCHS, batch_size=BATCH_SIZE,
+          holdout=0, force=False, verbose=2):
+    import joblib
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    series = load_series(symbols, data_dir, holdout)
+    if not series:
+        raise ValueError("niciun simbol cu date suficiente")
+    names = list(series)
+    config = training_config(len(names), epochs, batch_size)
+    data_hash = model_manifest.config_hash({s: model_manifest.array_hash(d) for s, d in series.items()})
+    model_path, scaler_path = global_paths(models_dir, scalers_dir)
+    previous = info(models_dir) or {}
+    if (not force and model_path.exists() and scaler_path.exists()
+            and previous.get("data_hash") == data_hash
+            and previous.get("config_hash") == model_manifest.config_hash(config)):
+        print("⏭️  Model global: date și configurație neschimbate, nu reantrenez")
+        return previous
+
+    scalers = {s: MinMaxScaler().fit(d) for s, d in series.items()}
+    scaled = [scalers[s].transform(series[s]) for s in names]
+    rows = sum(windowing.count(d, LOOKBACK) for d in scaled)
+    print(f"🌐 Model global: {len(names)} simboluri, {rows} ferestre")
+
+    model = build_model(len(names))
+    start = time.perf_counter()
+    history = model.fit(
+        windowing.multi_dataset(scaled, LOOKBACK, batch_size), epochs=epochs, verbose=verbose,
+        callbacks=[EarlyStopping(monitor="loss", patience=PATIENCE, restore_best_weights=True)],
+    )
+    train_seconds = round(time.perf_counter() - start, 2)
+
+    # Modelul și scalerele întâi, global_model.json la final: el activează simbolurile noi
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    scaler_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_model = model_path.with_name(f"{model_path.stem}.{os.getpid()}.tmp.keras")
+    model.save(tmp_model)
+    os.replace(tmp_model, model_path)
+    tmp_scalers = scaler_path.with_name(f"{scaler_path.name}.{os.getpid()}.tmp")
+    joblib.dump({"symbols": names, "scalers": scalers}, tmp_scalers)
+    os.replace(tmp_scalers, scaler_path)
+
+    data = {
+        "symbols": names,
+        "rows": {s: len(d) for s, d in series.items()},
+        "windows": rows,
+        "data_hash": data_hash,
+        "config_hash": model_manifest.config_hash(config),
+        "config": config,
+        "epochs": len(history.history["loss"]),
+        "loss": float(min(history.history["loss"])),
+        "train_seconds": train_seconds,
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "integrity": {
+            "model_sha256": file_checksum(model_path),
+            "model_bytes": model_path.stat().st_size,
+            "scaler_sha256": file_checksum(scaler_path),
+        },
+    }
+    info_path = Path(models_dir or MODELS_DIR) / GLOBAL_INFO
+    tmp = info_path.with_name(f"{info_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, info_path)
+    print(f"✅ Model global salvat: {len(names)} simboluri, {data['epochs']} epoci în {train_seconds:.1f}s")
+    return data
+
+
+class SymbolView:
+    # Modelul comun văzut ca modelul unui simbol: input_shape și forward(x) ca LiteModel
+    def __init__(self, shared, symbol_id, scaler):
+        self.shared = shared
+        self.symbol_id = symbol_id
+        self.scaler = scaler
+        self.input_shape = (None, shared.lookback, shared.n_features)
+        self.output_shape = (None, 1)
+
+    def forward(self, x):
+        return self.shared.forward(x, np.full(len(x), self.symbol_id, dtype=np.int32))
+
+
+class GlobalModel:
+    def __init__(self, model_path, scaler_path):
+        import joblib
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+
+        self.model = load_model(model_path, compile=False)
+        saved = joblib.load(scaler_path)
+        self.ids = {symbol: i for i, symbol in enumerate(saved["symbols"])}
+        self.scalers = saved["scalers"]
+        _, self.lookback, self.n_features = self.model.input_shape[0]
+        self._views = {}
+
+        model = self.model
+
+        # Un singur trace pentru orice batch size, ca în forecast_engine.get_forward
+        @tf.function(input_signature=[tf.TensorSpec([None, self.lookback, self.n_features], tf.float32),
+                                      tf.TensorSpec([None], tf.int32)])
+        def compiled(x, ids):
+            return model([x, ids], training=False)
+
+        self._compiled = compiled
+
+    def forward(self, x, ids):
+        return self._compiled(np.asarray(x, dtype=np.float32), np.asarray(ids, dtype=np.int32)).numpy()
+
+    def view(self, symbol):
+        # None dacă simbolul nu e în modelul încărcat (vocabular mai nou pe disc)
+        view = self._views.get(symbol)
+        if view is None and symbol in self.ids:
+            view = self._views.setdefault(symbol, SymbolView(self, self.ids[symbol], self.scalers[symbol]))
+        return view
+
+
+def data_symbols(data_dir=None):
+    import price_store
+
+    return price_store.symbols(data_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Antrenează modelul global pe toate simbolurile")
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--force", action="store_true", help="reantrenează și dacă datele nu s-au schimbat")
+    options = parser.parse_args()
+    train(options.symbols or data_symbols(), epochs=options.epochs, batch_size=options.batch_size,
+          force=options.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import numpy as np
+
+# Indicatorii tehnici folosiți la antrenare, servire și verificare, calculați
+# direct pe array-uri NumPy. Intrarea poate fi 1-D (zile) sau 2-D (simboluri × zile);
+# istoriile mai scurte se completează la stânga cu NaN. Valorile din perioada de
+# încălzire sunt NaN, exact ca în varianta pandas / pandas_ta.
+
+FEATURES = ["price", "sma_10", "sma_50", "rsi_14", "macd_hist", "volatility"]
+
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (x[None, :], True) if x.ndim == 1 else (x, False)
+
+
+def _out(x, squeeze):
+    return x[0] if squeeze else x
+
+
+def _window_sums(x, window):
+    # Sume glisante prin cumsum, pe date centrate în jurul primei valori valide a
+    # rândului ca să limităm pierderea de precizie pe istorii lungi.
+    valid = ~np.isnan(x)
+    first = np.take_along_axis(x, valid.argmax(axis=-1)[:, None], axis=-1)
+    offset = np.where(np.isnan(first), 0.0, first)
+    xc = np.where(valid, x - offset, 0.0)
+    zeros = np.zeros((x.shape[0], 1))
+    c1 = np.concatenate([zeros, np.cumsum(xc, axis=-1)], axis=-1)
+    c2 = np.concatenate([zeros, np.cumsum(xc * xc, axis=-1)], axis=-1)
+    cn = np.concatenate([zeros, np.cumsum(valid, axis=-1)], axis=-1)
+    s1 = c1[:, window:] - c1[:, :-window]
+    s2 = c2[:, window:] - c2[:, :-window]
+    full = (cn[:, window:] - cn[:, :-window]) == window
+    return s1, s2, full, offset
+
+
+def sma(x, window):
+    x, squeeze = _as_2d(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        s1, _, full, offset = _window_sums(x, window)
+        out[:, window - 1:] = np.where(full, s1 / window + offset, np.nan)
+    return _out(out, squeeze)
+
+
+def rolling_std(x, window, ddof=1):
+    x, squeeze = _as_2d(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        s1, s2, full, _ = _window_sums(x, window)
+        var = np.maximum((s2 - s1 * s1 / window) / (window - ddof), 0.0)
+        out[:, window - 1:] = np.where(full, np.sqrt(var), np.nan)
+    return _out(out, squeeze)
+
+
+def _left_align(x):
+    # Mută începutul valid al fiecărui rând în coloana 0, ca recursia EMA să
+    # pornească pentru toate simbolurile din aceeași poziție.
+    n = x.shape[-1]
+    valid = ~np.isnan(x)
+    start = np.where(valid.any(axis=-1), valid.argmax(axis=-1), n)
+    cols = np.arange(n)
+    aligned = np.take_along_axis(x, (cols[None, :] + start[:, None]) % n, axis=-1)
+    aligned[cols[None, :] >= n - start[:, None]] = np.nan
+    return aligned, start
+
+
+def _restore(aligned, start):
+    n = aligned.shape[-1]
+    cols = np.arange(n)
+    out = np.take_along_axis(aligned, (cols[None, :] - start[:, None]) % n, axis=-1)
+    out[cols[None, :] < start[:, None]] = np.nan
+    return out
+
+
+def _seeded_ema(x, length, alpha):
+    # EMA cu adjust=False, inițializată cu media primelor `length` valori (ca pandas_ta)
+    from scipy.signal import lfilter
+
+    aligned, start = _left_align(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= length:
+        seed = aligned[:, :length].mean(axis=-1)
+        out[:, length - 1] = seed
+        if x.shape[-1] > length:
+            out[:, length:], _ = lfilter(
+                [alpha], [1.0, alpha - 1.0], aligned[:, length:], axis=-1,
+                zi=((1.0 - alpha) * seed)[:, None],
+            )
+    return _restore(out, start)
+
+
+def ema(x, span):
+    x, squeeze = _as_2d(x)
+    return _out(_seeded_ema(x, span, 2.0 / (span + 1)), squeeze)
+
+
+def rsi(x, period=14, mode="simple"):
+    x, squeeze = _as_2d(x)
+    delta = np.diff(x, axis=-1, prepend=np.nan)
+    # Ca în compute_rsi: diferența lipsă din primul rând contează ca gain = loss = 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[np.isnan(x)] = np.nan
+    loss[np.isnan(x)] = np.nan
+    if mode == "simple":
+        avg_gain = sma(gain, period)
+        avg_loss = sma(loss, period)
+    elif mode == "wilder":
+        avg_gain = _seeded_ema(gain, period, 1.0 / period)
+        avg_loss = _seeded_ema(loss, period, 1.0 / period)
+    else:
+        raise ValueError(f"Unknown RSI mode: {mode}")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return _out(100 - (100 / (1 + rs)), squeeze)
+
+
+def macd_hist(x, fast=12, slow=26, signal=9):
+    # Echivalentul pandas_ta.macd(...)['MACDh_12_26_9']: semnalul este EMA-ul
+    # liniei MACD începând de la prima ei valoare validă.
+    x, squeeze = _as_2d(x)
+    macd = ema(x, fast) - ema(x, slow)
+    return _out(macd - ema(macd, signal), squeeze)
+
+
+def volatility(x, window=20):
+    x, squeeze = _as_2d(x)
+    returns = np.full(x.shape, np.nan)
+    returns[:, 1:] = x[:, 1:] / x[:, :-1] - 1
+    return _out(rolling_std(returns, window), squeeze)
+
+
+def feature_matrix(prices):
+    # (zile,) -> (zile, 6) sau (simboluri, zile) -> (simboluri, zile, 6)
+    x, squeeze = _as_2d(prices)
+    matrix = np.stack([
+        x,
+        sma(x, 10),
+        sma(x, 50),
+        rsi(x, 14),
+        macd_hist(x),
+        volatility(x, 20),
+    ], axis=-1)
+    return _out(matrix, squeeze)
+
+
+def valid_rows(matrix):
+    return ~np.isnan(matrix).any(axis=-1)
+
+
+def add_features(df, price_col="price"):
+    matrix = feature_matrix(df[price_col].to_numpy(dtype=np.float64))
+    for i, name in enumerate(FEATURES[1:], start=1):
+        df[name] = matrix[:, i]
+    return df
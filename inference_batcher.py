@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+import numpy as np
+from forecast_engine import Rollout
+from inference_pool import pool
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    # Pașii de rollout ai cererilor concurente care folosesc același forward
+    # (același model) sunt strânși într-un singur batch și rulați o dată. Vederile
+    # modelului global (global_model.SymbolView) împart greutățile, deci pașii mai
+    # multor simboluri intră în același batch, cu id-ul simbolului pe fiecare rând.
+    # Modelele per simbol au greutăți proprii și nu se amestecă, chiar cu aceeași
+    # arhitectură: un batch comun ar cere oricum câte un forward per model.
+    # Un batch pleacă imediat dacă pentru cheia lui nu rulează nimic; altfel pașii
+    # se strâng până termină batch-ul în curs (sau max_wait / max_batch).
+    def __init__(self, max_batch=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS, executor=None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self._pending = {}
+        self._timers = {}
+        self._running = {}
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+        self._forward_seconds = 0.0
+        self._single_latency = None
+        self._sizes = {}
+
+    async def submit(self, forward, x):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key, symbol_id = _batch_key(forward)
+        pending = self._pending.setdefault(key, [])
+        pending.append((x, symbol_id, future))
+        if len(pending) >= self.max_batch or not self._running.get(key):
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, None)
+        if items:
+            self._running[key] = self._running.get(key, 0) + 1
+            asyncio.ensure_future(self._run(key, items))
+
+    async def _run(self, key, items):
+        try:
+            await self._forward(key, items)
+        finally:
+            self._running[key] -= 1
+            if not self._running[key]:
+                del self._running[key]
+            # Pașii strânși cât a rulat batch-ul ăsta pleacă acum, fără să aștepte timer-ul
+            if self._pending.get(key):
+                self._flush(key)
+
+    async def _forward(self, key, items):
+        items = [item for item in items if not item[2].cancelled()]
+        if not items:
+            return
+        batch = np.stack([x for x, _, _ in items])
+        if items[0][1] is None:
+            args = (key, batch)
+        else:
+            args = (key.forward, batch, np.array([i for _, i, _ in items], dtype=np.int32))
+        loop = asyncio.get_running_loop()
+        try:
+            preds, seconds = await loop.run_in_executor(self.executor, _timed, *args)
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._record(len(items), seconds)
+        for (_, _, future), pred in zip(items, preds):
+            if not future.done():
+                future.set_result(pred)
+
+    def _record(self, size, seconds):
+        self._batches += 1
+        self._items += size
+        self._max_seen = max(self._max_seen, size)
+        self._forward_seconds += seconds
+        self._sizes[size] = self._sizes.get(size, 0) + 1
+        if size == 1:
+            # Latența batch-of-one este referința pentru câștigul de throughput. Minimul
+            # observat: un pas singur rulat sub contenție (GIL, alte batch-uri) ar umfla
+            # referința și odată cu ea câștigul raportat
+            if self._single_latency is None:
+                self._single_latency = seconds
+            else:
+                self._single_latency = min(self._single_latency, seconds)
+
+    def stats(self):
+        items_per_second = self._items / self._forward_seconds if self._forward_seconds else 0.0
+        speedup = None
+        if self._single_latency and self._forward_seconds:
+            speedup = round(self._items * self._single_latency / self._forward_seconds, 2)
+        return {
+            "max_batch_size": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "largest_batch": self._max_seen,
+            "batch_size_histogram": dict(sorted(self._sizes.items())),
+            "forward_seconds": round(self._forward_seconds, 4),
+            "items_per_second": round(items_per_second, 1),
+            "single_item_latency_ms": round(self._single_latency * 1000, 3) if self._single_latency else None,
+            "speedup_vs_batch_of_one": speedup,
+        }
+
+
+def _timed(fn, *args):
+    # Timpul forward-ului măsurat pe thread-ul pool-ului, fără coada executorului
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def _batch_key(forward):
+    # (cheia batch-ului, id-ul simbolului): modelul comun pentru vederile modelului
+    # global, altfel forward-ul însuși
+    view = getattr(forward, "__self__", None)
+    shared = getattr(view, "shared", None)
+    if shared is None:
+        return forward, None
+    return shared, view.symbol_id
+
+
+async def forecast_async(batcher, forward, scaler, window, days):
+    rollout = Rollout(window, days)
+    while not rollout.done:
+        pred = await batcher.submit(forward, rollout.next_input())
+        rollout.push(pred[0])
+    return rollout.prices(scaler)
+
+
+batcher = MicroBatcher(executor=pool.executor)
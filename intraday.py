@@ -0,0 +1,178 @@
+import argparse
+import os
+import time
+from pathlib import Path
+import numpy as np
+import feature_store
+import price_store
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# Istoric intraday (orar sau la minut) alături de cel zilnic: fiecare rezoluție are
+# propriul director de date (data/intraday/1h/, ...) cu același store de prețuri,
+# aceleași features și aceeași stare incrementală ca data/, deci price_store și
+# feature_store merg neschimbate. Ingestul descarcă ferestre /market_chart/range și
+# le adaugă pe rând (memorie O(fereastră)); seria zilnică pentru modelele existente
+# se obține prin resample din istoricul intraday, parcurs în bucăți.
+#   python intraday.py ingest --resolution 1h --days 730 [--daily] [simboluri...]
+#   python intraday.py daily --resolution 1h [simboluri...]
+#   INTRADAY_RESOLUTION=1h python train_daily.py
+RESOLUTIONS = {"1d": 86400, "1h": 3600, "5m": 300, "1m": 60}
+# Cea mai lungă fereastră per cerere pentru care CoinGecko păstrează granularitatea:
+# orar până la 90 de zile, 5 minute pentru o zi (la 1m barele rămân la granularitatea sursei)
+RANGE_DAYS = {"1h": 90, "5m": 1, "1m": 1}
+DEFAULT_DAYS = {"1h": 730, "5m": 30, "1m": 7}
+INTRADAY_RESOLUTION = os.getenv("INTRADAY_RESOLUTION") or None
+CHUNK_ROWS = feature_store.CHUNK_ROWS
+
+
+def data_dir(resolution="1d", base=None):
+    base = Path(base or DATA_DIR)
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Rezoluție necunoscută: {resolution} (una din {', '.join(RESOLUTIONS)})")
+    return base if resolution == "1d" else base / "intraday" / resolution
+
+
+def step(resolution):
+    return np.timedelta64(RESOLUTIONS[resolution], "s")
+
+
+def floor(timestamps, resolution):
+    seconds = RESOLUTIONS[resolution]
+    ts = price_store.to_datetime64(timestamps).astype(np.int64)
+    return (ts // seconds * seconds).astype("datetime64[s]")
+
+
+def _first_per_bar(bars, previous=None):
+    # True pentru prima observație din fiecare bară (bars sortate); previous = bara
+    # ultimei observații din bucata anterioară
+    first = np.empty(len(bars), dtype=bool)
+    if len(bars):
+        first[0] = previous is None or bars[0] != previous
+        first[1:] = bars[1:] != bars[:-1]
+    return first
+
+
+def bars(points, resolution):
+    # [[ms, preț], ...] de la CoinGecko -> (timestamps, prețuri) pe grila rezoluției.
+    # Bara ia prima observație din interval, ca punctele zilnice CoinGecko (prețul de
+    # la 00:00 UTC etichetat cu ziua), așa că resample-ul la 1d dă aceeași serie.
+    if not len(points):
+        return np.array([], dtype="datetime64[s]"), np.array([], dtype=np.float64)
+    raw = np.asarray(points, dtype=np.float64)
+    ts = (raw[:, 0] // 1000).astype(np.int64).astype("datetime64[s]")
+    order = np.argsort(ts, kind="stable")
+    labels = floor(ts[order], resolution)
+    keep = _first_per_bar(labels) & np.isfinite(raw[order, 1])
+    return labels[keep], raw[order, 1][keep]
+
+
+def resample_chunks(timestamps, prices, resolution="1d", chunk_rows=CHUNK_ROWS):
+    # Generator (timestamps, prețuri) pe bucăți din coloanele mmap: memoria nu
+    # depinde de lungimea istoricului
+    previous = None
+    for start in range(0, len(prices), chunk_rows):
+        labels = floor(timestamps[start:start + chunk_rows], resolution)
+        first = _first_per_bar(labels, previous)
+        previous = labels[-1]
+        yield labels[first], np.array(prices[start:start + chunk_rows][first])
+
+
+def resample(symbol, resolution="1h", to="1d", base=None, after=None, chunk_rows=CHUNK_ROWS):
+    # Seria la rezoluția `to` din store-ul intraday; after = ultima bară deja cunoscută
+    timestamps, prices = price_store.load(symbol, data_dir(resolution, base))
+    start = 0 if after is None else np.searchsorted(timestamps, np.datetime64(after, "s") + step(to))
+    parts = list(resample_chunks(timestamps[start:], prices[start:], to, chunk_rows))
+    if not parts:
+        return np.array([], dtype="datetime64[s]"), np.array([], dtype=np.float64)
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def sync_daily(symbol, resolution="1h", base=None):
+    # Zilele închise din istoricul intraday care lipsesc din data/ ajung în store-ul
+    # zilnic (și în features), pentru modelele zilnice existente
+    after = price_store.last_timestamp(symbol, base) if price_store.has(symbol, base) else None
+    days, values = resample(symbol, resolution, "1d", base, after)
+    closed = days < np.datetime64("today", "D")
+    if not closed.any():
+        return 0
+    return feature_store.append(symbol, days[closed], values[closed], data_dir("1d", base))
+
+
+def ingest(symbol, resolution="1h", days=None, base=None, fetch=None):
+    # Descarcă barele lipsă în ferestre de RANGE_DAYS și le adaugă pe rând: prețuri,
+    # features și starea indicatorilor cresc incremental, memoria e O(fereastră)
+    if resolution not in RANGE_DAYS:
+        raise ValueError(f"{resolution} nu e o rezoluție intraday")
+    if fetch is None:
+        import coingecko_client
+        fetch = coingecko_client.fetch_range_sync
+    directory = data_dir(resolution, base)
+    directory.mkdir(parents=True, exist_ok=True)
+    now = np.datetime64("now", "s")
+    last = price_store.last_timestamp(symbol, directory) if price_store.has(symbol, directory) else None
+    if last is None:
+        start = floor([now - np.timedelta64(days or DEFAULT_DAYS[resolution], "D")], resolution)[0]
+    else:
+        start = last + step(resolution)
+    window = np.timedelta64(RANGE_DAYS[resolution], "D")
+    added = 0
+    while start < now:
+        end = min(start + window, now)
+        ts, values = bars(fetch(symbol, start.astype(np.int64), end.astype(np.int64)), resolution)
+        # Doar barele închise; bara curentă vine la următorul ingest
+        closed = (ts >= start) & (ts + step(resolution) <= now)
+        if closed.any():
+            added += feature_store.append(symbol, ts[closed], values[closed], directory)
+        start = end
+    return added
+
+
+def update(symbol, resolution=INTRADAY_RESOLUTION, base=None):
+    # Pentru train_daily: intraday la zi, apoi zilele noi în seria zilnică
+    added = ingest(symbol, resolution, base=base)
+    print(f"✅ {symbol}: {added} bare {resolution} noi")
+    return sync_daily(symbol, resolution, base)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Istoric intraday: ingest, resample la zilnic, info")
+    parser.add_argument("command", choices=["ingest", "daily", "info"])
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--resolution", default=INTRADAY_RESOLUTION or "1h", choices=list(RANGE_DAYS))
+    parser.add_argument("--days", type=int, default=None, help="istoricul inițial (implicit per rezoluție)")
+    parser.add_argument("--daily", action="store_true", help="după ingest, completează și seria zilnică")
+    parser.add_argument("--download-workers", type=int, default=4)
+    options = parser.parse_args()
+    directory = data_dir(options.resolution)
+    symbols = options.symbols or (price_store.symbols() if options.command == "ingest"
+                                  else price_store.symbols(directory))
+
+    if options.command == "info":
+        for symbol in symbols:
+            info = price_store.entry(symbol, directory) or {}
+            print(f"  {symbol:<22}{info.get('rows', 0):>10} bare  "
+                  f"{info.get('first_timestamp')} → {info.get('last_timestamp')}")
+        return
+
+    def one(symbol):
+        try:
+            if options.command == "ingest":
+                added = ingest(symbol, options.resolution, options.days)
+                print(f"✅ {symbol}: {added} bare {options.resolution} noi")
+            if options.command == "daily" or options.daily:
+                print(f"📅 {symbol}: {sync_daily(symbol, options.resolution)} zile noi în seria zilnică")
+        except Exception as e:
+            print(f"❌ Eroare la {symbol}: {e}")
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, options.download_workers)) as pool:
+        list(pool.map(one, symbols))
+    print(f"🏁 {len(symbols)} simboluri în {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import model_manifest
+from model_integrity import file_checksum
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+
+# Lângă fiecare {simbol}_lstm_model.keras antrenarea scrie și un .tflite: LSTM-ul
+# convertit în operații TFLite native, rulat de interpretorul TFLite (XNNPACK pentru
+# float32), fără graful de obiecte Keras. Exportul e acceptat doar dacă ieșirea
+# diferă de Keras cu cel mult LITE_TOLERANCE. MODEL_BACKEND: "keras" (implicit),
+# "auto" (TFLite dacă există și e exportat după ultimul .keras) sau "lite".
+# Modelul se exportă cu batch fix 1: starea LSTM-ului fuzionat are dimensiunea
+# batch-ului și nu se redimensionează (resize_tensor_input eșuează la prepare), iar
+# conversia cu batch variabil nu e posibilă doar cu operații native. Un lot de
+# ferestre rulează deci rând cu rând, sub lock-ul interpretorului; chiar exportat cu
+# batch fix mai mare, kernel-ul LSTM TFLite costă liniar în batch (~0.4 ms per fereastră).
+# Keras e mai lent pe un singur pas (~1.9 ms), dar un batch de 32 costă ~6 ms: cu 32
+# de cereri simultane prin micro-batcher face ~3500 pași/s, față de ~2250 la TFLite.
+# De aceea Keras rămâne implicit; TFLite merită pentru servere cu puțină memorie sau cereri rare,
+# unde contează latența unei cereri singure și lipsa TensorFlow din proces
+# (bench_lite.py măsoară ambele).
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "keras")
+LITE_THREADS = int(os.getenv("LITE_THREADS", "1"))
+LITE_TOLERANCE = float(os.getenv("LITE_TOLERANCE", "1e-4"))
+LITE_CHECK_SAMPLES = 64
+
+
+def lite_path(model_path):
+    return Path(model_path).with_suffix(".tflite")
+
+
+def mtime(model_path):
+    try:
+        return lite_path(model_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def usable(model_path, backend=None):
+    # Calea .tflite de servit sau None (backend keras, lipsă sau mai vechi decât .keras)
+    backend = backend or MODEL_BACKEND
+    if backend == "keras":
+        return None
+    lite_mtime = mtime(model_path)
+    if lite_mtime and lite_mtime >= Path(model_path).stat().st_mtime_ns:
+        return lite_path(model_path)
+    if backend == "lite":
+        raise FileNotFoundError(f"{lite_path(model_path).name} lipsește sau e mai vechi decât modelul Keras")
+    return None
+
+
+def _interpreter_class():
+    # Runtime-ul separat nu trage TensorFlow după el; altfel folosim tf.lite
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class LiteModel:
+    # Expune input_shape și forward(x) ca forecast_engine să-l trateze ca pe un model Keras
+    lite = True
+
+    def __init__(self, path, threads=LITE_THREADS):
+        self.path = Path(path)
+        self.interpreter = _interpreter_class()(model_path=str(path), num_threads=threads)
+        self.interpreter.allocate_tensors()
+        inp = self.interpreter.get_input_details()[0]
+        out = self.interpreter.get_output_details()[0]
+        self._input = inp["index"]
+        self._output = out["index"]
+        self.input_shape = (None, *(int(d) for d in inp["shape"][1:]))
+        self.output_shape = (None, *(int(d) for d in out["shape"][1:]))
+        # Interpretorul nu e thread-safe; pool-ul de inferență are mai multe thread-uri
+        self._lock = threading.Lock()
+
+    def forward(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        out = np.empty((len(x), *self.output_shape[1:]), dtype=np.float32)
+        with self._lock:
+            for i in range(len(x)):
+                # Starea LSTM-ului e un tensor variabil în TFLite: fiecare fereastră pornește de la zero
+                self.interpreter.reset_all_variables()
+                self.interpreter.set_tensor(self._input, x[i:i + 1])
+                self.interpreter.invoke()
+                out[i] = self.interpreter.get_tensor(self._output)[0]
+        return out
+
+
+def convert(model):
+    import tensorflow as tf
+
+    _, lookback, n_features = model.input_shape
+    fn = tf.function(lambda x: model(x, training=False))
+    concrete = fn.get_concrete_function(tf.TensorSpec([1, lookback, n_features], tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+    # Doar operații native (LSTM fuzionat), ca interpretorul fără TensorFlow să le poată rula
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    return converter.convert()
+
+
+def max_abs_diff(model, lite, samples=LITE_CHECK_SAMPLES, seed=0):
+    _, lookback, n_features = model.input_shape
+    x = np.random.default_rng(seed).uniform(0, 1, (samples, lookback, n_features)).astype(np.float32)
+    expected = np.asarray(model(x, training=False))
+    # Câte o fereastră, apoi tot lotul: prinde și starea rămasă între invocări
+    single = np.concatenate([lite.forward(x[i:i + 1]) for i in range(samples)])
+    batched = lite.forward(x)
+    return float(max(np.abs(single - expected).max(), np.abs(batched - expected).max()))
+
+
+def export(model, model_path, tolerance=LITE_TOLERANCE):
+    path = lite_path(model_path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(convert(model))
+        diff = max_abs_diff(model, LiteModel(tmp))
+        if diff > tolerance:
+            raise ValueError(f"TFLite diferă de Keras cu {diff:.2e} (> {tolerance:.0e})")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return {
+        "path": path.name,
+        "bytes": path.stat().st_size,
+        "sha256": file_checksum(path),
+        "max_abs_diff": diff,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def try_export(model, model_path, tolerance=LITE_TOLERANCE):
+    # Antrenarea nu eșuează din cauza exportului; serverul rămâne pe Keras pentru simbol
+    try:
+        return export(model, model_path, tolerance)
+    except Exception as e:
+        lite_path(model_path).unlink(missing_ok=True)
+        print(f"⚠️  Export TFLite eșuat pentru {Path(model_path).name}: {e}")
+        return None
+
+
+def export_missing(symbols=None, tolerance=LITE_TOLERANCE, force=False):
+    # Exportă modelele fără .tflite la zi (ex. după un checkout sau un antrenament sărit)
+    from tensorflow.keras.models import load_model
+    from model_integrity import available_symbols
+
+    exported, failed = [], []
+    for symbol in symbols or available_symbols():
+        model_path = MODELS_DIR / f"{symbol}_lstm_model.keras"
+        if not force and usable(model_path, "auto") is not None:
+            continue
+        info = try_export(load_model(model_path, compile=False), model_path, tolerance)
+        if info is None:
+            failed.append(symbol)
+            continue
+        model_manifest.update(symbol, {"lite": info})
+        exported.append(symbol)
+        print(f"✅ {symbol}: {info['bytes'] / 1024:.0f} KB, diferență maximă {info['max_abs_diff']:.1e}")
+    print(f"📦 {len(exported)} modele exportate în TFLite" + (f", eșuate: {failed}" if failed else ""))
+    return exported, failed
+
+
+def main():
+    # Export pentru modelele existente, fără reantrenare:  python lite_model.py [--force] [simboluri...]
+    parser = argparse.ArgumentParser(description="Exportă modelele Keras în TFLite")
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--tolerance", type=float, default=LITE_TOLERANCE)
+    parser.add_argument("--force", action="store_true", help="reexportă și modelele la zi")
+    args = parser.parse_args()
+    export_missing(args.symbols or None, args.tolerance, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,31 @@
 import os
+import asyncio
 import json
 
 from pathlib import Path
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from solana.rpc.api import Client
-from solana.publickey import PublicKey
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from tensorflow.keras.models import load_model
-from predict_lstm_pro import predict as get_prediction_for_symbol
+from predict_lstm_pro import predict_async as get_prediction_for_symbol, predict_stream
+from inference_batcher import batcher
+from inference_pool import pool
+from model_registry import registry
+from quota_store import store as quota_store
+from payment_cache import payments
+from forecast_cache import forecasts
+from symbol_catalog import catalog
+from warmup import choose_symbols, hits, warmup
+from solana_rpc import SolanaRpc, SOLANA_RPC
 
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
-SOLANA_RPC = "https://api.mainnet-beta.solana.com"
-NRG_TOKEN_MINT = PublicKey("CBTuVEM1Z5z5ddfQVEGAAHPN1ckj6j97zHvKtrc78suj")
-
 BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR / "models"
 SCALERS_DIR = BASE_DIR / "scalers"
 DATA_DIR = BASE_DIR / "data"
-STORAGE_FILE = BASE_DIR / "usage.json"
-
-PREDICTION_LIMIT = 5
 
 app = FastAPI()
 app.add_middleware(
@@ -34,7 +36,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-solana_client = Client(SOLANA_RPC)
+solana_client = None
+
+def get_solana_client():
+    global solana_client
+    if solana_client is None:
+        solana_client = SolanaRpc(SOLANA_RPC)
+    return solana_client
 
 class PredictRequest(BaseModel):
     wallet: str
@@ -46,81 +54,74 @@ class ResetUsageRequest(BaseModel):
     newLimit: int
 
 def get_available_symbols():
-    symbols = []
-    for model_file in MODELS_DIR.glob("*_lstm_model.keras"):
-        try:
-            symbol = model_file.stem.replace("_lstm_model", "")
-            symbols.append(symbol)
-        except Exception as e:
-            print(f"Error processing model file {model_file}: {e}")
-            continue
-    return sorted(symbols)
+    # Din catalogul din memorie; modelele marcate corupte de validator nu apar
+    return catalog.symbols()
 
-def load_usage():
-    if not STORAGE_FILE.exists():
-        return {}
-    try:
-        with STORAGE_FILE.open("r") as f:
-            data = json.load(f)
-        for key, val in data.items():
-            if isinstance(val, int):
-                data[key] = {"count": val, "limit": PREDICTION_LIMIT}
-        return data
-    except Exception:
-        return {}
-
-def save_usage(data):
-    with STORAGE_FILE.open("w") as f:
-        json.dump(data, f, indent=2)
-
-def increment_usage(user_id):
-    data = load_usage()
-    if user_id not in data:
-        data[user_id] = {"count": 0, "limit": PREDICTION_LIMIT}
-    data[user_id]["count"] += 1
-    save_usage(data)
-    return max(0, data[user_id]["limit"] - data[user_id]["count"])
-
-def get_remaining_predictions(user_id):
-    data = load_usage()
-    if user_id not in data:
-        return PREDICTION_LIMIT
-    return max(0, data[user_id]["limit"] - data[user_id]["count"])
-
-def get_prediction_quota(user_id):
-    data = load_usage()
-    if user_id not in data:
-        return {"used": 0, "remaining": PREDICTION_LIMIT}
-    return {
-        "used": data[user_id]["count"],
-        "remaining": max(0, data[user_id]["limit"] - data[user_id]["count"]),
-    }
+# Cota se rezervă atomic înainte de predicție și se restituie dacă predicția eșuează
+async def reserve_prediction_async(user_id):
+    return await asyncio.to_thread(quota_store.reserve, user_id)
+
+async def refund_prediction_async(user_id):
+    await asyncio.to_thread(quota_store.refund, user_id)
+
+async def check_nrg_payment(wallet_address: str) -> bool:
+    # Clientul Solana se importă doar când chiar verificăm o plată
+    from solana.publickey import PublicKey
 
-def check_nrg_payment(wallet_address: str) -> bool:
     try:
-        pubkey = PublicKey(wallet_address)
-        transactions = solana_client.get_signatures_for_address(pubkey).get("result", [])
-        for tx in transactions:
-            sig = tx.get("signature")
-            if not sig:
-                continue
-            tx_data = solana_client.get_transaction(sig).get("result")
-            if not tx_data:
-                continue
-            meta = tx_data.get("meta", {})
-            post_token_balances = meta.get("postTokenBalances", [])
-            for balance in post_token_balances:
-                if balance.get("mint") == str(NRG_TOKEN_MINT) and balance.get("owner") == wallet_address:
-                    return True
-        return False
+        PublicKey(wallet_address)
     except Exception as e:
         print(f"Error checking payment: {e}")
         return False
+    # Rezultatul se memorează per portofel; verificările următoare cer doar semnăturile noi
+    return await payments.check(get_solana_client(), wallet_address)
+
+async def run_prediction(request: PredictRequest):
+    # Numărul de cereri per simbol decide ce modele se încălzesc la următoarea pornire
+    symbol = request.symbol.lower()
+    if symbol in catalog.symbols() and hits.record(symbol):
+        await asyncio.to_thread(hits.save)
+    async with pool.slot():
+        return await get_prediction_for_symbol(request.symbol, request.wallet, request.days)
+
+async def stream_prediction(request: PredictRequest):
+    # Ca run_prediction, dar rândurile ies pe măsură ce sunt calculate; slotul din pool
+    # rămâne ocupat cât trăiește stream-ul
+    symbol = request.symbol.lower()
+    if symbol in catalog.symbols() and hits.record(symbol):
+        await asyncio.to_thread(hits.save)
+    async with pool.slot():
+        async for row in predict_stream(request.symbol, request.wallet, request.days):
+            yield row
+
+def prediction_error(e):
+    if isinstance(e, HTTPException):
+        if e.status_code == 503:
+            return e
+        return HTTPException(status_code=500, detail=f"Prediction error: {e.detail}")
+    return HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.on_event("startup")
+def start_catalog():
+    catalog.start()
+    warmup.start(choose_symbols(catalog.symbols(), ranked=hits.ranked()))
+
+@app.on_event("shutdown")
+async def close_solana_client():
+    catalog.stop()
+    hits.save()
+    if solana_client is not None:
+        await solana_client.close()
 
 @app.get("/")
 def root():
     return {"status": "Backend NRG FastAPI online"}
 
+@app.get("/ready")
+def ready():
+    # Readiness separat de /: 503 până când modelele populare sunt încărcate și trasate
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.stats())
+
 @app.get("/symbols")
 def get_symbols():
     try:
@@ -128,45 +129,124 @@ def get_symbols():
         if not symbols:
             raise HTTPException(status_code=404, detail="No symbols found.")
         return {"symbols": symbols}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/symbols/catalog")
+def get_symbol_catalog():
+    return {"symbols": catalog.entries(), "stats": catalog.stats()}
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "batching": batcher.stats(),
+        "inference_pool": pool.stats(),
+        "models": registry.stats(),
+        "payments": payments.stats(),
+        "forecasts": forecasts.stats(),
+        "catalog": catalog.stats(),
+        "warmup": warmup.stats(),
+    }
+
 @app.post("/predict-lstm")
 async def predict_endpoint(request: PredictRequest):
     user_id = request.wallet if request.wallet != "anonymous_user" else "anon"
 
     if not request.symbol or not request.days:
         raise HTTPException(status_code=400, detail="Missing symbol or days")
+    if request.days < 1:
+        raise HTTPException(status_code=400, detail="days must be at least 1")
 
-    if request.wallet != "anonymous_user" and check_nrg_payment(request.wallet):
+    if request.wallet != "anonymous_user" and await check_nrg_payment(request.wallet):
         try:
-            result = get_prediction_for_symbol(request.symbol, request.wallet, request.days)
+            result = await run_prediction(request)
             return {"prediction": result, "free_predictions_left": 999, "paid": True}
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+            raise prediction_error(e)
 
-    remaining = get_remaining_predictions(user_id)
-    if remaining <= 0:
+    quota = await reserve_prediction_async(user_id)
+    if quota is None:
         return {"message": "Free predictions exhausted", "free_predictions_left": 0, "paid": False}
 
     try:
-        result = get_prediction_for_symbol(request.symbol, request.wallet, request.days)
-        free_left = increment_usage(user_id)
-        quota = get_prediction_quota(user_id)
+        result = await run_prediction(request)
         return {
             "prediction": result,
-            "free_predictions_left": free_left,
+            "free_predictions_left": quota["remaining"],
             "quota": quota,
             "paid": False
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        await refund_prediction_async(user_id)
+        raise prediction_error(e)
+
+@app.post("/predict-lstm/stream")
+async def predict_stream_endpoint(request: PredictRequest):
+    # NDJSON: câte o linie {"timestamp", "Predicted_Price"} per zi a orizontului, pe măsură
+    # ce rollout-ul o produce. Cota se rezervă o singură dată, la pornirea stream-ului, și
+    # se restituie doar dacă clientul n-a primit niciun rând: erorile de dinaintea primei
+    # zile (model lipsă, serviciu ocupat) rămân răspunsuri HTTP, cele de pe parcurs devin
+    # o linie {"error": ...} finală, iar deconectarea oprește rollout-ul. Odată trimis un
+    # rând, predicția e taxată, oricum s-ar termina stream-ul.
+    user_id = request.wallet if request.wallet != "anonymous_user" else "anon"
+
+    if not request.symbol or not request.days:
+        raise HTTPException(status_code=400, detail="Missing symbol or days")
+    if request.days < 1:
+        raise HTTPException(status_code=400, detail="days must be at least 1")
+
+    paid = request.wallet != "anonymous_user" and await check_nrg_payment(request.wallet)
+    quota = None
+    if not paid:
+        quota = await reserve_prediction_async(user_id)
+        if quota is None:
+            return {"message": "Free predictions exhausted", "free_predictions_left": 0, "paid": False}
+
+    rows = stream_prediction(request)
+    try:
+        first = await rows.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except BaseException as e:
+        # Inclusiv CancelledError (client deconectat înainte de primul rând)
+        await rows.aclose()
+        if not paid:
+            await refund_prediction_async(user_id)
+        if not isinstance(e, Exception):
+            raise
+        raise prediction_error(e)
+
+    async def body():
+        delivered = False
+        try:
+            if first is not None:
+                # Rândul predat serverului pentru trimitere contează ca livrat
+                delivered = True
+                yield json.dumps(first) + "\n"
+            async for row in rows:
+                delivered = True
+                yield json.dumps(row) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": prediction_error(e).detail}) + "\n"
+        finally:
+            # La deconectarea clientului generatorul se închide aici: rollout-ul se oprește
+            await rows.aclose()
+            if not delivered and not paid:
+                await refund_prediction_async(user_id)
+
+    headers = {
+        "X-Paid": "true" if paid else "false",
+        "X-Free-Predictions-Left": str(999 if paid else quota["remaining"]),
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    }
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
 
 @app.post("/reset-usage")
-def reset_usage_endpoint(req: ResetUsageRequest):
-    data = load_usage()
+async def reset_usage_endpoint(req: ResetUsageRequest):
     if req.wallet:
-        data[req.wallet] = {"count": 0, "limit": req.newLimit}
-        save_usage(data)
+        await asyncio.to_thread(quota_store.reset, req.wallet, req.newLimit)
         return {"message": "Usage reset"}
     raise HTTPException(status_code=400, detail="Missing wallet")
@@ -0,0 +1,269 @@
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import model_manifest
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+
+# La salvare, scripturile de antrenare scriu în manifest (cheia "integrity")
+# checksum-ul modelului și scalerului și forma intrării/ieșirii. Verificarea are
+# două treceri, ambele într-un pool de procese: întâi doar checksum-urile (fără
+# TensorFlow), apoi încărcare completă + o inferență de probă numai pentru modelele
+# care nu se potrivesc cu ce s-a înregistrat. Raportul ajunge în
+# models/integrity_report.json și îl citesc scripturile de reantrenare.
+INTEGRITY_WORKERS = int(os.getenv("INTEGRITY_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+REPORT_NAME = "integrity_report.json"
+MODEL_SUFFIX = "_lstm_model.keras"
+KERAS_MEMBERS = {"config.json", "model.weights.h5"}
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_archive(path):
+    # Verificare ieftină, fără TensorFlow: arhiva .keras trebuie să fie un zip întreg
+    with zipfile.ZipFile(path) as archive:
+        missing = KERAS_MEMBERS - set(archive.namelist())
+        if missing:
+            raise ValueError(f"arhivă incompletă, lipsesc {sorted(missing)}")
+        broken = archive.testzip()
+        if broken is not None:
+            raise ValueError(f"membru corupt în arhivă: {broken}")
+
+
+def report_path(models_dir=None):
+    return Path(models_dir or MODELS_DIR) / REPORT_NAME
+
+
+def paths(symbol, models_dir=None, scalers_dir=None):
+    return (
+        Path(models_dir or MODELS_DIR) / f"{symbol}{MODEL_SUFFIX}",
+        Path(scalers_dir or SCALERS_DIR) / f"{symbol}_lstm_scaler.save",
+    )
+
+
+def available_symbols(models_dir=None):
+    return sorted(p.name[:-len(MODEL_SUFFIX)] for p in Path(models_dir or MODELS_DIR).glob(f"*{MODEL_SUFFIX}"))
+
+
+def _shapes(tensors):
+    return [[None if d is None else int(d) for d in t.shape] for t in tensors]
+
+
+def signature(model):
+    return {"inputs": _shapes(model.inputs), "outputs": _shapes(model.outputs)}
+
+
+def fingerprint(model, model_path, scaler_path):
+    # Se apelează imediat după model.save / joblib.dump
+    return {
+        "model_sha256": file_checksum(model_path),
+        "model_bytes": Path(model_path).stat().st_size,
+        "scaler_sha256": file_checksum(scaler_path),
+        "signature": signature(model),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def recorded(symbol, models_dir=None):
+    manifest = model_manifest.read(symbol, models_dir)
+    return (manifest or {}).get("integrity")
+
+
+def _init_worker():
+    os.environ["TF_NUM_INTRAOP_THREADS"] = "1"
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ["OMP_NUM_THREADS"] = "1"
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+
+def checksum_check(symbol, models_dir=None, scalers_dir=None):
+    # Trecerea ieftină: "ok" doar dacă ambele fișiere sunt exact cele înregistrate
+    model_path, scaler_path = paths(symbol, models_dir, scalers_dir)
+    result = {"symbol": symbol, "checked": "checksum", "model_sha256": None, "scaler_sha256": None}
+    if not model_path.exists() or not scaler_path.exists():
+        return dict(result, status="missing", error="model sau scaler lipsă")
+    result["model_sha256"] = file_checksum(model_path)
+    result["scaler_sha256"] = file_checksum(scaler_path)
+    expected = recorded(symbol, models_dir)
+    if expected is None:
+        return dict(result, status="unrecorded")
+    if (expected.get("model_sha256"), expected.get("scaler_sha256")) != (result["model_sha256"], result["scaler_sha256"]):
+        return dict(result, status="mismatch")
+    return dict(result, status="ok", signature=expected.get("signature"))
+
+
+def load_check(symbol, models_dir=None, scalers_dir=None):
+    # Trecerea completă: arhiva, încărcarea, semnătura și o inferență pe zerouri
+    import numpy as np
+    import joblib
+    from tensorflow.keras.models import load_model
+
+    model_path, scaler_path = paths(symbol, models_dir, scalers_dir)
+    result = checksum_check(symbol, models_dir, scalers_dir)
+    if result["status"] == "missing":
+        return result
+    previous = result["status"]
+    result["checked"] = "load"
+    try:
+        check_archive(model_path)
+        model = load_model(model_path, compile=False)
+        scaler = joblib.load(scaler_path)
+        sig = signature(model)
+        features = sig["inputs"][0][-1]
+        if getattr(scaler, "n_features_in_", features) != features:
+            raise ValueError(f"scalerul are {scaler.n_features_in_} coloane, modelul așteaptă {features}")
+        expected = recorded(symbol, models_dir)
+        if expected is not None and expected.get("signature") != sig:
+            raise ValueError(f"semnătură {sig} diferită de cea înregistrată {expected.get('signature')}")
+        window = scaler.transform(np.zeros((sig["inputs"][0][1] or 1, features)))
+        output = np.asarray(model(window[None, ...].astype("float32"), training=False))
+        if not np.all(np.isfinite(output)):
+            raise ValueError("inferența de probă a întors valori nefinite")
+    except Exception as e:
+        return dict(result, status="corrupt", error=str(e))
+    # Modelul merge, dar nu e cel salvat de antrenare (ex. copiat de mână)
+    return dict(result, status="changed" if previous == "mismatch" else "ok", signature=sig,
+                unrecorded=previous == "unrecorded")
+
+
+def _update_manifest(symbol, result, models_dir=None):
+    # Modelele vechi, salvate înainte de manifest, primesc amprenta după o verificare completă reușită
+    model_manifest.update(symbol, {"integrity": {
+        "model_sha256": result["model_sha256"],
+        "model_bytes": paths(symbol, models_dir)[0].stat().st_size,
+        "scaler_sha256": result["scaler_sha256"],
+        "signature": result["signature"],
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }}, models_dir)
+
+
+def verify(symbols=None, workers=INTEGRITY_WORKERS, deep=False, adopt=False, models_dir=None, scalers_dir=None,
+           write_report=True):
+    symbols = symbols or available_symbols(models_dir)
+    start = time.perf_counter()
+    results = {}
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=ctx, initializer=_init_worker) as executor:
+        cheap = executor.map(checksum_check, symbols, [models_dir] * len(symbols), [scalers_dir] * len(symbols))
+        for result in cheap:
+            results[result["symbol"]] = result
+        # Încărcarea completă doar unde checksum-ul nu confirmă modelul salvat
+        suspects = [s for s, r in results.items() if r["status"] in ("mismatch", "unrecorded") or
+                    (deep and r["status"] == "ok")]
+        for result in executor.map(load_check, suspects, [models_dir] * len(suspects), [scalers_dir] * len(suspects)):
+            results[result["symbol"]] = result
+
+    if adopt:
+        for symbol, result in results.items():
+            if result["status"] == "ok" and result.pop("unrecorded", False):
+                _update_manifest(symbol, result, models_dir)
+    for result in results.values():
+        result.pop("unrecorded", None)
+        result["valid"] = result["status"] in ("ok", "changed")
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - start, 2),
+        "workers": workers,
+        "loaded": len(suspects),
+        "valid": sorted(s for s, r in results.items() if r["valid"]),
+        "corrupt": sorted(s for s, r in results.items() if not r["valid"]),
+        "symbols": dict(sorted(results.items())),
+    }
+    if write_report:
+        save_report(report, models_dir)
+    return report
+
+
+def save_report(report, models_dir=None):
+    path = report_path(models_dir)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_report(models_dir=None):
+    try:
+        with open(report_path(models_dir)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def reported(symbol, checksum, models_dir=None):
+    # Rezultatul din raport pentru exact acest fișier (același checksum), altfel None
+    entry = ((load_report(models_dir) or {}).get("symbols") or {}).get(symbol)
+    if entry is None or entry.get("model_sha256") != checksum or entry.get("valid") is None:
+        return None
+    return entry
+
+
+def record_result(result, models_dir=None):
+    # Adaugă în raport rezultatul unei verificări făcute în afara lui verify (ex. catalogul API)
+    report = load_report(models_dir) or {"generated_at": None, "seconds": 0, "workers": 0, "loaded": 0, "symbols": {}}
+    symbols = dict(report.get("symbols") or {}, **{result["symbol"]: result})
+    report.update(
+        symbols=dict(sorted(symbols.items())),
+        valid=sorted(s for s, r in symbols.items() if r.get("valid")),
+        corrupt=sorted(s for s, r in symbols.items() if not r.get("valid")),
+    )
+    save_report(report, models_dir)
+
+
+def corrupt_symbols(models_dir=None, refresh=False):
+    # Lista pentru reantrenare; fără raport (sau cu refresh=True) rulează verificarea
+    report = None if refresh else load_report(models_dir)
+    if report is None:
+        report = verify(models_dir=models_dir)
+    return report["corrupt"]
+
+
+def print_report(report):
+    print("\n✅ Modele funcționale:")
+    for symbol in report["valid"]:
+        status = report["symbols"][symbol]["status"]
+        print(f"  - {symbol}" + (" (modificat după antrenare)" if status == "changed" else ""))
+    print("\n❌ Modele cu probleme:")
+    for symbol in report["corrupt"]:
+        entry = report["symbols"][symbol]
+        print(f"  - {symbol} → {entry['status']}: {(entry.get('error') or '')[:60]}")
+    print(f"\n⏱️  {len(report['symbols'])} modele în {report['seconds']}s, "
+          f"{report['loaded']} încărcate complet ({report['workers']} procese) → {report_path()}")
+
+
+def cli_options(description=None):
+    parser = argparse.ArgumentParser(description=description or "Verifică integritatea modelelor")
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--workers", type=int, default=INTEGRITY_WORKERS)
+    parser.add_argument("--deep", action="store_true", help="încarcă și modelele cu checksum corect")
+    parser.add_argument("--adopt", action="store_true",
+                        help="înregistrează amprenta modelelor vechi care trec verificarea completă")
+    return parser.parse_args()
+
+
+def main(description=None):
+    options = cli_options(description)
+    report = verify(options.symbols or None, options.workers, options.deep, options.adopt)
+    print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+
+MANIFEST_VERSION = 1
+
+# Un append „mic” (cel mult WARM_START_MAX_ROWS zile noi peste datele ultimului
+# antrenament) pornește de la greutățile vechi și face doar FINE_TUNE_EPOCHS epoci.
+# După WARM_START_MAX_CHAIN fine-tune-uri la rând urmează un antrenament complet.
+WARM_START_MAX_ROWS = int(os.getenv("WARM_START_MAX_ROWS", "14"))
+WARM_START_MAX_CHAIN = int(os.getenv("WARM_START_MAX_CHAIN", "7"))
+FINE_TUNE_EPOCHS = int(os.getenv("FINE_TUNE_EPOCHS", "5"))
+# Rândurile de dinaintea ultimei zile antrenate care trebuie să fie identice
+# ca datele noi să fie considerate o continuare a celor vechi
+TAIL_ROWS = 64
+
+
+def manifest_dir(models_dir=None):
+    return Path(models_dir or MODELS_DIR) / "manifest"
+
+
+def manifest_path(symbol, models_dir=None):
+    return manifest_dir(models_dir) / f"{symbol}.json"
+
+
+def read(symbol, models_dir=None):
+    try:
+        with open(manifest_path(symbol, models_dir)) as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return data if data.get("version") == MANIFEST_VERSION else None
+
+
+def write(symbol, data, models_dir=None):
+    path = manifest_path(symbol, models_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(dict(data, version=MANIFEST_VERSION, symbol=symbol), f, indent=2)
+    os.replace(tmp, path)
+
+
+def update(symbol, fields, models_dir=None):
+    # Adaugă chei (integrity, lite...) fără să atingă restul manifestului
+    data = read(symbol, models_dir) or {}
+    data.update(fields)
+    write(symbol, {k: v for k, v in data.items() if k not in ("version", "symbol")}, models_dir)
+
+
+def array_hash(values):
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    digest = hashlib.sha256(str(values.shape).encode())
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def config_hash(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def architecture(model):
+    # Configurația Keras fără nume de straturi (lstm_3 etc. diferă de la un proces la altul)
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != "name"}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    return strip(model.get_config())
+
+
+class TrainingPlan:
+    # mode: "skip" (intrare identică), "warm" (fine-tune pe greutățile vechi) sau "full"
+    def __init__(self, symbol, mode, reason, features, prices, timestamps, config, previous):
+        self.symbol = symbol
+        self.mode = mode
+        self.reason = reason
+        self.features = features
+        self.prices = prices
+        self.timestamps = timestamps
+        self.config = config
+        self.previous = previous
+        self.data_hash = array_hash(features)
+        self.config_hash = config_hash(config)
+
+
+def _tail_hash(prices, end):
+    return array_hash(prices[max(0, end - TAIL_ROWS):end])
+
+
+def plan(symbol, features, prices, timestamps, config, artifacts, models_dir=None):
+    # features: matricea exactă de antrenare; prices/timestamps: aceleași rânduri;
+    # artifacts: fișierele model/scaler care trebuie să existe ca să refolosim ceva.
+    prices = np.asarray(prices, dtype=np.float64)
+    timestamps = [str(t) for t in timestamps]
+    previous = read(symbol, models_dir)
+    make = lambda mode, reason: TrainingPlan(symbol, mode, reason, features, prices, timestamps, config, previous)
+
+    if previous is None:
+        return make("full", "fără manifest")
+    if not all(Path(p).exists() for p in artifacts):
+        return make("full", "model sau scaler lipsă")
+    candidate = make("full", "")
+    if previous.get("config_hash") != candidate.config_hash:
+        return make("full", "hiperparametri sau arhitectură schimbate")
+    if previous.get("data_hash") == candidate.data_hash:
+        return make("skip", "date neschimbate")
+
+    # Ultima zi antrenată poate fi fost parțială, așa că ea intră printre rândurile noi
+    last = previous.get("last_timestamp")
+    if last not in timestamps:
+        return make("full", "datele nu continuă ultimul antrenament")
+    end = timestamps.index(last)
+    new_rows = len(timestamps) - end
+    if _tail_hash(prices, end) != previous.get("tail_hash"):
+        return make("full", "istoric modificat")
+    if new_rows > WARM_START_MAX_ROWS:
+        return make("full", f"{new_rows} rânduri noi")
+    if previous.get("warm_starts", 0) >= WARM_START_MAX_CHAIN:
+        return make("full", "prea multe fine-tune-uri la rând")
+    return make("warm", f"{new_rows} rânduri noi")
+
+
+def record(training_plan, mode, epochs, loss=None, train_seconds=None, models_dir=None, integrity=None, lite=None):
+    # integrity: amprenta fișierelor salvate (model_integrity.fingerprint);
+    # lite: exportul TFLite (lite_model.try_export)
+    p = training_plan
+    previous = p.previous or {}
+    data = {
+        "config_hash": p.config_hash,
+        "data_hash": p.data_hash,
+        "rows": len(p.features),
+        "first_timestamp": p.timestamps[0] if p.timestamps else None,
+        "last_timestamp": p.timestamps[-1] if p.timestamps else None,
+        "tail_hash": _tail_hash(p.prices, len(p.prices) - 1),
+        "mode": mode,
+        "epochs": epochs,
+        "loss": loss,
+        "warm_starts": previous.get("warm_starts", 0) + 1 if mode == "warm" else 0,
+        "train_seconds": train_seconds,
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "config": p.config,
+    }
+    if integrity is not None:
+        data["integrity"] = integrity
+    if lite is not None:
+        data["lite"] = lite
+    write(p.symbol, data, models_dir)
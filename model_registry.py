@@ -0,0 +1,171 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import global_model
+import lite_model
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+
+# Bugetul de memorie al registrului (MB). Dimensiunea unui model este estimată
+# după mărimea fișierelor .keras (sau .tflite) + .save de pe disc. Cu MODEL_MODE=global
+# simbolurile modelului global împart o singură intrare (global_model.GLOBAL_KEY).
+MAX_MB = int(os.getenv("MODEL_REGISTRY_MAX_MB", "512"))
+
+
+class LoadedModel:
+    def __init__(self, symbol, model, scaler, model_path, scaler_path, mtimes, nbytes):
+        self.symbol = symbol
+        self.model = model
+        self.scaler = scaler
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.mtimes = mtimes
+        self.nbytes = nbytes
+
+
+class ModelRegistry:
+    def __init__(self, max_bytes=MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._failed = {}       # cheie -> mtimes ale fișierelor al căror reload a eșuat
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.evictions = 0
+
+    @staticmethod
+    def paths(symbol, models_dir=None, scalers_dir=None):
+        return global_model.paths(symbol, models_dir or MODELS_DIR, scalers_dir or SCALERS_DIR)
+
+    def get(self, symbol, models_dir=None, scalers_dir=None):
+        models_dir = models_dir or MODELS_DIR
+        scalers_dir = scalers_dir or SCALERS_DIR
+        if global_model.serves(symbol, models_dir):
+            # Simbolul e o vedere peste modelul comun, încărcat o singură dată
+            shared = self._get(global_model.GLOBAL_KEY, *global_model.global_paths(models_dir, scalers_dir))
+            view = shared.model.view(symbol)
+            if view is not None:
+                return LoadedModel(symbol, view, view.scaler, shared.model_path, shared.scaler_path,
+                                   shared.mtimes, 0)
+        return self._get(symbol, *global_model.paths(symbol, models_dir, scalers_dir, mode="symbol"))
+
+    def _get(self, symbol, model_path, scaler_path):
+        key = str(model_path)
+        # FileNotFoundError se propagă către apelant; un export .tflite nou reîncarcă modelul
+        mtimes = (model_path.stat().st_mtime_ns, scaler_path.stat().st_mtime_ns, lite_model.mtime(model_path))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            # Reload-ul acestei versiuni a fișierelor a eșuat deja: servim versiunea veche
+            # până când fișierele se schimbă din nou, fără o încărcare completă per cerere
+            if entry is not None and (entry.mtimes == mtimes or self._failed.get(key) == mtimes):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Un singur thread încarcă un anumit model; celelalte așteaptă rezultatul
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and (entry.mtimes == mtimes or self._failed.get(key) == mtimes):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+
+            try:
+                fresh = self._load(symbol, model_path, scaler_path, mtimes)
+            except Exception as e:
+                # Fișier scris pe jumătate de un retrain: servim versiunea veche
+                if entry is not None:
+                    with self._lock:
+                        self._failed[key] = mtimes
+                        self.failed_reloads += 1
+                    print(f"⚠️ Reload failed for {symbol}, serving previous model: {e}")
+                    return entry
+                raise
+
+            with self._lock:
+                self._failed.pop(key, None)
+                if entry is not None:
+                    self.reloads += 1
+                    self._discard(key)
+                else:
+                    self.misses += 1
+                self._entries[key] = fresh
+                self._bytes += fresh.nbytes
+                self._evict(keep=key)
+            return fresh
+
+    def invalidate(self, symbol=None):
+        with self._lock:
+            for key in list(self._entries):
+                if symbol is None or self._entries[key].symbol == symbol:
+                    self._discard(key)
+
+    def loaded(self):
+        with self._lock:
+            return [entry.symbol for entry in self._entries.values()]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "failed_reloads": self.failed_reloads,
+                "evictions": self.evictions,
+                "lite": sum(1 for e in self._entries.values() if getattr(e.model, "lite", False)),
+                "backend": lite_model.MODEL_BACKEND,
+                "mode": global_model.MODEL_MODE,
+            }
+
+    def _load(self, symbol, model_path, scaler_path, mtimes):
+        import joblib
+
+        if symbol == global_model.GLOBAL_KEY:
+            model = global_model.GlobalModel(model_path, scaler_path)
+            nbytes = model_path.stat().st_size + scaler_path.stat().st_size
+            return LoadedModel(symbol, model, None, model_path, scaler_path, mtimes, nbytes)
+        lite = lite_model.usable(model_path)
+        if lite is not None:
+            model = lite_model.LiteModel(lite)
+            nbytes = lite.stat().st_size
+        else:
+            from tensorflow.keras.models import load_model
+            model = load_model(model_path, compile=False)
+            nbytes = model_path.stat().st_size
+        scaler = joblib.load(scaler_path)
+        nbytes += scaler_path.stat().st_size
+        return LoadedModel(symbol, model, scaler, model_path, scaler_path, mtimes, nbytes)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def _evict(self, keep):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._discard(key)
+            self.evictions += 1
+
+
+# Registrul unic al procesului, folosit de toate serverele de predicție
+registry = ModelRegistry()
+
+
+def get_model(symbol, models_dir=None, scalers_dir=None):
+    return registry.get(symbol, models_dir, scalers_dir)
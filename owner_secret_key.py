@@ -9,5 +9,6 @@ secret_key_bytes = bytes(secret_key_array)
 # cream Keypair-ul walletului
 OWNER_WALLET = Keypair.from_secret_key(secret_key_bytes)
 
-print("Adresa publică a walletului owner este:", OWNER_WALLET.public_key)
+if __name__ == "__main__":
+    print("Adresa publică a walletului owner este:", OWNER_WALLET.public_key)
 
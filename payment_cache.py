@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from solana_scan import find_transaction
+
+# Verificarea plății NRG per portofel, cu trei memorii:
+#  - pozitiv: portofelul a plătit; e valabil PAYMENT_CACHE_TTL secunde, apoi se
+#    reverifică tot istoricul;
+#  - ultima semnătură scanată: la următoarea verificare cerem doar semnăturile mai
+#    noi (getSignaturesForAddress cu until=);
+#  - negativ: „nicio plată” ține PAYMENT_NEGATIVE_TTL secunde și cel mult
+#    PAYMENT_NEGATIVE_MAX portofele (LRU), ca un flux de portofele noi să nu
+#    umple memoria.
+PAYMENT_CACHE_TTL = float(os.getenv("PAYMENT_CACHE_TTL", "3600"))
+PAYMENT_NEGATIVE_TTL = float(os.getenv("PAYMENT_NEGATIVE_TTL", "30"))
+PAYMENT_NEGATIVE_MAX = int(os.getenv("PAYMENT_NEGATIVE_MAX", "10000"))
+PAYMENT_SCANNED_MAX = int(os.getenv("PAYMENT_SCANNED_MAX", "100000"))
+
+NRG_TOKEN_MINT = "CBTuVEM1Z5z5ddfQVEGAAHPN1ckj6j97zHvKtrc78suj"
+
+
+def is_nrg_payment(tx_data, wallet, mint=NRG_TOKEN_MINT):
+    if not tx_data:
+        return False
+    meta = tx_data.get("meta") or {}
+    for balance in meta.get("postTokenBalances") or []:
+        if balance.get("mint") == mint and balance.get("owner") == wallet:
+            return True
+    return False
+
+
+async def scan_concurrent(rpc, wallet, until=None):
+    # Întoarce (plată găsită, cea mai nouă semnătură văzută)
+    result = await find_transaction(rpc, wallet, lambda tx: is_nrg_payment(tx, wallet), until=until)
+    return result.found, result.newest
+
+
+async def scan_sequential(rpc, wallet, until=None):
+    # Varianta veche, o tranzacție după alta; păstrată ca referință pentru benchmark
+    signatures = await rpc.get_signatures_for_address(wallet, until=until)
+    newest = signatures[0].get("signature") if signatures else None
+    for entry in signatures:
+        sig = entry.get("signature")
+        if sig and is_nrg_payment(await rpc.get_transaction(sig), wallet):
+            return True, newest
+    return False, newest
+
+
+class PaymentCache:
+    def __init__(self, scan=scan_concurrent, ttl=PAYMENT_CACHE_TTL, negative_ttl=PAYMENT_NEGATIVE_TTL,
+                 negative_max=PAYMENT_NEGATIVE_MAX, scanned_max=PAYMENT_SCANNED_MAX):
+        self.scan = scan
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.negative_max = negative_max
+        self.scanned_max = scanned_max
+        self._paid = {}
+        self._negative = OrderedDict()
+        self._scanned = OrderedDict()
+        self._locks = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _lookup(self, wallet, now):
+        expires = self._paid.get(wallet)
+        if expires is not None:
+            if expires > now:
+                self.hits += 1
+                return True
+            # Plata expirată se reverifică de la zero, nu doar pe semnăturile noi
+            del self._paid[wallet]
+            self._scanned.pop(wallet, None)
+        expires = self._negative.get(wallet)
+        if expires is not None:
+            if expires > now:
+                self.negative_hits += 1
+                return False
+            del self._negative[wallet]
+        return None
+
+    async def check(self, rpc, wallet):
+        cached = self._lookup(wallet, time.monotonic())
+        if cached is not None:
+            return cached
+
+        # Cererile simultane pentru același portofel așteaptă o singură scanare
+        lock = self._locks.setdefault(wallet, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._lookup(wallet, time.monotonic())
+                if cached is not None:
+                    return cached
+                self.misses += 1
+                try:
+                    paid, newest = await self.scan(rpc, wallet, self._scanned.get(wallet))
+                except Exception as e:
+                    # Erorile RPC nu se memorează: următoarea cerere încearcă din nou
+                    self.errors += 1
+                    print(f"Error checking payment: {e}")
+                    return False
+                self._remember(wallet, paid, newest)
+                return paid
+        finally:
+            if not lock.locked() and self._locks.get(wallet) is lock:
+                del self._locks[wallet]
+
+    def _remember(self, wallet, paid, newest):
+        now = time.monotonic()
+        if paid:
+            self._paid[wallet] = now + self.ttl
+            self._negative.pop(wallet, None)
+        else:
+            self._negative[wallet] = now + self.negative_ttl
+            self._negative.move_to_end(wallet)
+            while len(self._negative) > self.negative_max:
+                self._negative.popitem(last=False)
+        if newest:
+            self._scanned[wallet] = newest
+            self._scanned.move_to_end(wallet)
+            while len(self._scanned) > self.scanned_max:
+                self._scanned.popitem(last=False)
+
+    def invalidate(self, wallet=None):
+        if wallet is None:
+            self._paid.clear()
+            self._negative.clear()
+            self._scanned.clear()
+        else:
+            self._paid.pop(wallet, None)
+            self._negative.pop(wallet, None)
+            self._scanned.pop(wallet, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "paid_wallets": len(self._paid),
+            "negative_wallets": len(self._negative),
+            "scanned_wallets": len(self._scanned),
+        }
+
+
+payments = PaymentCache()
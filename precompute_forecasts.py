@@ -0,0 +1,122 @@
+import argparse
+import time
+from pathlib import Path
+import forecast_cache
+import global_model
+from forecast_store import store
+
+# Calculează prognoza pe orizontul maxim pentru fiecare simbol din models/ și o scrie
+# în predictions/forecasts.db, ca /predict-lstm să nu mai ruleze TensorFlow cât timp
+# modelul și datele nu se schimbă. Simbolurile modelului global (MODEL_MODE=global)
+# împart greutățile, așa că rollout-urile lor avansează împreună: un singur batch per
+# pas, cu id-ul simbolului pe fiecare rând. Modelele proprii trec pe rând, câte unul
+# în memorie. Rulează automat la finalul train_daily.py:
+#   python precompute_forecasts.py [--horizon 30] [--force] [simboluri...]
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
+LOOKBACK = 30
+
+
+def available_symbols():
+    own = {p.name.replace("_lstm_model.keras", "") for p in MODELS_DIR.glob("*_lstm_model.keras")}
+    return sorted(own | set(global_model.symbols(MODELS_DIR)))
+
+
+def scaled_window(symbol, scaler):
+    from feature_store import last_window
+
+    window = last_window(symbol, LOOKBACK, DATA_DIR)
+    if len(window) < LOOKBACK:
+        raise ValueError(f"Not enough data. Need {LOOKBACK} rows.")
+    return scaler.transform(window)
+
+
+def forecast_symbol(symbol, horizon):
+    from forecast_engine import forecast, get_forward
+    from model_registry import registry
+
+    loaded = registry.get(symbol, MODELS_DIR, SCALERS_DIR)
+    prices = forecast(get_forward(loaded.model), loaded.scaler, scaled_window(symbol, loaded.scaler), horizon)
+    # Job-ul trece o singură dată prin fiecare model; nu le ținem pe toate în memorie
+    registry.invalidate(symbol)
+    return prices
+
+
+def forecast_shared(symbols, horizon):
+    # {simbol: prețuri sau excepția lui} pentru simbolurile modelului global, într-o trecere
+    import numpy as np
+    from forecast_engine import Rollout, run_batch
+    from model_registry import registry
+
+    results, names, views, rollouts = {}, [], [], []
+    for symbol in symbols:
+        try:
+            view = registry.get(symbol, MODELS_DIR, SCALERS_DIR).model
+            if getattr(view, "shared", None) is None:
+                # Simbol lipsă din modelul încărcat: registrul a dat modelul lui propriu
+                results[symbol] = forecast_symbol(symbol, horizon)
+                continue
+            rollouts.append(Rollout(scaled_window(symbol, view.scaler), horizon))
+            names.append(symbol)
+            views.append(view)
+        except Exception as e:
+            results[symbol] = e
+    if rollouts:
+        # Același orizont pentru toți: rândul i al fiecărui batch e mereu simbolul i
+        shared = views[0].shared
+        ids = np.array([view.symbol_id for view in views], dtype=np.int32)
+        run_batch(lambda x: shared.forward(x, ids), rollouts)
+        for symbol, view, rollout in zip(names, views, rollouts):
+            results[symbol] = rollout.prices(view.scaler)
+    registry.invalidate(global_model.GLOBAL_KEY)
+    return results
+
+
+def precompute(symbols=None, horizon=forecast_cache.FORECAST_CACHE_HORIZON, force=False):
+    symbols = symbols or available_symbols()
+    start = time.perf_counter()
+    written, current, failed = [], [], []
+    todo = {}
+    for symbol in symbols:
+        version = forecast_cache.version(symbol, MODELS_DIR, SCALERS_DIR, DATA_DIR)
+        if version is None:
+            failed.append(symbol)
+            print(f"⚠️  {symbol}: model, scaler sau date lipsă")
+            continue
+        if not force and store.load(symbol, version, horizon) is not None:
+            current.append(symbol)
+            continue
+        todo[symbol] = version
+
+    shared = [s for s in todo if global_model.serves(s, MODELS_DIR)]
+    results = forecast_shared(shared, horizon) if shared else {}
+    for symbol, version in todo.items():
+        try:
+            prices = results[symbol] if symbol in results else forecast_symbol(symbol, horizon)
+            if isinstance(prices, Exception):
+                raise prices
+            store.write(symbol, version, prices)
+            written.append(symbol)
+        except Exception as e:
+            failed.append(symbol)
+            print(f"❌ {symbol}: {e}")
+    seconds = time.perf_counter() - start
+    print(f"🔮 Prognoze pe {horizon} zile: {len(written)} calculate, {len(current)} deja la zi, "
+          f"{len(failed)} eșuate ({seconds:.1f}s)")
+    return {"written": written, "current": current, "failed": failed, "seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalculează prognozele pentru toate simbolurile")
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--horizon", type=int, default=forecast_cache.FORECAST_CACHE_HORIZON)
+    parser.add_argument("--force", action="store_true", help="recalculează și prognozele la zi")
+    args = parser.parse_args()
+    precompute(args.symbols or None, args.horizon, args.force)
+
+
+if __name__ == "__main__":
+    main()
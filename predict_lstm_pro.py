@@ -1,14 +1,20 @@
 from fastapi import HTTPException
-import pandas as pd
 import numpy as np
-import joblib
-from tensorflow.keras.models import load_model
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
+from contextlib import aclosing
 import os
 import traceback
 import json
+import global_model
+import price_store
+from model_registry import get_model
+from feature_store import last_window
+from forecast_engine import Rollout, forecast, get_forward, scaled_to_price
+from inference_batcher import batcher, forecast_async
+from inference_pool import pool
+from forecast_cache import forecasts, version as cache_version
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
@@ -22,17 +28,10 @@ PURCHASED_FILE = BASE_DIR / "purchased.json"
 PREDICTIONS_DIR.mkdir(exist_ok=True)
 wallet_usage = defaultdict(lambda: {'used': 0, 'limit': 5})
 
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=period).mean()
-    avg_loss = pd.Series(loss).rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
 def save_predictions_to_csv(symbol: str, predictions: list):
-    df = pd.DataFrame(predictions)
+    import pandas as pd
+
+    df = pd.DataFrame(predictions, columns=["timestamp", "Predicted_Price"])
     df["timestamp"] = df["timestamp"].astype(str)
     df.to_csv(PREDICTIONS_DIR / f"{symbol}_predictions.csv", index=False)
 
@@ -52,86 +51,131 @@ def save_to_purchased(wallet: str, symbol: str, predictions: list):
     with open(PURCHASED_FILE, "w") as f:
         json.dump(data, f, indent=2)
 
-def predict(symbol: str, wallet: str, days: int):
-    symbol = symbol.lower()
-    wallet = wallet.lower()
+def load_inputs(symbol: str, lookback: int = 30):
+    model_path, scaler_path = global_model.paths(symbol, MODELS_DIR, SCALERS_DIR)
+
+    if not model_path.exists() or not scaler_path.exists() or not price_store.has(symbol, DATA_DIR):
+        raise HTTPException(status_code=404, detail="Missing model, scaler or data files for symbol.")
+
+    loaded = get_model(symbol, MODELS_DIR, SCALERS_DIR)
+    try:
+        window = last_window(symbol, lookback, DATA_DIR)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if len(window) < lookback:
+        raise HTTPException(status_code=400, detail=f"Not enough data. Need {lookback} rows.")
 
+    return get_forward(loaded.model), loaded.scaler, loaded.scaler.transform(window)
+
+def check_anonymous_limit(wallet: str):
     # Verificare limită pentru utilizatori anonimi
     if wallet == "anonymous_user":
         if wallet_usage[wallet]['used'] >= wallet_usage[wallet]['limit']:
             raise HTTPException(status_code=403, detail="Free predictions exhausted. Please upgrade.")
 
-    model_path = MODELS_DIR / f"{symbol}_lstm_model.keras"
-    scaler_path = SCALERS_DIR / f"{symbol}_lstm_scaler.save"
-    data_path = DATA_DIR / f"{symbol}.csv"
+def prediction_row(today, i: int, predicted_price):
+    pred_date = (today + timedelta(days=i+1)).strftime("%Y-%m-%d")
+    return {"timestamp": pred_date, "Predicted_Price": round(predicted_price, 2)}
+
+def finish_prediction(symbol: str, wallet: str, prices):
+    today = datetime.today()
+    predictions = [prediction_row(today, i, p) for i, p in enumerate(prices)]
+
+    if wallet != "anonymous_user":
+        save_to_purchased(wallet, symbol, predictions)
+    else:
+        wallet_usage[wallet]['used'] += 1  # ✅ actualizăm doar după succes
+
+    save_predictions_to_csv(symbol, predictions)
+
+    return {
+        "prediction": predictions,
+        "wallet": wallet,
+        "free_predictions_left": wallet_usage[wallet]['limit'] - wallet_usage[wallet]['used']
+        if wallet == "anonymous_user" else 999
+    }
 
-    if not model_path.exists() or not scaler_path.exists() or not data_path.exists():
+def forecast_version(symbol: str):
+    version = cache_version(symbol, MODELS_DIR, SCALERS_DIR, DATA_DIR)
+    if version is None:
         raise HTTPException(status_code=404, detail="Missing model, scaler or data files for symbol.")
+    return version
+
+def predict(symbol: str, wallet: str, days: int):
+    symbol = symbol.lower()
+    days = max(int(days), 0)
+    wallet = wallet.lower()
+    check_anonymous_limit(wallet)
 
     try:
-        model = load_model(model_path, compile=False)
-        scaler = joblib.load(scaler_path)
-        df = pd.read_csv(data_path)
-
-        if 'price' not in df.columns:
-            if 'close' in df.columns:
-                df['price'] = df['close']
-            elif 'Close' in df.columns:
-                df['price'] = df['Close']
-            else:
-                raise HTTPException(status_code=400, detail="'price' column not found in data.")
-
-        if 'timestamp' not in df.columns:
-            df['timestamp'] = pd.date_range(end=datetime.today(), periods=len(df)).astype(str)
-
-        df['sma_10'] = df['price'].rolling(window=10).mean()
-        df['sma_50'] = df['price'].rolling(window=50).mean()
-        df['rsi_14'] = compute_rsi(df['price'], 14)
-        df['macd_hist'] = df['price'].ewm(span=12).mean() - df['price'].ewm(span=26).mean()
-        df['volatility'] = df['price'].pct_change().rolling(window=20).std()
-
-        df = df.dropna().reset_index(drop=True)
-        features = ["price", "sma_10", "sma_50", "rsi_14", "macd_hist", "volatility"]
-        data = df[features].values
-        scaled_data = scaler.transform(data)
-
-        lookback = 30
-        if len(scaled_data) < lookback:
-            raise HTTPException(status_code=400, detail=f"Not enough data. Need {lookback} rows.")
-
-        last_sequence = scaled_data[-lookback:]
-        predictions = []
-
-        for i in range(days):
-            input_seq = np.reshape(last_sequence, (1, lookback, len(features)))
-            pred_scaled = model.predict(input_seq, verbose=0)[0][0]
-
-            last_day = last_sequence[-1].copy()
-            last_day[0] = pred_scaled
-            inv_scaled = scaler.inverse_transform([last_day])[0]
-            predicted_price = inv_scaled[0]
-
-            new_scaled_row = last_sequence[-1].copy()
-            new_scaled_row[0] = pred_scaled
-            last_sequence = np.vstack([last_sequence[1:], new_scaled_row])
-
-            pred_date = (datetime.today() + timedelta(days=i+1)).strftime("%Y-%m-%d")
-            predictions.append({"timestamp": pred_date, "Predicted_Price": round(predicted_price, 2)})
-
-        if wallet != "anonymous_user":
-            save_to_purchased(wallet, symbol, predictions)
-        else:
-            wallet_usage[wallet]['used'] += 1  # ✅ actualizăm doar după succes
-
-        save_predictions_to_csv(symbol, predictions)
-
-        return {
-            "prediction": predictions,
-            "wallet": wallet,
-            "free_predictions_left": wallet_usage[wallet]['limit'] - wallet_usage[wallet]['used']
-            if wallet == "anonymous_user" else 999
-        }
+        def compute(horizon):
+            forward, scaler, window = load_inputs(symbol)
+            return forecast(forward, scaler, window, horizon)
+
+        # Aceeași prognoză servește toți utilizatorii până la următorul retrain/ingest
+        prices = forecasts.get(symbol, forecast_version(symbol), days, compute)
+        return finish_prediction(symbol, wallet, prices)
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def predict_async(symbol: str, wallet: str, days: int):
+    symbol = symbol.lower()
+    days = max(int(days), 0)
+    wallet = wallet.lower()
+    check_anonymous_limit(wallet)
+
+    try:
+        # Încărcarea și fișierele rulează în pool; pașii LSTM trec prin micro-batcher
+        async def compute(horizon):
+            forward, scaler, window = await pool.run(load_inputs, symbol)
+            return await forecast_async(batcher, forward, scaler, window, horizon)
+
+        prices = await forecasts.get_async(symbol, forecast_version(symbol), days, compute)
+        return await pool.run(finish_prediction, symbol, wallet, prices)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def predict_stream(symbol: str, wallet: str, days: int):
+    # Generator async: câte un {timestamp, Predicted_Price} imediat ce rollout-ul calculează ziua.
+    # Pașii avansează doar când consumatorul cere rândul următor, deci un client deconectat
+    # oprește și rollout-ul; predicția completă se salvează doar la final.
+    symbol = symbol.lower()
+    days = max(int(days), 0)
+    wallet = wallet.lower()
+    check_anonymous_limit(wallet)
+
+    async def rollout_prices(horizon):
+        forward, scaler, window = await pool.run(load_inputs, symbol)
+        rollout = Rollout(window, horizon)
+        while not rollout.done:
+            pred = await batcher.submit(forward, rollout.next_input())
+            rollout.push(pred[0])
+            yield scaled_to_price(scaler, rollout.scaled_predictions()[-1, 0])
+
+    try:
+        today = datetime.today()
+        # Un singur rollout per simbol și versiune, ca la predict_async, calculat pe tot
+        # orizontul cache-ului; rândurile cererii ies pe măsură ce sunt gata
+        prices = np.empty(days)
+        async with aclosing(forecasts.stream_async(symbol, forecast_version(symbol), days, rollout_prices)) as stream:
+            i = 0
+            async for price in stream:
+                prices[i] = price
+                yield prediction_row(today, i, price)
+                i += 1
+        await pool.run(finish_prediction, symbol, wallet, prices)
+
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
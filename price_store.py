@@ -0,0 +1,319 @@
+import argparse
+import csv
+import io
+import json
+import os
+import threading
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# Prețurile stau în data/prices/ pe coloane: câte un .npy per simbol pentru timestamp
+# (datetime64[s]) și pentru preț (float64). Citirile sunt mmap (fereastra de la coadă
+# e un view, fără copii), ingestul zilnic adaugă doar rândurile noi la capătul
+# fișierelor, iar index.json ține pentru toate simbolurile numărul de rânduri și
+# primul/ultimul timestamp, deci „ultima zi” nu mai cere parsarea întregului istoric.
+# data/{simbol}.csv rămâne doar sursa migrării: un simbol lipsă din store se importă
+# automat din CSV la primul acces (sau pentru toate: python price_store.py migrate).
+INDEX_VERSION = 1
+
+_lock = threading.RLock()
+_index_cache = {}
+
+
+def store_dir(data_dir=None):
+    return Path(data_dir or DATA_DIR) / "prices"
+
+
+def index_path(data_dir=None):
+    return store_dir(data_dir) / "index.json"
+
+
+def timestamps_path(symbol, data_dir=None):
+    return store_dir(data_dir) / f"{symbol}.timestamp.npy"
+
+
+def price_path(symbol, data_dir=None):
+    return store_dir(data_dir) / f"{symbol}.price.npy"
+
+
+def csv_path(symbol, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{symbol}.csv"
+
+
+def to_datetime64(values):
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[s]")
+    return np.array([str(v).strip().replace(" ", "T") for v in values], dtype="datetime64[s]")
+
+
+def format_timestamps(timestamps):
+    # Același format ca în CSV-urile vechi: doar data pentru lumânări zilnice,
+    # altfel "YYYY-MM-DD HH:MM:SS"
+    timestamps = to_datetime64(timestamps)
+    days = timestamps.astype("datetime64[D]")
+    intraday = days != timestamps
+    if not intraday.any():
+        return np.datetime_as_string(days)
+    out = np.datetime_as_string(days).astype("<U19")
+    full = np.datetime_as_string(timestamps[intraday], unit="s")
+    # "YYYY-MM-DDTHH:MM:SS" -> spațiu în loc de "T", direct pe codurile caracterelor
+    full.view(np.uint32).reshape(len(full), -1)[:, 10] = ord(" ")
+    out[intraday] = full
+    return out
+
+
+def _clean(timestamps, prices):
+    timestamps = to_datetime64(timestamps)
+    prices = np.asarray(prices, dtype=np.float64)
+    keep = ~np.isnat(timestamps) & np.isfinite(prices)
+    return timestamps[keep], prices[keep]
+
+
+def read_index(data_dir=None):
+    path = index_path(data_dir)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _lock:
+        cached = _index_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except ValueError:
+        return {}
+    symbols = data.get("symbols", {}) if data.get("version") == INDEX_VERSION else {}
+    with _lock:
+        _index_cache[path] = (mtime, symbols)
+    return symbols
+
+
+def _update_index(symbol, timestamps, data_dir=None):
+    # Intrarea se calculează din coloanele scrise; fișierul se înlocuiește atomic
+    with _lock:
+        symbols = dict(read_index(data_dir))
+        if len(timestamps):
+            first, last = format_timestamps(timestamps[[0, -1]])
+            symbols[symbol] = {"rows": len(timestamps), "first_timestamp": str(first),
+                               "last_timestamp": str(last)}
+        else:
+            symbols[symbol] = {"rows": 0, "first_timestamp": None, "last_timestamp": None}
+        path = index_path(data_dir)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "symbols": symbols}, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+        _index_cache[path] = (path.stat().st_mtime_ns, symbols)
+
+
+def _save(path, values):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, values)
+    os.replace(tmp, path)
+
+
+def append_rows(path, rows):
+    # Adaugă rânduri la un .npy pe loc: datele la final, apoi forma din header.
+    # Header-ul .npy are loc rezervat pentru creșterea primei axe.
+    if len(rows) == 0:
+        return
+    rows = np.ascontiguousarray(rows)
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            header_len = f.tell()
+            header = io.BytesIO()
+            np.lib.format.write_array_header_1_0(header, {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": fortran_order,
+                "shape": (shape[0] + len(rows),) + tuple(shape[1:]),
+            })
+            header = header.getvalue()
+            if not fortran_order and dtype == rows.dtype and len(header) == header_len:
+                f.seek(0, os.SEEK_END)
+                f.write(rows.tobytes())
+                f.flush()
+                # Un cititor concurent vede cel mult forma veche
+                f.seek(0)
+                f.write(header)
+                return
+
+    _save(path, np.concatenate([np.load(path), rows]))
+
+
+def write(symbol, timestamps, prices, data_dir=None):
+    # Rescrie tot istoricul simbolului (descărcarea completă)
+    timestamps, prices = _clean(timestamps, prices)
+    with _lock:
+        store_dir(data_dir).mkdir(parents=True, exist_ok=True)
+        _save(price_path(symbol, data_dir), prices)
+        _save(timestamps_path(symbol, data_dir), timestamps)
+        _update_index(symbol, timestamps, data_dir)
+    return len(prices)
+
+
+def append(symbol, timestamps, prices, data_dir=None):
+    # Doar rândurile mai noi decât ultimul timestamp; întoarce (timestamps, prețuri) adăugate
+    timestamps, prices = _clean(timestamps, prices)
+    with _lock:
+        if not _ensure(symbol, data_dir):
+            write(symbol, timestamps, prices, data_dir)
+            return timestamps, prices
+        stored, _ = load(symbol, data_dir)
+        if len(stored):
+            new = timestamps > stored[-1]
+            timestamps, prices = timestamps[new], prices[new]
+        if len(timestamps):
+            append_rows(price_path(symbol, data_dir), prices)
+            append_rows(timestamps_path(symbol, data_dir), timestamps)
+            _update_index(symbol, load(symbol, data_dir)[0], data_dir)
+    return timestamps, prices
+
+
+def import_csv(symbol, data_dir=None):
+    # Migrarea unui CSV (timestamp + price/close/Close); rândurile fără preț numeric se omit
+    with open(csv_path(symbol, data_dir), newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        column = next((header.index(c) for c in ("price", "close", "Close") if c in header), None)
+        if column is None or "timestamp" not in header:
+            raise ValueError(f"{symbol}.csv: lipsesc coloanele timestamp/price")
+        ts_column = header.index("timestamp")
+        timestamps, prices = [], []
+        for row in reader:
+            try:
+                price = float(row[column])
+                timestamp = np.datetime64(row[ts_column].strip().replace(" ", "T"), "s")
+            except (ValueError, IndexError):
+                continue
+            timestamps.append(timestamp)
+            prices.append(price)
+    return write(symbol, np.array(timestamps, dtype="datetime64[s]"), prices, data_dir)
+
+
+def _ensure(symbol, data_dir=None):
+    # True dacă simbolul e în store; îl importă din CSV la primul acces sau repară
+    # intrarea din index dacă coloanele există deja
+    if symbol in read_index(data_dir):
+        return True
+    with _lock:
+        if symbol in read_index(data_dir):
+            return True
+        if price_path(symbol, data_dir).exists() and timestamps_path(symbol, data_dir).exists():
+            _update_index(symbol, load(symbol, data_dir, ensure=False)[0], data_dir)
+            return True
+        if csv_path(symbol, data_dir).exists():
+            import_csv(symbol, data_dir)
+            return True
+    return False
+
+
+def has(symbol, data_dir=None):
+    return _ensure(symbol, data_dir)
+
+
+def load(symbol, data_dir=None, ensure=True):
+    # (timestamps, prețuri) ca view-uri mmap read-only; FileNotFoundError dacă simbolul lipsește
+    if ensure and not _ensure(symbol, data_dir):
+        raise FileNotFoundError(f"Nu există prețuri pentru {symbol}")
+    timestamps = np.load(timestamps_path(symbol, data_dir), mmap_mode="r")
+    prices = np.load(price_path(symbol, data_dir), mmap_mode="r")
+    # Un append în curs poate avea o coloană cu un rând înaintea celeilalte
+    n = min(len(timestamps), len(prices))
+    return timestamps[:n], prices[:n]
+
+
+def tail(symbol, n, data_dir=None):
+    timestamps, prices = load(symbol, data_dir)
+    return timestamps[-n:], prices[-n:]
+
+
+def frame(symbol, data_dir=None):
+    # DataFrame timestamp (text, ca în CSV) + price, pentru antrenare și calculul batch
+    import pandas as pd
+
+    timestamps, prices = load(symbol, data_dir)
+    return pd.DataFrame({"timestamp": format_timestamps(timestamps), "price": np.array(prices)})
+
+
+def entry(symbol, data_dir=None):
+    # Rânduri și primul/ultimul timestamp din index, fără să deschidă coloanele
+    if not _ensure(symbol, data_dir):
+        return None
+    return read_index(data_dir).get(symbol)
+
+
+def last_timestamp(symbol, data_dir=None):
+    info = entry(symbol, data_dir)
+    if info is None or info["last_timestamp"] is None:
+        return None
+    return np.datetime64(info["last_timestamp"].replace(" ", "T"), "s")
+
+
+def version(symbol, data_dir=None):
+    # (mtime, size) ale coloanei de preț: se schimbă la fiecare append sau rescriere
+    if not _ensure(symbol, data_dir):
+        return None
+    try:
+        st = price_path(symbol, data_dir).stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def symbols(data_dir=None):
+    legacy = {p.stem for p in Path(data_dir or DATA_DIR).glob("*.csv")}
+    return sorted(set(read_index(data_dir)) | legacy)
+
+
+def migrate(symbols_to_migrate=None, data_dir=None, force=False):
+    migrated = []
+    for symbol in symbols_to_migrate or sorted(p.stem for p in Path(data_dir or DATA_DIR).glob("*.csv")):
+        if force or symbol not in read_index(data_dir):
+            rows = import_csv(symbol, data_dir)
+            migrated.append(symbol)
+            print(f"✅ {symbol}: {rows} rânduri")
+    print(f"📦 {len(migrated)} simboluri migrate în {store_dir(data_dir)}")
+    return migrated
+
+
+def export_csv(symbol, path=None, data_dir=None):
+    # Scrie istoricul înapoi în formatul CSV vechi (pentru inspecție sau arhivare)
+    timestamps, prices = load(symbol, data_dir)
+    path = Path(path or csv_path(symbol, data_dir))
+    with open(path, "w") as f:
+        f.write("timestamp,price\n")
+        for t, p in zip(format_timestamps(timestamps), prices):
+            f.write(f"{t},{float(p)!r}\n")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store-ul columnar de prețuri (data/prices/)")
+    parser.add_argument("command", choices=["migrate", "export", "info"])
+    parser.add_argument("symbols", nargs="*")
+    parser.add_argument("--force", action="store_true", help="reimportă și simbolurile deja migrate")
+    options = parser.parse_args()
+    if options.command == "migrate":
+        migrate(options.symbols or None, force=options.force)
+    elif options.command == "export":
+        for symbol in options.symbols or sorted(read_index()):
+            print(f"📝 {export_csv(symbol)}")
+    else:
+        index = read_index()
+        for symbol in options.symbols or sorted(index):
+            info = index.get(symbol) or entry(symbol) or {}
+            print(f"  {symbol:<22}{info.get('rows', 0):>8} rânduri  "
+                  f"{info.get('first_timestamp')} → {info.get('last_timestamp')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Cotele de predicții gratuite stau într-un SQLite în mod WAL: fiecare operație e o
+# singură instrucțiune atomică, sigură între thread-uri și între workerii uvicorn.
+QUOTA_DB = Path(os.getenv("QUOTA_DB", str(BASE_DIR / "usage.db")))
+LEGACY_JSON = BASE_DIR / "usage.json"
+PREDICTION_LIMIT = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    wallet TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    quota_limit INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    migrated_at REAL NOT NULL
+);
+"""
+
+
+class QuotaStore:
+    def __init__(self, path=QUOTA_DB, default_limit=PREDICTION_LIMIT, legacy_json=LEGACY_JSON):
+        self.path = Path(path)
+        self.default_limit = default_limit
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._local = threading.local()
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, tranzacțiile explicite le deschidem noi
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.executescript(SCHEMA)
+                    if self.legacy_json is not None:
+                        self.migrate_json(self.legacy_json, conn)
+                    self._ready = True
+        return conn
+
+    def migrate_json(self, path, conn=None):
+        # Importă o singură dată usage.json (inclusiv formatul vechi wallet -> int).
+        # Rândurile deja existente în baza de date au prioritate.
+        conn = conn or self._connect()
+        path = Path(path)
+        if not path.exists():
+            return 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (path.name,)).fetchone():
+                conn.execute("COMMIT")
+                return 0
+            try:
+                with path.open("r") as f:
+                    data = json.load(f)
+            except ValueError:
+                data = {}
+            rows = []
+            for wallet, val in data.items():
+                if isinstance(val, int):
+                    val = {"count": val, "limit": self.default_limit}
+                rows.append((wallet, int(val.get("count", 0)), int(val.get("limit", self.default_limit))))
+            conn.executemany("INSERT OR IGNORE INTO usage (wallet, count, quota_limit) VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT INTO migrations (source, rows, migrated_at) VALUES (?, ?, ?)",
+                         (path.name, len(rows), time.time()))
+            conn.execute("COMMIT")
+            print(f"📦 {len(rows)} portofele migrate din {path.name} în {self.path.name}")
+            return len(rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reserve(self, wallet):
+        # Consumă o predicție dacă mai e cotă: verificarea și incrementul sunt aceeași
+        # instrucțiune. Întoarce None când cota e epuizată.
+        row = self._connect().execute(
+            """
+            INSERT INTO usage (wallet, count, quota_limit) VALUES (?, 1, ?)
+            ON CONFLICT(wallet) DO UPDATE SET count = count + 1 WHERE count < quota_limit
+            RETURNING count, quota_limit
+            """,
+            (wallet, self.default_limit),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"used": row[0], "remaining": max(0, row[1] - row[0])}
+
+    def refund(self, wallet):
+        # Predicția rezervată a eșuat: dă înapoi unitatea consumată
+        self._connect().execute(
+            "UPDATE usage SET count = count - 1 WHERE wallet = ? AND count > 0", (wallet,))
+
+    def quota(self, wallet):
+        row = self._connect().execute(
+            "SELECT count, quota_limit FROM usage WHERE wallet = ?", (wallet,)).fetchone()
+        if row is None:
+            return {"used": 0, "remaining": self.default_limit}
+        return {"used": row[0], "remaining": max(0, row[1] - row[0])}
+
+    def remaining(self, wallet):
+        return self.quota(wallet)["remaining"]
+
+    def reset(self, wallet, new_limit):
+        self._connect().execute(
+            """
+            INSERT INTO usage (wallet, count, quota_limit) VALUES (?, 0, ?)
+            ON CONFLICT(wallet) DO UPDATE SET count = 0, quota_limit = excluded.quota_limit
+            """,
+            (wallet, new_limit),
+        )
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+store = QuotaStore()
@@ -1,7 +1,9 @@
 import os
+import sys
 import time
-import pandas as pd
 from pathlib import Path
+import price_store
+from model_integrity import corrupt_symbols
 from train_all_symbols import (
     train_model,
     download_data_from_coingecko,
@@ -9,33 +11,18 @@ from train_all_symbols import (
     MODELS_DIR
 )
 
-# Simbolurile cu probleme (din testul tău anterior)
-corrupt_symbols = [
-    'dot_usd', 'doge', 'trx_usd', 'link', 'avax_usd', 'xlm_usd', 'matic_usd', 'atom',
-    'near_usd', 'vet_usd', 'fil', 'algo', 'usdjpy', 'bch_usd', 'ltc_usd', 'matic', 'vet',
-    'link_usd', 'doge_usd', 'shib_usd', 'eurusd', 'ltc', 'ftm_usd', 'tether', 'algo_usd',
-    'xrp', 'dot', 'avax', 'eth_usd', 'gbpusd', 'atom_usd', 'icx', 'sol_usd', 'ada_usd',
-    'xrp_usd', 'trx', 'btc_usd', 'icp'
-]
-
-def is_valid_csv(symbol: str) -> bool:
-    csv_path = DATA_DIR / f"{symbol}.csv"
-    if not csv_path.exists():
-        return False
+def is_valid_data(symbol: str) -> bool:
+    # Store-ul păstrează doar prețuri numerice; numărul de rânduri vine din index
     try:
-        df = pd.read_csv(csv_path)
-        if 'price' not in df.columns:
-            return False
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
-        df.dropna(inplace=True)
-        return len(df) >= 60  # minim 60 rânduri utile
+        entry = price_store.entry(symbol, DATA_DIR)
     except Exception:
         return False
+    return entry is not None and entry["rows"] >= 60  # minim 60 rânduri utile
 
 def main():
-    for symbol in corrupt_symbols:
+    # Simbolurile cu probleme din raportul de integritate (--refresh reface verificarea)
+    for symbol in corrupt_symbols(MODELS_DIR, refresh="--refresh" in sys.argv):
         model_path = MODELS_DIR / f"{symbol}_lstm_model.keras"
-        csv_path = DATA_DIR / f"{symbol}.csv"
 
         # Șterge modelul corupt
         if model_path.exists():
@@ -43,7 +30,7 @@ def main():
             model_path.unlink()
 
         # Verifică datele existente
-        if not is_valid_csv(symbol):
+        if not is_valid_data(symbol):
             print(f"📉 Date lipsă sau invalide pentru {symbol}. Reîncarc de pe CoinGecko...")
             df = download_data_from_coingecko(symbol)
             if df is None or len(df) < 60:
@@ -52,7 +39,7 @@ def main():
             print(f"✅ Date OK pentru {symbol}, continuăm cu antrenarea...")
 
         else:
-            print(f"✅ Fișier CSV pentru {symbol} este valid.")
+            print(f"✅ Datele pentru {symbol} sunt valide.")
 
         # Antrenează modelul
         train_model(symbol)
@@ -0,0 +1,77 @@
+import itertools
+import os
+
+# Client JSON-RPC minimal pentru Solana peste un singur httpx.AsyncClient (pool de
+# conexiuni). Răspunsurile rămân dict-uri JSON, exact forma pe care o verifică
+# codul de plăți; solana-py 0.26 întoarce obiecte solders tipizate.
+SOLANA_RPC = os.getenv("SOLANA_RPC", "https://api.mainnet-beta.solana.com")
+SOLANA_RPC_CONNECTIONS = int(os.getenv("SOLANA_RPC_CONNECTIONS", "16"))
+
+
+class RpcError(Exception):
+    pass
+
+
+class SolanaRpc:
+    def __init__(self, url=SOLANA_RPC, connections=SOLANA_RPC_CONNECTIONS, timeout=30.0):
+        self.url = url
+        self.connections = connections
+        self.timeout = timeout
+        self._http = None
+        self._ids = itertools.count(1)
+        self.calls = 0
+
+    def _client(self):
+        import httpx
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.connections, max_keepalive_connections=self.connections),
+            )
+        return self._http
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def call(self, method, params):
+        self.calls += 1
+        body = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        response = await self._client().post(self.url, json=body)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("error"):
+            raise RpcError(f"{method}: {data['error']}")
+        return data.get("result")
+
+    async def batch(self, calls):
+        # Un singur POST cu mai multe apeluri JSON-RPC; rezultatele vin în ordinea cererilor
+        self.calls += 1
+        bodies = [{"jsonrpc": "2.0", "id": next(self._ids), "method": m, "params": p} for m, p in calls]
+        response = await self._client().post(self.url, json=bodies)
+        response.raise_for_status()
+        by_id = {item.get("id"): item for item in response.json()}
+        results = []
+        for body in bodies:
+            item = by_id.get(body["id"]) or {}
+            if item.get("error"):
+                raise RpcError(f"{body['method']}: {item['error']}")
+            results.append(item.get("result"))
+        return results
+
+    async def get_signatures_for_address(self, address, until=None, before=None, limit=None):
+        # Cele mai noi semnături primele; `until` oprește listarea înainte de semnătura dată
+        config = {k: v for k, v in (("until", until), ("before", before), ("limit", limit)) if v}
+        return await self.call("getSignaturesForAddress", [str(address), config]) or []
+
+    async def get_transaction(self, signature):
+        return await self.call("getTransaction", _transaction_params(signature))
+
+    async def get_transactions(self, signatures):
+        return await self.batch([("getTransaction", _transaction_params(s)) for s in signatures])
+
+
+def _transaction_params(signature):
+    return [signature, {"encoding": "json", "maxSupportedTransactionVersion": 0}]
@@ -0,0 +1,148 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Server JSON-RPC local care imită getSignaturesForAddress / getTransaction pentru
+# un set de portofele fictive, cu latență reglabilă per cerere HTTP (un batch
+# JSON-RPC plătește latența o singură dată). Folosit de verify_payment_cache.py și
+# bench_solana_scan.py:
+#   python solana_rpc_stub.py --port 8899 --latency-ms 80
+#   SOLANA_RPC=http://127.0.0.1:8899 uvicorn main:app
+
+NRG_TOKEN_MINT = "CBTuVEM1Z5z5ddfQVEGAAHPN1ckj6j97zHvKtrc78suj"
+OTHER_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+class Ledger:
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self.history = {}        # portofel -> semnături, cele mai vechi primele
+        self.transactions = {}
+        self.lock = threading.Lock()
+        self.counts = {"getSignaturesForAddress": 0, "getTransaction": 0, "batches": 0}
+
+    def add_transaction(self, wallet, nrg=False):
+        # Tranzacția NRG are soldul token-ului NRG al portofelului în postTokenBalances
+        with self.lock:
+            history = self.history.setdefault(wallet, [])
+            sig = f"{wallet[:8]}sig{len(history):06d}"
+            history.append(sig)
+            mint = NRG_TOKEN_MINT if nrg else OTHER_MINT
+            self.transactions[sig] = {
+                "slot": 1000 + len(history),
+                "blockTime": int(time.time()),
+                "meta": {
+                    "err": None,
+                    "fee": 5000,
+                    "preTokenBalances": [],
+                    "postTokenBalances": [{"accountIndex": 1, "mint": mint, "owner": wallet,
+                                           "uiTokenAmount": {"amount": "1000", "decimals": 6}}],
+                },
+                "transaction": {"signatures": [sig], "message": {"accountKeys": [wallet]}},
+            }
+            return sig
+
+    def add_wallet(self, wallet, history, paid_at=None):
+        # paid_at: poziția tranzacției NRG numărată de la cea mai nouă (0 = ultima)
+        for i in range(history):
+            self.add_transaction(wallet, nrg=paid_at is not None and history - 1 - i == paid_at)
+
+    def signatures(self, wallet, config):
+        with self.lock:
+            history = list(reversed(self.history.get(wallet, [])))
+        if config.get("before") in history:
+            history = history[history.index(config["before"]) + 1:]
+        if config.get("until") in history:
+            history = history[:history.index(config["until"])]
+        history = history[:config.get("limit") or 1000]
+        return [{"signature": sig, "slot": self.transactions[sig]["slot"], "err": None,
+                 "memo": None, "blockTime": self.transactions[sig]["blockTime"]} for sig in history]
+
+    def handle(self, request):
+        method = request.get("method")
+        params = request.get("params") or []
+        with self.lock:
+            if method in self.counts:
+                self.counts[method] += 1
+        if method == "getSignaturesForAddress":
+            result = self.signatures(params[0], params[1] if len(params) > 1 else {})
+        elif method == "getTransaction":
+            result = self.transactions.get(params[0])
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+
+def make_handler(ledger):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+            if ledger.latency:
+                time.sleep(ledger.latency)
+            if isinstance(body, list):
+                with ledger.lock:
+                    ledger.counts["batches"] += 1
+                result = [ledger.handle(r) for r in body]
+            else:
+                result = ledger.handle(body or {})
+            data = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clientul închide conexiunea când anulează cererile rămase după o potrivire
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def start(port=0, host="127.0.0.1", latency_ms=0.0):
+    ledger = Ledger(latency_ms)
+    server = StubServer((host, port), make_handler(ledger))
+    server.ledger = ledger
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="solana-rpc-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub JSON-RPC Solana pentru teste locale")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--wallets", type=int, default=10)
+    parser.add_argument("--history", type=int, default=50)
+    args = parser.parse_args()
+    server = start(args.port, latency_ms=args.latency_ms)
+    # Portofelele pare au plătit (tranzacția NRG e la mijlocul istoricului)
+    for i in range(args.wallets):
+        wallet = f"Wallet{i:04d}" + "1" * 32
+        server.ledger.add_wallet(wallet, args.history, args.history // 2 if i % 2 == 0 else None)
+        print(f"  {wallet} {'plătit' if i % 2 == 0 else 'neplătit'}")
+    print(f"🧪 Solana RPC stub pe {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
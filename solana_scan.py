@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+# Caută printre tranzacțiile unui portofel prima care îndeplinește o condiție.
+# Tranzacțiile se cer în paralel (cel mult SOLANA_SCAN_CONCURRENCY cereri în zbor),
+# opțional grupate câte SOLANA_SCAN_BATCH într-un batch JSON-RPC; la prima
+# potrivire cererile rămase se anulează.
+SOLANA_SCAN_CONCURRENCY = int(os.getenv("SOLANA_SCAN_CONCURRENCY", "8"))
+SOLANA_SCAN_BATCH = int(os.getenv("SOLANA_SCAN_BATCH", "0"))
+
+
+class ScanResult:
+    def __init__(self, signature, transaction, newest, signatures, fetched):
+        self.signature = signature
+        self.transaction = transaction
+        self.newest = newest
+        self.signatures = signatures
+        self.fetched = fetched
+
+    @property
+    def found(self):
+        return self.signature is not None
+
+
+async def find_transaction(rpc, address, predicate, until=None, limit=None,
+                           concurrency=SOLANA_SCAN_CONCURRENCY, batch=SOLANA_SCAN_BATCH):
+    entries = await rpc.get_signatures_for_address(address, until=until, limit=limit)
+    signatures = [e["signature"] for e in entries if e.get("signature")]
+    newest = signatures[0] if signatures else None
+    if not signatures:
+        return ScanResult(None, None, newest, 0, 0)
+
+    # Cele mai noi tranzacții intră primele, deci și potrivirea recentă iese prima
+    size = max(1, batch)
+    chunks = [signatures[i:i + size] for i in range(0, len(signatures), size)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    fetched = 0
+
+    async def fetch(chunk):
+        nonlocal fetched
+        async with semaphore:
+            if batch:
+                transactions = await rpc.get_transactions(chunk)
+            else:
+                transactions = [await rpc.get_transaction(chunk[0])]
+            fetched += len(chunk)
+            return list(zip(chunk, transactions))
+
+    tasks = [asyncio.create_task(fetch(chunk)) for chunk in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for signature, transaction in await next_done:
+                if transaction and predicate(transaction):
+                    return ScanResult(signature, transaction, newest, len(signatures), fetched)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return ScanResult(None, None, newest, len(signatures), fetched)
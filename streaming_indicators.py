@@ -0,0 +1,289 @@
+import json
+import math
+import os
+import threading
+from collections import deque
+from pathlib import Path
+import numpy as np
+import indicators
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# Sumele glisante sunt recalculate exact la fiecare RESUM_EVERY actualizări,
+# ca erorile de rotunjire să nu se acumuleze pe istorii lungi.
+RESUM_EVERY = 1000
+STATE_VERSION = 2
+
+
+class RollingWindow:
+    def __init__(self, size, values=()):
+        self.size = size
+        self.values = deque(values, maxlen=size)
+        self.total = math.fsum(self.values)
+        self.total_sq = math.fsum(v * v for v in self.values)
+        self._updates = 0
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def push(self, value):
+        if self.full:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        self._updates += 1
+        if self._updates % RESUM_EVERY == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    def mean(self):
+        return self.total / self.size if self.full else math.nan
+
+    def std(self):
+        # Deviație standard de eșantion (ddof=1), ca pandas rolling().std()
+        if not self.full:
+            return math.nan
+        n = self.size
+        var = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class SeededEma:
+    # EMA cu adjust=False inițializată cu media primelor `length` valori,
+    # la fel ca indicators.ema (și pandas_ta.ema)
+    def __init__(self, length, count=0, total=0.0, value=math.nan):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = count
+        self.total = total
+        self.value = value
+
+    def push(self, x):
+        if math.isnan(x):
+            return math.nan
+        self.count += 1
+        if self.count < self.length:
+            self.total += x
+            return math.nan
+        if self.count == self.length:
+            self.value = (self.total + x) / self.length
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+    def push_many(self, x):
+        # Ca push() pe fiecare valoare; după inițializare recursia trece prin lfilter
+        from scipy.signal import lfilter
+
+        out = np.empty(len(x))
+        i = 0
+        while i < len(x) and self.count < self.length:
+            out[i] = self.push(x[i])
+            i += 1
+        if i < len(x):
+            out[i:], _ = lfilter([self.alpha], [1.0, self.alpha - 1.0], x[i:],
+                                 zi=[(1.0 - self.alpha) * self.value])
+            self.count += len(x) - i
+            self.value = float(out[-1])
+        return out
+
+    def to_list(self):
+        return [self.count, self.total, self.value]
+
+
+class IndicatorState:
+    # Starea incrementală pentru cele 6 features: fiecare preț nou costă O(1),
+    # indiferent de lungimea istoricului.
+    def __init__(self, rsi_mode="simple"):
+        if rsi_mode not in ("simple", "wilder"):
+            raise ValueError(f"Unknown RSI mode: {rsi_mode}")
+        self.rsi_mode = rsi_mode
+        self.count = 0
+        self.last_price = None
+        self.last_timestamp = None
+        self.sma_10 = RollingWindow(10)
+        self.sma_50 = RollingWindow(50)
+        self.gains = RollingWindow(14)
+        self.losses = RollingWindow(14)
+        self.wilder_gain = None
+        self.wilder_loss = None
+        self.ema_fast = SeededEma(12)
+        self.ema_slow = SeededEma(26)
+        self.ema_signal = SeededEma(9)
+        self.returns = RollingWindow(20)
+
+    def update(self, price, timestamp=None):
+        price = float(price)
+        if self.last_price is None:
+            # indicators.rsi tratează diferența lipsă din primul rând ca gain = loss = 0
+            gain = loss = 0.0
+        else:
+            delta = price - self.last_price
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.returns.push(price / self.last_price - 1)
+
+        self.sma_10.push(price)
+        self.sma_50.push(price)
+        self.gains.push(gain)
+        self.losses.push(loss)
+        rsi = self._rsi(gain, loss)
+
+        # Histograma MACD(12, 26, 9): linia MACD minus semnalul ei
+        macd = self.ema_fast.push(price) - self.ema_slow.push(price)
+        macd_hist = macd - self.ema_signal.push(macd)
+
+        self.last_price = price
+        self.last_timestamp = timestamp
+        self.count += 1
+        return np.array([price, self.sma_10.mean(), self.sma_50.mean(), rsi, macd_hist, self.returns.std()])
+
+    def update_many(self, prices, timestamp=None):
+        # Echivalentul update() pe fiecare preț, vectorizat pe bucăți: (n, 6).
+        # Încălzirea (seed-urile EMA și RSI Wilder) trece prin update(), restul prin
+        # indicators.py cu ultimele valori din ferestre drept context.
+        prices = np.asarray(prices, dtype=np.float64)
+        rows = np.empty((len(prices), 6))
+        i = 0
+        while i < len(prices) and not self._steady():
+            rows[i] = self.update(prices[i])
+            i += 1
+        if i < len(prices):
+            rows[i:] = self._update_steady(prices[i:])
+        if len(prices):
+            self.last_timestamp = timestamp
+        return rows
+
+    def _steady(self):
+        return (self.ema_signal.count >= self.ema_signal.length
+                and (self.rsi_mode == "simple" or self.wilder_gain is not None))
+
+    def _update_steady(self, x):
+        from scipy.signal import lfilter
+
+        def extend(window, values):
+            # Fereastra curentă + valorile noi; rezultatul se taie la valorile noi
+            series = np.concatenate([np.array(window.values, dtype=np.float64), values])
+            return series, len(window.values)
+
+        prices, k = extend(self.sma_50, x)
+        sma_10 = indicators.sma(prices, 10)[k:]
+        sma_50 = indicators.sma(prices, 50)[k:]
+
+        previous = np.concatenate([[self.last_price], x[:-1]])
+        delta = x - previous
+        gains, kg = extend(self.gains, np.where(delta > 0, delta, 0.0))
+        losses, kl = extend(self.losses, np.where(delta < 0, -delta, 0.0))
+        if self.rsi_mode == "wilder":
+            a = 1.0 / self.gains.size
+            avg_gain, _ = lfilter([a], [1.0, a - 1.0], gains[kg:], zi=[(1.0 - a) * self.wilder_gain])
+            avg_loss, _ = lfilter([a], [1.0, a - 1.0], losses[kl:], zi=[(1.0 - a) * self.wilder_loss])
+            self.wilder_gain, self.wilder_loss = float(avg_gain[-1]), float(avg_loss[-1])
+        else:
+            avg_gain = indicators.sma(gains, self.gains.size)[kg:]
+            avg_loss = indicators.sma(losses, self.losses.size)[kl:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        macd = self.ema_fast.push_many(x) - self.ema_slow.push_many(x)
+        macd_hist = macd - self.ema_signal.push_many(macd)
+
+        returns, kr = extend(self.returns, x / previous - 1)
+        volatility = indicators.rolling_std(returns, self.returns.size)[kr:]
+
+        self.sma_10 = RollingWindow(10, prices[-10:].tolist())
+        self.sma_50 = RollingWindow(50, prices[-50:].tolist())
+        self.gains = RollingWindow(self.gains.size, gains[-self.gains.size:].tolist())
+        self.losses = RollingWindow(self.losses.size, losses[-self.losses.size:].tolist())
+        self.returns = RollingWindow(self.returns.size, returns[-self.returns.size:].tolist())
+        self.last_price = float(x[-1])
+        self.count += len(x)
+        return np.stack([x, sma_10, sma_50, rsi, macd_hist, volatility], axis=-1)
+
+    def _rsi(self, gain, loss):
+        period = self.gains.size
+        if self.rsi_mode == "wilder":
+            if self.wilder_gain is None:
+                if not self.gains.full:
+                    return math.nan
+                self.wilder_gain, self.wilder_loss = self.gains.mean(), self.losses.mean()
+            else:
+                self.wilder_gain = (self.wilder_gain * (period - 1) + gain) / period
+                self.wilder_loss = (self.wilder_loss * (period - 1) + loss) / period
+            avg_gain, avg_loss = self.wilder_gain, self.wilder_loss
+        else:
+            avg_gain, avg_loss = self.gains.mean(), self.losses.mean()
+
+        if math.isnan(avg_gain) or (avg_gain == 0 and avg_loss == 0):
+            return math.nan
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "rsi_mode": self.rsi_mode,
+            "count": self.count,
+            "last_price": self.last_price,
+            "last_timestamp": self.last_timestamp,
+            "sma_10": list(self.sma_10.values),
+            "sma_50": list(self.sma_50.values),
+            "gains": list(self.gains.values),
+            "losses": list(self.losses.values),
+            "wilder": [self.wilder_gain, self.wilder_loss],
+            "ema": [self.ema_fast.to_list(), self.ema_slow.to_list(), self.ema_signal.to_list()],
+            "returns": list(self.returns.values),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != STATE_VERSION:
+            raise ValueError("Outdated indicator state")
+        state = cls(data.get("rsi_mode", "simple"))
+        state.count = data["count"]
+        state.last_price = data["last_price"]
+        state.last_timestamp = data["last_timestamp"]
+        state.sma_10 = RollingWindow(10, data["sma_10"])
+        state.sma_50 = RollingWindow(50, data["sma_50"])
+        state.gains = RollingWindow(14, data["gains"])
+        state.losses = RollingWindow(14, data["losses"])
+        state.wilder_gain, state.wilder_loss = data["wilder"]
+        state.ema_fast, state.ema_slow, state.ema_signal = (
+            SeededEma(length, *acc) for length, acc in zip((12, 26, 9), data["ema"])
+        )
+        state.returns = RollingWindow(20, data["returns"])
+        return state
+
+
+def replay(prices, timestamps=None, rsi_mode="simple"):
+    state = IndicatorState(rsi_mode)
+    rows = np.empty((len(prices), 6))
+    for i, price in enumerate(prices):
+        rows[i] = state.update(price, None if timestamps is None else str(timestamps[i]))
+    return state, rows
+
+
+def state_path(symbol, data_dir=None):
+    return Path(data_dir or DATA_DIR) / f"{symbol}.state.json"
+
+
+def load_state(symbol, data_dir=None):
+    try:
+        with open(state_path(symbol, data_dir)) as f:
+            return IndicatorState.from_dict(json.load(f))
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def save_state(symbol, state, data_dir=None):
+    path = state_path(symbol, data_dir)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state.to_dict(), f)
+    os.replace(tmp, path)
@@ -0,0 +1,284 @@
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+import global_model
+import model_manifest
+import price_store
+from model_integrity import MODEL_SUFFIX, check_archive, file_checksum, record_result, recorded, reported
+from feature_store import read_meta
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
+
+# Catalogul simbolurilor stă în memorie: se construiește o dată la pornire din
+# models/ + manifestele scrise la antrenare și se reîmprospătează de un thread care
+# verifică la CATALOG_POLL_SECONDS doar stat()-ul fișierelor. Un validator în fundal
+# calculează checksum-ul și verifică arhiva .keras, fără TensorFlow. Modelul se
+# încarcă (CATALOG_DEEP_VALIDATE=1) doar dacă există un checksum înregistrat la
+# antrenare (model_integrity) și fișierul diferă de el, iar models/integrity_report.json
+# nu are deja un rezultat pentru exact acest fișier; rezultatul încărcării se scrie în
+# raport, ca o repornire să nu-l repete. Un model fără amprentă trece doar prin
+# verificarea arhivei. Modelele corupte ies din /symbols.
+# Cu MODEL_MODE=global, simbolurile modelului global intră în catalog și fără model
+# propriu și se validează pe fișierul comun.
+CATALOG_POLL_SECONDS = float(os.getenv("CATALOG_POLL_SECONDS", "30"))
+CATALOG_DEEP_VALIDATE = os.getenv("CATALOG_DEEP_VALIDATE", "1") == "1"
+
+
+def _stat(path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _iso(mtime_ns):
+    return datetime.fromtimestamp(mtime_ns / 1e9).isoformat(timespec="seconds")
+
+
+def load_check(path):
+    try:
+        from tensorflow.keras.models import load_model
+    except ImportError:
+        # Fără TensorFlow rămâne doar verificarea arhivei
+        return
+    load_model(path, compile=False)
+
+
+class SymbolCatalog:
+    def __init__(self, models_dir=MODELS_DIR, scalers_dir=SCALERS_DIR, data_dir=DATA_DIR,
+                 poll_seconds=CATALOG_POLL_SECONDS, deep_validate=CATALOG_DEEP_VALIDATE):
+        self.models_dir = Path(models_dir)
+        self.scalers_dir = Path(scalers_dir)
+        self.data_dir = Path(data_dir)
+        self.poll_seconds = poll_seconds
+        self.deep_validate = deep_validate
+        self._entries = {}      # simbol -> dict (înlocuit, nu modificat pe loc)
+        self._symbols = []
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self.refreshes = 0
+        self.validations = 0
+        self.built_at = None
+
+    def _paths(self, symbol):
+        return (
+            *global_model.paths(symbol, self.models_dir, self.scalers_dir),
+            model_manifest.manifest_path(symbol, self.models_dir),
+            self.data_dir / f"{symbol}.features.json",
+        )
+
+    def _describe(self, symbol, stats, previous):
+        model_stat, scaler_stat = stats[0], stats[1]
+        entry = {
+            "symbol": symbol,
+            "valid": None,
+            "error": None,
+            "checksum": None,
+            "model_bytes": model_stat[1],
+            "model_modified": _iso(model_stat[0]),
+            "scaler": scaler_stat is not None,
+            "data_first": None,
+            "data_last": None,
+            "rows": None,
+            "last_trained": _iso(model_stat[0]),
+            "training_mode": None,
+            "model": "global" if global_model.serves(symbol, self.models_dir) else "symbol",
+            "_stats": stats,
+        }
+        # Validarea rămâne valabilă cât timp modelul și scalerul nu s-au schimbat
+        if previous is not None and previous["_stats"][:2] == stats[:2]:
+            for key in ("valid", "error", "checksum"):
+                entry[key] = previous[key]
+        if scaler_stat is None:
+            entry["valid"], entry["error"] = False, "scaler lipsă"
+
+        manifest = model_manifest.read(symbol, self.models_dir)
+        meta = read_meta(symbol, self.data_dir)
+        if entry["model"] == "global":
+            shared = global_model.info(self.models_dir) or {}
+            entry["last_trained"] = shared.get("trained_at") or entry["last_trained"]
+            entry["training_mode"] = "global"
+            manifest = None
+        if manifest is not None:
+            entry["data_first"] = manifest.get("first_timestamp")
+            entry["data_last"] = manifest.get("last_timestamp")
+            entry["rows"] = manifest.get("rows")
+            entry["last_trained"] = manifest.get("trained_at") or entry["last_trained"]
+            entry["training_mode"] = manifest.get("mode")
+        elif meta is not None:
+            entry["data_first"] = meta.get("first_timestamp")
+            entry["data_last"] = meta.get("last_timestamp")
+            entry["rows"] = meta.get("rows")
+        else:
+            # Prima și ultima dată din indexul store-ului de prețuri
+            prices = price_store.entry(symbol, self.data_dir) or {}
+            entry["data_first"], entry["data_last"] = prices.get("first_timestamp"), prices.get("last_timestamp")
+            entry["rows"] = prices.get("rows")
+        return entry
+
+    def refresh(self):
+        # Doar stat(); fișierele se recitesc numai pentru simbolurile schimbate
+        try:
+            names = [e.name for e in os.scandir(self.models_dir) if e.name.endswith(MODEL_SUFFIX)]
+        except FileNotFoundError:
+            names = []
+        with self._lock:
+            current = self._entries
+        entries, changed = {}, []
+        symbols = [name[:-len(MODEL_SUFFIX)] for name in names] + global_model.symbols(self.models_dir)
+        for symbol in dict.fromkeys(symbols):
+            stats = tuple(_stat(p) for p in self._paths(symbol))
+            if stats[0] is None:
+                continue
+            previous = current.get(symbol)
+            if previous is not None and previous["_stats"] == stats:
+                entries[symbol] = previous
+                continue
+            entry = self._describe(symbol, stats, previous)
+            entries[symbol] = entry
+            if entry["valid"] is None:
+                changed.append(symbol)
+        with self._lock:
+            # Rezultatele validatorului sosite între timp nu se pierd
+            for symbol, entry in entries.items():
+                latest = self._entries.get(symbol)
+                if latest is not None and latest is not entry and latest["_stats"] == entry["_stats"]:
+                    entries[symbol] = latest
+            self._entries = entries
+            self._symbols = self._listed(entries)
+            self.refreshes += 1
+            self.built_at = datetime.now().isoformat(timespec="seconds")
+        for symbol in changed:
+            self._pending.put(symbol)
+        return changed
+
+    @staticmethod
+    def _listed(entries):
+        return sorted(s for s, e in entries.items() if e["valid"] is not False)
+
+    def validate(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None or entry["valid"] is not None:
+            return None
+        model_path = self._paths(symbol)[0]
+        checksum, error = None, None
+        try:
+            checksum = file_checksum(model_path)
+            check_archive(model_path)
+            shared = global_model.serves(symbol, self.models_dir)
+            if shared:
+                expected = (global_model.info(self.models_dir) or {}).get("integrity") or {}
+            else:
+                expected = recorded(symbol, self.models_dir) or {}
+            if self.deep_validate and expected.get("model_sha256") not in (None, checksum):
+                error = self._deep_check(symbol, model_path, checksum, shared)
+        except Exception as e:
+            error = str(e)
+        if error is not None:
+            print(f"❌ Model corupt: {model_path.name} → {error[:120]}")
+        with self._lock:
+            current = self._entries.get(symbol)
+            # Fișierul s-a schimbat între timp: rezultatul aparține versiunii vechi
+            if current is None or current["_stats"] != entry["_stats"] or _stat(model_path) != entry["_stats"][0]:
+                return None
+            entries = dict(self._entries)
+            entries[symbol] = dict(current, valid=error is None, error=error, checksum=checksum)
+            self._entries = entries
+            self._symbols = self._listed(entries)
+            self.validations += 1
+        return error is None
+
+    def _deep_check(self, symbol, model_path, checksum, shared):
+        # Eroarea sau None; modelul comun nu are intrare în raport și se încarcă direct
+        previous = None if shared else reported(symbol, checksum, self.models_dir)
+        if previous is not None:
+            return None if previous["valid"] else previous.get("error") or previous["status"]
+        try:
+            load_check(model_path)
+            error = None
+        except Exception as e:
+            error = str(e)
+        if not shared:
+            record_result({
+                "symbol": symbol,
+                "checked": "load",
+                "model_sha256": checksum,
+                "status": "changed" if error is None else "corrupt",
+                "error": error,
+                "valid": error is None,
+            }, self.models_dir)
+        return error
+
+    def _validate_loop(self):
+        while not self._stop.is_set():
+            try:
+                symbol = self._pending.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self.validate(symbol)
+            except Exception as e:
+                print(f"⚠️  Validare eșuată pentru {symbol}: {e}")
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️  Reîmprospătarea catalogului a eșuat: {e}")
+
+    def start(self):
+        if self._threads:
+            return self
+        self._stop.clear()
+        self.refresh()
+        for target, name in ((self._watch_loop, "catalog-watch"), (self._validate_loop, "catalog-validate")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def symbols(self):
+        with self._lock:
+            return self._symbols
+
+    def entries(self):
+        with self._lock:
+            entries = self._entries
+        return {s: {k: v for k, v in e.items() if k != "_stats"} for s, e in sorted(entries.items())}
+
+    def get(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+        return None if entry is None else {k: v for k, v in entry.items() if k != "_stats"}
+
+    def stats(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            return {
+                "symbols": len(entries),
+                "valid": sum(1 for e in entries if e["valid"] is True),
+                "invalid": sum(1 for e in entries if e["valid"] is False),
+                "pending": sum(1 for e in entries if e["valid"] is None),
+                "refreshes": self.refreshes,
+                "validations": self.validations,
+                "built_at": self.built_at,
+            }
+
+
+catalog = SymbolCatalog()
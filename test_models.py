@@ -1,18 +1,14 @@
-from tensorflow.keras.models import load_model
-from pathlib import Path
+import sys
+from model_integrity import main
 
-MODELS_DIR = Path(__file__).parent / "models"
-errors = []
+# Încarcă complet fiecare model (checksum + load + inferență de probă), în paralel
+#   python test_models.py [--workers N]
 
-for model_file in MODELS_DIR.glob("*.keras"):
-    try:
-        print(f"✅ Verific {model_file.name}...")
-        model = load_model(model_file, compile=False)
-    except Exception as e:
-        print(f"❌ Eroare la {model_file.name}: {e}")
-        errors.append(model_file.name)
-
-if not errors:
-    print("✅ Toate modelele sunt valide.")
-else:
-    print("❌ Modelele cu probleme:", errors)
+if __name__ == "__main__":
+    sys.argv.append("--deep")
+    report = main("Testează încărcarea tuturor modelelor")
+    if not report["corrupt"]:
+        print("✅ Toate modelele sunt valide.")
+    else:
+        print("❌ Modelele cu probleme:", report["corrupt"])
+    sys.exit(1 if report["corrupt"] else 0)
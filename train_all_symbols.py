@@ -1,15 +1,21 @@
-import requests
 import pandas as pd
-import numpy as np
-import os
 import time
 from pathlib import Path
 from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
+from tensorflow.keras.models import Sequential, load_model
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping
-import pandas_ta as ta
 import joblib
+import coingecko_client
+import feature_store
+import global_model
+import price_store
+import lite_model
+import model_integrity
+import model_manifest
+import train_orchestrator
+import windowing
+from indicators import FEATURES, add_features
 
 # Setări directoare
 BASE_DIR = Path(__file__).parent
@@ -30,26 +36,24 @@ symbols = [
     "injective-protocol", "loopring", "dydx", "terra-luna", "terra-luna-2", "audius", "waves"
 ]
 
+def fetch_prices(symbol, days=365, incremental=False):
+    # Client comun: pool de conexiuni, token bucket și retry cu backoff la 429/5xx
+    return coingecko_client.fetch_prices_sync(symbol, days, incremental)
+
 def download_data_from_coingecko(symbol):
     print(f"\n🔁 Procesare simbol: {symbol}")
-    url = f"https://api.coingecko.com/api/v3/coins/{symbol}/market_chart?vs_currency=usd&days=365&interval=daily"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; NRGBot/1.0; +https://nrgai.com)"
-    }
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        prices = data.get("prices", [])
-        if not prices:
+        df = fetch_prices(symbol)
+        if df is None:
             print(f"⚠️  Nu s-au putut obține date pentru {symbol}")
             return None
 
-        df = pd.DataFrame(prices, columns=["timestamp", "price"])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms").dt.floor("D")
-        df = df.sort_values("timestamp")
-        df = df.drop_duplicates(subset="timestamp", keep="last")
-        df.to_csv(DATA_DIR / f"{symbol}.csv", index=False)
+        # Fără ziua curentă, încă incompletă: append-ul ia doar zilele de după ultima
+        # salvată, așa că un close parțial n-ar mai fi înlocuit niciodată
+        df = df[df["timestamp"] < pd.Timestamp.today().normalize()]
+        price_store.write(symbol, df["timestamp"], df["price"], DATA_DIR)
+        # Features calculate o singură dată, la ingest (și invalidează matricea veche)
+        feature_store.build(symbol, DATA_DIR)
         print(f"✅ Date salvate pentru {symbol}")
         return df
 
@@ -57,74 +61,127 @@ def download_data_from_coingecko(symbol):
         print(f"❌ Eroare la {symbol}: {e}")
         return None
 
-def compute_rsi(prices, period=14):
-    delta = prices.diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=period).mean()
-    avg_loss = pd.Series(loss).rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+def append_new_days(symbol, last_date):
+    # Descarcă doar zilele lipsă și le adaugă incremental (prețuri + features + stare)
+    # Ziua curentă e încă incompletă, așa că adăugăm doar zilele închise.
+    today = pd.Timestamp.today().normalize()
+    days = max((today - pd.Timestamp(last_date)).days + 1, 2)
+    try:
+        df = fetch_prices(symbol, days, incremental=True)
+        if df is coingecko_client.NOT_MODIFIED:
+            print(f"⏭️  {symbol}: nicio modificare de la ultima descărcare")
+            return 0
+        if df is None:
+            print(f"⚠️  Nu s-au putut obține date pentru {symbol}")
+            return 0
+        df = df[df["timestamp"] < today]
+        added = feature_store.append(symbol, df["timestamp"], df["price"], DATA_DIR)
+        print(f"✅ {added} zile noi adăugate pentru {symbol}")
+        return added
+    except Exception as e:
+        print(f"❌ Eroare la {symbol}: {e}")
+        return 0
+
+LOOKBACK = 30
+EPOCHS = 50
+BATCH_SIZE = 32
+PATIENCE = 5
+
+def build_model(input_shape):
+    model = Sequential([
+        LSTM(128, return_sequences=True, input_shape=input_shape),
+        Dropout(0.3),
+        LSTM(64),
+        Dropout(0.3),
+        Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+def training_config():
+    # Tot ce schimbă rezultatul antrenării în afară de date intră în cheia cache-ului
+    return {
+        "script": "train_all_symbols",
+        "features": FEATURES,
+        "lookback": LOOKBACK,
+        "epochs": EPOCHS,
+        "batch_size": BATCH_SIZE,
+        "patience": PATIENCE,
+        "architecture": model_manifest.architecture(build_model((LOOKBACK, len(FEATURES)))),
+    }
 
 def train_model(symbol):
     print(f"🔧 Antrenez model pentru {symbol}...")
-    csv_path = DATA_DIR / f"{symbol}.csv"
-    if not csv_path.exists():
-        print(f"⚠️  Fișier CSV lipsă pentru {symbol}")
+    if not price_store.has(symbol, DATA_DIR):
+        print(f"⚠️  Prețuri lipsă pentru {symbol}")
         return
 
-    df = pd.read_csv(csv_path)
-    df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    df.dropna(inplace=True)
+    df = price_store.frame(symbol, DATA_DIR)
 
     # Indicatori tehnici
-    df["sma_10"] = df["price"].rolling(window=10).mean()
-    df["sma_50"] = df["price"].rolling(window=50).mean()
-    df["rsi_14"] = compute_rsi(df["price"], 14)
-    macd = ta.macd(df['price'], fast=12, slow=26, signal=9)
-    df['macd_hist'] = macd['MACDh_12_26_9']
-    df["volatility"] = df["price"].pct_change().rolling(window=20).std()
+    df = add_features(df.reset_index(drop=True))
     df.dropna(inplace=True)
 
-    # Normalizare și pregătire date
-    features = ["price", "sma_10", "sma_50", "rsi_14", "macd_hist", "volatility"]
-    data = df[features].values
-    scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data)
-
-    X, y = [], []
-    lookback = 30
-    for i in range(lookback, len(scaled_data)):
-        X.append(scaled_data[i - lookback:i])
-        y.append(scaled_data[i][0])
-    X, y = np.array(X), np.array(y)
-
-    if len(X) == 0:
+    data = df[FEATURES].values
+    model_path = MODELS_DIR / f"{symbol}_lstm_model.keras"
+    scaler_path = SCALERS_DIR / f"{symbol}_lstm_scaler.save"
+    plan = model_manifest.plan(symbol, data, df["price"], df["timestamp"], training_config(),
+                               [model_path, scaler_path])
+    if plan.mode == "skip":
+        print(f"⏭️  {symbol}: {plan.reason}, nu reantrenez")
+        return "skip"
+
+    # Fine-tune: greutățile vechi au învățat în spațiul scalerului vechi, deci îl păstrăm
+    # cât timp datele noi nu ies prea mult din intervalul lui
+    if plan.mode == "warm":
+        scaler = joblib.load(scaler_path)
+        scaled_data = scaler.transform(data)
+        if scaled_data.min() < -0.25 or scaled_data.max() > 1.25:
+            plan.mode, plan.reason = "full", "prețuri noi în afara intervalului scalerului"
+    if plan.mode == "full":
+        scaler = MinMaxScaler()
+        scaled_data = scaler.fit_transform(data)
+
+    if windowing.count(scaled_data, LOOKBACK) == 0:
         print(f"⚠️  Prea puține date pentru {symbol}")
         return
-
-    model = Sequential([
-        LSTM(128, return_sequences=True, input_shape=(X.shape[1], X.shape[2])),
-        Dropout(0.3),
-        LSTM(64),
-        Dropout(0.3),
-        Dense(1)
-    ])
-    model.compile(optimizer='adam', loss='mse')
-    early_stop = EarlyStopping(monitor='loss', patience=5, restore_best_weights=True)
-    model.fit(X, y, epochs=50, batch_size=32, callbacks=[early_stop], verbose=0)
-
-    model.save(MODELS_DIR / f"{symbol}_lstm_model.keras")
-    joblib.dump(scaler, SCALERS_DIR / f"{symbol}_lstm_scaler.save")
+    train_data = windowing.dataset(scaled_data, LOOKBACK, BATCH_SIZE)
+
+    start = time.perf_counter()
+    if plan.mode == "warm":
+        print(f"🔥 {symbol}: fine-tune {model_manifest.FINE_TUNE_EPOCHS} epoci ({plan.reason})")
+        model = load_model(model_path)
+        history = model.fit(train_data, epochs=model_manifest.FINE_TUNE_EPOCHS, verbose=0)
+    else:
+        print(f"🆕 {symbol}: antrenament complet ({plan.reason})")
+        model = build_model((LOOKBACK, scaled_data.shape[1]))
+        early_stop = EarlyStopping(monitor='loss', patience=PATIENCE, restore_best_weights=True)
+        history = model.fit(train_data, epochs=EPOCHS, callbacks=[early_stop], verbose=0)
+    train_seconds = round(time.perf_counter() - start, 2)
+
+    model.save(model_path)
+    joblib.dump(scaler, scaler_path)
+    model_manifest.record(plan, plan.mode, len(history.history["loss"]),
+                          loss=float(min(history.history["loss"])), train_seconds=train_seconds,
+                          integrity=model_integrity.fingerprint(model, model_path, scaler_path),
+                          lite=lite_model.try_export(model, model_path))
     print(f"✅ Model salvat pentru {symbol}")
+    return plan.mode
+
+def download_ok(symbol):
+    return download_data_from_coingecko(symbol) is not None
 
 def main():
-    for symbol in symbols:
-        df = download_data_from_coingecko(symbol)
-        if df is not None:
-            train_model(symbol)
-        print("⏳ Pauză 5 secunde...")
-        time.sleep(5)
+    options = train_orchestrator.cli_options("Descarcă datele și antrenează toate simbolurile", global_mode=True)
+    if options.global_model:
+        ready = train_orchestrator.prepare(symbols, download_ok, options.download_workers)
+        global_model.train(ready, force=options.fresh)
+        return
+    train_orchestrator.run(
+        "train_all_symbols", symbols, train_model, prepare_fn=download_ok,
+        workers=options.workers, tf_threads=options.tf_threads,
+        download_workers=options.download_workers, fresh=options.fresh,
+    )
 
 if __name__ == "__main__":
     main()
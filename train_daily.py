@@ -1,8 +1,13 @@
 # train_daily.py
 import os
-import pandas as pd
-from datetime import datetime
-from train_all_symbols import download_data_from_coingecko, train_model
+from datetime import datetime, timedelta
+from train_all_symbols import download_data_from_coingecko, append_new_days, train_model
+import train_orchestrator
+import global_model
+import intraday
+import lite_model
+import price_store
+import precompute_forecasts
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 SYMBOLS = [
@@ -15,29 +20,52 @@ SYMBOLS = [
     "vechain", "waves", "wax", "zilliqa"
 ]
 
+def last_date(symbol):
+    # Din indexul store-ului de prețuri, fără să citim istoricul
+    last = price_store.last_timestamp(symbol, DATA_DIR)
+    return None if last is None else last.astype("datetime64[D]").item()
+
 def needs_update(symbol):
-    path = os.path.join(DATA_DIR, f"{symbol}.csv")
-    if not os.path.exists(path):
-        return True
-    try:
-        df = pd.read_csv(path)
-        last_date = pd.to_datetime(df["timestamp"]).max().date()
-        return last_date < datetime.today().date()
-    except Exception:
-        return True
+    # Datele sunt la zi când ultima zi închisă (ieri) există deja
+    last = last_date(symbol)
+    return last is None or last < datetime.today().date() - timedelta(days=1)
+
+def update_data(symbol):
+    # True dacă au venit date noi și modelul trebuie reantrenat
+    if intraday.INTRADAY_RESOLUTION:
+        # Seria zilnică se completează din istoricul intraday (o singură descărcare)
+        return intraday.update(symbol) > 0
+    if not needs_update(symbol):
+        return False
+    print(f"🔁 Actualizez: {symbol}")
+    last = last_date(symbol)
+    if last is None:
+        return download_data_from_coingecko(symbol) is not None
+    return append_new_days(symbol, last) > 0
 
 def main():
-    updated = 0
-    for symbol in SYMBOLS:
-        if needs_update(symbol):
-            print(f"🔁 Actualizez: {symbol}")
-            df = download_data_from_coingecko(symbol)
-            if df is not None:
-                train_model(symbol)
-                updated += 1
+    options = train_orchestrator.cli_options("Actualizare zilnică a datelor și modelelor", global_mode=True)
+    if options.global_model:
+        # Modelul global se reantrenează pe toate simbolurile, dacă s-a schimbat ceva
+        updated = len(train_orchestrator.prepare(SYMBOLS, update_data, options.download_workers))
+        print(f"✅ Total simboluri cu date noi: {updated}")
+        global_model.train(SYMBOLS, force=options.fresh)
+        precompute_forecasts.precompute()
+        return
+    results = train_orchestrator.run(
+        "train_daily", SYMBOLS, train_model, prepare_fn=update_data,
+        workers=options.workers, tf_threads=options.tf_threads,
+        download_workers=options.download_workers, fresh=options.fresh,
+    )
+    # Simbolurile pe care manifestul le-a sărit (mode "skip") n-au fost reantrenate
+    updated = sum(1 for r in results.values() if r.get("status") == "ok" and r.get("mode") != "skip")
     print(f"✅ Total simboluri actualizate: {updated}")
+    # Modelele reantrenate au fost deja exportate; restul primesc .tflite dacă lipsește
+    lite_model.export_missing()
+    # Prognozele se recalculează doar pentru simbolurile cu model sau date noi
+    precompute_forecasts.precompute()
 
 if __name__ == "__main__":
     main()
-print(f"🏁 Script terminat la: {datetime.now()}")
+    print(f"🏁 Script terminat la: {datetime.now()}")
 
@@ -1,12 +1,15 @@
 import pandas as pd
-import numpy as np
-import os
+import lite_model
+import model_integrity
+import model_manifest
+import price_store
+import train_orchestrator
+import windowing
 from pathlib import Path
 from sklearn.preprocessing import MinMaxScaler
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
+from tensorflow.keras.models import Sequential, load_model
 from tensorflow.keras.layers import LSTM, Dense, Dropout
-import pandas_ta as ta
+from indicators import FEATURES, add_features
 
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
@@ -17,44 +20,18 @@ SCALERS_DIR = BASE_DIR / "scalers"
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 SCALERS_DIR.mkdir(parents=True, exist_ok=True)
 
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=period).mean()
-    avg_loss = pd.Series(loss).rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
 def prepare_features(df):
-    # Asigură că 'close' este numeric
-    df['price'] = pd.to_numeric(df['close'], errors='coerce')
+    # Asigură că prețul ('close' în exporturile vechi) este numeric
+    df['price'] = pd.to_numeric(df['close'] if 'close' in df.columns else df['price'], errors='coerce')
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.drop(columns=['col6', 'col7'], errors='ignore')
     df = df.dropna(subset=['price'])
 
     # Indicatori tehnici
-    df['sma_10'] = df['price'].rolling(window=10).mean()
-    df['sma_50'] = df['price'].rolling(window=50).mean()
-    df['rsi_14'] = compute_rsi(df['price'], 14)
-
-    macd = ta.macd(df['price'])
-    df['macd'] = macd['MACD_12_26_9']
-    df['macd_signal'] = macd['MACDs_12_26_9']
-    df['macd_hist'] = macd['MACDh_12_26_9']
-
-    df['volatility'] = df['price'].pct_change().rolling(window=20).std()
+    df = add_features(df.reset_index(drop=True))
     df = df.dropna().reset_index(drop=True)
 
-    features = ['price', 'sma_10', 'sma_50', 'rsi_14', 'macd_hist', 'volatility']
-    return df, features
-
-def create_sequences(data, lookback=30):
-    X, y = [], []
-    for i in range(lookback, len(data)):
-        X.append(data[i-lookback:i])
-        y.append(data[i][0])  # țintim price (prima coloană)
-    return np.array(X), np.array(y)
+    return df, FEATURES
 
 def build_model(input_shape):
     model = Sequential()
@@ -66,36 +43,68 @@ def build_model(input_shape):
     model.compile(optimizer='adam', loss='mse')
     return model
 
+def training_config(lookback=30, epochs=15, batch_size=32):
+    return {
+        "script": "train_lstm_pro",
+        "features": FEATURES,
+        "lookback": lookback,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "architecture": model_manifest.architecture(build_model((lookback, len(FEATURES)))),
+    }
+
 def train_symbol(symbol):
+    import joblib
+
     print(f"Starting training for {symbol}...")
 
-    data_path = DATA_DIR / f"{symbol}.csv"
-    if not data_path.exists():
-        print(f"Data file for {symbol} not found: {data_path}")
+    if not price_store.has(symbol, DATA_DIR):
+        print(f"Price data for {symbol} not found in {price_store.store_dir(DATA_DIR)}")
         return
 
-    df = pd.read_csv(data_path)
+    df = price_store.frame(symbol, DATA_DIR)
     df, features = prepare_features(df)
 
-    scaler = MinMaxScaler()
-    scaled_features = scaler.fit_transform(df[features])
-
-    lookback = 30
-    X, y = create_sequences(scaled_features, lookback=lookback)
-
-    model = build_model(input_shape=(X.shape[1], X.shape[2]))
-    model.fit(X, y, epochs=15, batch_size=32, verbose=2)
-
-    # Salvează modelul și scalerul
     model_path = MODELS_DIR / f"{symbol}_lstm_model.keras"
     scaler_path = SCALERS_DIR / f"{symbol}_lstm_scaler.save"
+    config = training_config()
+    plan = model_manifest.plan(symbol, df[features].values, df["price"], df["timestamp"].map(str), config,
+                               [model_path, scaler_path])
+    if plan.mode == "skip":
+        print(f"Skipping {symbol}: {plan.reason}")
+        return "skip"
+
+    if plan.mode == "warm":
+        scaler = joblib.load(scaler_path)
+        scaled_features = scaler.transform(df[features])
+        if scaled_features.min() < -0.25 or scaled_features.max() > 1.25:
+            plan.mode, plan.reason = "full", "new prices outside the scaler range"
+    if plan.mode == "full":
+        scaler = MinMaxScaler()
+        scaled_features = scaler.fit_transform(df[features])
+
+    # Țintim price (prima coloană); ferestrele se adună pe loturi, fără copia întregului X
+    train_data = windowing.dataset(scaled_features, config["lookback"], config["batch_size"])
+
+    if plan.mode == "warm":
+        # Fine-tune de la greutățile vechi în loc de inițializare aleatoare
+        model = load_model(model_path)
+        epochs = model_manifest.FINE_TUNE_EPOCHS
+    else:
+        model = build_model(input_shape=(config["lookback"], scaled_features.shape[1]))
+        epochs = config["epochs"]
+    history = model.fit(train_data, epochs=epochs, verbose=2)
 
+    # Salvează modelul și scalerul
     model.save(model_path)
     # Salvăm scalerul ca fișier joblib
-    import joblib
     joblib.dump(scaler, scaler_path)
+    model_manifest.record(plan, plan.mode, epochs, loss=float(history.history["loss"][-1]),
+                          integrity=model_integrity.fingerprint(model, model_path, scaler_path),
+                          lite=lite_model.try_export(model, model_path))
 
-    print(f"Finished training for {symbol} and saved model + scaler.")
+    print(f"Finished training for {symbol} ({plan.mode}: {plan.reason}) and saved model + scaler.")
+    return plan.mode
 
 if __name__ == "__main__":
     # Lista simbolurilor pentru care antrenăm
@@ -114,8 +123,8 @@ if __name__ == "__main__":
         'ftm_usd', 'icx', 'yfi', 'one', 'knc', 'near', 'ada_usd', 'ksm', 'dot', 'ankr'
     ]
 
-    for symbol in symbols:
-        try:
-            train_symbol(symbol)
-        except Exception as e:
-            print(f"Error training {symbol}: {e}")
+    options = train_orchestrator.cli_options("Train LSTM models for all symbols")
+    train_orchestrator.run(
+        "train_lstm_pro", symbols, train_symbol,
+        workers=options.workers, tf_threads=options.tf_threads, fresh=options.fresh,
+    )
@@ -0,0 +1,176 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+LOGS_DIR = BASE_DIR / "logs"
+
+# Antrenarea și descărcarea au limite separate: TRAIN_WORKERS procese în paralel,
+# fiecare cu TRAIN_TF_THREADS thread-uri TensorFlow, iar DOWNLOAD_WORKERS descărcări
+# simultane. Ritmul cererilor către CoinGecko îl impune token bucket-ul din
+# coingecko_client (COINGECKO_RATE / COINGECKO_BURST).
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+TRAIN_TF_THREADS = int(os.getenv("TRAIN_TF_THREADS", "2"))
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+
+
+def cli_options(description=None, global_mode=False):
+    parser = argparse.ArgumentParser(description=description)
+    if global_mode:
+        parser.add_argument("--global", dest="global_model", action="store_true",
+                            help="un singur model pentru toate simbolurile (global_model.py)")
+    parser.add_argument("--fresh", action="store_true", help="ignoră checkpoint-ul și reia toate simbolurile")
+    parser.add_argument("--workers", type=int, default=TRAIN_WORKERS)
+    parser.add_argument("--tf-threads", type=int, default=TRAIN_TF_THREADS)
+    parser.add_argument("--download-workers", type=int, default=DOWNLOAD_WORKERS)
+    return parser.parse_args()
+
+
+def _init_worker(tf_threads):
+    # Trebuie setat înainte ca TensorFlow să fie importat în procesul worker
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(tf_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ["OMP_NUM_THREADS"] = str(tf_threads)
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(tf_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _train_job(train_fn, symbol):
+    # train_fn poate întoarce modul folosit ("full", "warm", "skip") pentru rezumat
+    start = time.perf_counter()
+    mode = train_fn(symbol)
+    return time.perf_counter() - start, mode
+
+
+class Progress:
+    def __init__(self, name, symbols, fresh=False):
+        self.path = LOGS_DIR / f"{name}_progress.json"
+        self._lock = threading.Lock()
+        data = None if fresh else self._read()
+        if data is None or data.get("finished") or data.get("symbols") != list(symbols):
+            data = {"started": datetime.now().isoformat(timespec="seconds"), "symbols": list(symbols),
+                    "finished": False, "results": {}}
+        elif data["results"]:
+            done = sum(1 for r in data["results"].values() if r["status"] == "ok")
+            print(f"↩️  Reiau rularea din {data['started']}: {done}/{len(symbols)} simboluri deja gata")
+        self.data = data
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_done(self, symbol):
+        return self.data["results"].get(symbol, {}).get("status") == "ok"
+
+    def record(self, symbol, **fields):
+        with self._lock:
+            self.data["results"].setdefault(symbol, {}).update(fields)
+            self._save()
+
+    def finish(self):
+        with self._lock:
+            self.data["finished"] = True
+            self._save()
+
+    def _save(self):
+        LOGS_DIR.mkdir(exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def _prepare_job(prepare_fn, symbol):
+    start = time.perf_counter()
+    try:
+        ready = prepare_fn(symbol)
+    except Exception as e:
+        print(f"❌ {symbol}: {e}")
+        ready = False
+    return ready, round(time.perf_counter() - start, 2)
+
+
+def prepare(symbols, prepare_fn, download_workers=DOWNLOAD_WORKERS):
+    # Doar descărcarea, pentru modul global: întoarce simbolurile gata de antrenare
+    with ThreadPoolExecutor(max_workers=max(1, download_workers)) as downloads:
+        results = list(downloads.map(lambda s: _prepare_job(prepare_fn, s), symbols))
+    return [s for s, (ready, _) in zip(symbols, results) if ready]
+
+
+def run(name, symbols, train_fn, prepare_fn=None, workers=TRAIN_WORKERS, tf_threads=TRAIN_TF_THREADS,
+        download_workers=DOWNLOAD_WORKERS, fresh=False):
+    # prepare_fn (descărcarea) rulează pe thread-uri în procesul principal și întoarce
+    # True dacă simbolul trebuie antrenat; train_fn rulează în pool, deci trebuie să
+    # fie o funcție la nivel de modul. Fiecare simbol intră la antrenare imediat ce
+    # datele lui sunt gata.
+    progress = Progress(name, symbols, fresh)
+    pending = [s for s in symbols if not progress.is_done(s)]
+    wall_start = time.perf_counter()
+    print(f"🚀 {name}: {len(pending)} simboluri, {workers} workeri × {tf_threads} thread-uri TF")
+
+    def on_done(symbol, future):
+        try:
+            seconds, mode = future.result()
+            progress.record(symbol, status="ok", train_seconds=round(seconds, 2), mode=mode)
+            print(f"✅ {symbol} {'neschimbat' if mode == 'skip' else 'antrenat'} în {seconds:.1f}s")
+        except Exception as e:
+            progress.record(symbol, status="failed", error=str(e))
+            print(f"❌ {symbol}: {e}")
+
+    def submit(executor, symbol):
+        future = executor.submit(_train_job, train_fn, symbol)
+        future.add_done_callback(lambda f, s=symbol: on_done(s, f))
+
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(tf_threads,)) as executor:
+        # Datele pregătite într-o rulare întreruptă nu se mai descarcă încă o dată
+        to_prepare = []
+        for symbol in pending:
+            if prepare_fn is None or progress.data["results"].get(symbol, {}).get("prepared"):
+                submit(executor, symbol)
+            else:
+                to_prepare.append(symbol)
+
+        with ThreadPoolExecutor(max_workers=max(1, download_workers)) as downloads:
+            futures = {downloads.submit(_prepare_job, prepare_fn, s): s for s in to_prepare}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                ready, download_seconds = future.result()
+                if not ready:
+                    progress.record(symbol, status="skipped", download_seconds=download_seconds)
+                    continue
+                progress.record(symbol, status="training", prepared=True, download_seconds=download_seconds)
+                submit(executor, symbol)
+
+    progress.finish()
+    print_summary(progress.data["results"], symbols, time.perf_counter() - wall_start)
+    return progress.data["results"]
+
+
+def print_summary(results, symbols, wall_seconds):
+    print("\n📊 Rezumat antrenare:")
+    print(f"  {'simbol':<22}{'status':<10}{'mod':<6}{'download':>10}{'train':>10}")
+    total_train = 0.0
+    for symbol in symbols:
+        r = results.get(symbol, {})
+        train = r.get("train_seconds")
+        total_train += train or 0.0
+        download = r.get("download_seconds")
+        print(f"  {symbol:<22}{r.get('status', '-'):<10}{r.get('mode') or '-':<6}"
+              f"{'' if download is None else f'{download:.1f}s':>10}{'' if train is None else f'{train:.1f}s':>10}")
+    ok = sum(1 for r in results.values() if r.get("status") == "ok")
+    print(f"  {ok}/{len(symbols)} reușite, {wall_seconds:.1f}s total "
+          f"(suma timpilor de antrenare {total_train:.1f}s, x{total_train / max(wall_seconds, 1e-9):.1f} paralelism)")
@@ -1,26 +1,11 @@
-from tensorflow.keras.models import load_model
-from pathlib import Path
+from model_integrity import main
 
-MODELS_DIR = Path(__file__).parent / "models"
-valid_models = []
-invalid_models = []
+# Verificarea paralelă din model_integrity; raportul complet e în models/integrity_report.json
+#   python verify_models.py [--deep] [--adopt] [--workers N] [simboluri...]
 
-for model_file in MODELS_DIR.glob("*.keras"):
-    symbol = model_file.stem.replace("_lstm_model", "")
-    try:
-        model = load_model(model_file, compile=False)
-        valid_models.append(symbol)
-    except Exception as e:
-        invalid_models.append((symbol, str(e)))
+if __name__ == "__main__":
+    report = main("Verifică modelele și scrie lista celor funcționale")
 
-print("\n✅ Modele funcționale:")
-for s in sorted(valid_models):
-    print("  -", s)
-
-print("\n❌ Modele cu probleme:")
-for s, err in invalid_models:
-    print(f"  - {s} → {err[:60]}...")
-
-# Poți salva într-un fișier dacă vrei:
-with open("valid_symbols.txt", "w") as f:
-    f.write("\n".join(valid_models))
+    # Poți salva într-un fișier dacă vrei:
+    with open("valid_symbols.txt", "w") as f:
+        f.write("\n".join(report["valid"]))
@@ -0,0 +1,88 @@
+import asyncio
+import sys
+import time
+import solana_rpc_stub
+from payment_cache import PaymentCache
+from solana_rpc import SolanaRpc
+from solana_scan import SOLANA_SCAN_CONCURRENCY
+
+# Verifică PaymentCache pe serverul RPC local (solana_rpc_stub), numărând apelurile
+# RPC pe care le face fiecare verificare:  python verify_payment_cache.py
+# Scanarea cere tranzacțiile în paralel, așa că după o potrivire pot fi deja în zbor
+# până la SOLANA_SCAN_CONCURRENCY - 1 cereri în plus; getTransaction e verificat ca
+# limită superioară.
+
+PAID = "PaidWallet" + "1" * 34
+UNPAID = "UnpaidWallet" + "1" * 32
+
+
+def calls(ledger):
+    return dict(ledger.counts)
+
+
+def delta(before, after):
+    return {k: after[k] - before[k] for k in ("getSignaturesForAddress", "getTransaction")}
+
+
+async def run(server):
+    ledger = server.ledger
+    ledger.add_wallet(PAID, 40, paid_at=30)
+    ledger.add_wallet(UNPAID, 40)
+    rpc = SolanaRpc(server.url)
+    cache = PaymentCache(ttl=0.5, negative_ttl=0.2, negative_max=2)
+    results = []
+
+    async def step(name, wallet, expected, signature_calls, max_transactions):
+        before = calls(ledger)
+        paid = await cache.check(rpc, wallet)
+        used = delta(before, calls(ledger))
+        ok = (paid == expected and used["getSignaturesForAddress"] == signature_calls
+              and used["getTransaction"] <= max_transactions)
+        print(f"{'✅' if ok else '❌'} {name}: plătit={paid}, apeluri={used}")
+        results.append(ok)
+
+    extra = SOLANA_SCAN_CONCURRENCY - 1
+    await step("prima verificare (plătit)", PAID, True, 1, 31 + extra)
+    await step("cache pozitiv", PAID, True, 0, 0)
+    await step("prima verificare (neplătit)", UNPAID, False, 1, 40)
+    await step("cache negativ", UNPAID, False, 0, 0)
+
+    await asyncio.sleep(0.25)
+    ledger.add_transaction(UNPAID)
+    ledger.add_transaction(UNPAID, nrg=True)
+    await step("după TTL negativ: doar semnăturile noi (until=)", UNPAID, True, 1, 2)
+
+    await asyncio.sleep(0.55)
+    await step("după TTL pozitiv: reverificare completă", PAID, True, 1, 31 + extra)
+
+    # Cache-ul negativ e limitat: portofelele vechi ies din LRU
+    for i in range(5):
+        await cache.check(rpc, f"Empty{i}" + "1" * 38)
+    bounded = cache.stats()["negative_wallets"] <= 2
+    print(f"{'✅' if bounded else '❌'} cache negativ limitat: {cache.stats()}")
+    results.append(bounded)
+
+    # Verificările simultane ale aceluiași portofel fac o singură scanare
+    cache.invalidate(PAID)
+    before = calls(ledger)
+    answers = await asyncio.gather(*(cache.check(rpc, PAID) for _ in range(10)))
+    used = delta(before, calls(ledger))
+    ok = all(answers) and used["getSignaturesForAddress"] == 1
+    print(f"{'✅' if ok else '❌'} 10 verificări simultane: apeluri={used}")
+    results.append(ok)
+
+    await rpc.close()
+    return all(results)
+
+
+def main():
+    server = solana_rpc_stub.start()
+    start = time.perf_counter()
+    ok = asyncio.run(run(server))
+    server.shutdown()
+    print(f"{'✅ PaymentCache funcționează' if ok else '❌ PaymentCache a eșuat'} ({time.perf_counter() - start:.1f}s)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
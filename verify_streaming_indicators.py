@@ -0,0 +1,39 @@
+import sys
+import numpy as np
+from pathlib import Path
+import price_store
+from feature_store import FEATURES, compute_features
+from streaming_indicators import replay
+
+# Verifică faptul că starea incrementală reproduce calculul batch (pandas) pe
+# toate simbolurile din store-ul de prețuri:  python verify_streaming_indicators.py [rtol]
+
+DATA_DIR = Path(__file__).parent / "data"
+
+def check(symbol, rtol):
+    df = price_store.frame(symbol, DATA_DIR)
+    batch = compute_features(df.copy())[FEATURES].to_numpy()
+    _, rows = replay(df["price"].to_numpy(dtype=np.float64))
+    rows = rows[~np.isnan(rows).any(axis=1)]
+    if rows.shape != batch.shape:
+        return False, f"shape {rows.shape} != {batch.shape}"
+    # Eroare relativă la scara fiecărei coloane (MACD trece prin zero)
+    scale = np.maximum(np.max(np.abs(batch), axis=0), 1e-12)
+    err = np.max(np.abs(rows - batch) / scale)
+    return err <= rtol, f"max rel err {err:.2e}"
+
+def main():
+    rtol = float(sys.argv[1]) if len(sys.argv) > 1 else 1e-8
+    failed = []
+    for symbol in price_store.symbols(DATA_DIR):
+        ok, info = check(symbol, rtol)
+        print(f"{'✅' if ok else '❌'} {symbol}: {info}")
+        if not ok:
+            failed.append(symbol)
+    if failed:
+        print("❌ Diferențe la:", failed)
+        sys.exit(1)
+    print("✅ Indicatorii incrementali corespund calculului batch.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import importlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+MODELS_DIR = BASE_DIR / "models"
+SCALERS_DIR = BASE_DIR / "scalers"
+DATA_DIR = BASE_DIR / "data"
+
+# La pornire, înainte ca /ready să răspundă 200, încărcăm în registru cele mai cerute
+# WARMUP_TOP_N simboluri și rulăm câte un forward pe o fereastră de zerouri, ca
+# importul TensorFlow, încărcarea modelului și trace-ul tf.function să nu cadă pe
+# prima cerere. Ordinea vine din WARMUP_SYMBOLS (listă explicită) sau din numărul de
+# cereri per simbol din ultimele WARMUP_HITS_DAYS zile (logs/symbol_hits.json).
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "8"))
+WARMUP_SYMBOLS = [s.strip().lower() for s in os.getenv("WARMUP_SYMBOLS", "").split(",") if s.strip()]
+WARMUP_HITS_FILE = Path(os.getenv("WARMUP_HITS_FILE", str(BASE_DIR / "logs" / "symbol_hits.json")))
+WARMUP_HITS_DAYS = int(os.getenv("WARMUP_HITS_DAYS", "7"))
+WARMUP_HITS_SAVE_SECONDS = float(os.getenv("WARMUP_HITS_SAVE_SECONDS", "60"))
+# Fără istoric de cereri pornim cu simbolurile cele mai populare
+DEFAULT_ORDER = ["bitcoin", "ethereum", "solana", "ripple", "cardano", "dogecoin", "polkadot", "chainlink"]
+LOOKBACK = 30
+# Importuri leneșe de pe calea predicției (CSV-ul de predicții) plătite tot la warmup
+WARMUP_MODULES = ("pandas",)
+
+
+class SymbolHits:
+    # Cereri per simbol, pe zile; zilele mai vechi de `days` se aruncă la salvare
+    def __init__(self, path=WARMUP_HITS_FILE, days=WARMUP_HITS_DAYS, save_seconds=WARMUP_HITS_SAVE_SECONDS):
+        self.path = Path(path)
+        self.days = days
+        self.save_seconds = save_seconds
+        self._lock = threading.Lock()
+        self._counts = self._read()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {day: dict(counts) for day, counts in data.items() if isinstance(counts, dict)}
+
+    def record(self, symbol):
+        # True când e momentul unei salvări (apelantul o face în afara event loop-ului)
+        today = date.today().isoformat()
+        with self._lock:
+            day = self._counts.setdefault(today, {})
+            day[symbol] = day.get(symbol, 0) + 1
+            self._dirty = True
+            return time.monotonic() - self._saved_at >= self.save_seconds
+
+    def ranked(self):
+        oldest = (date.today() - timedelta(days=self.days - 1)).isoformat()
+        totals = {}
+        with self._lock:
+            for day, counts in self._counts.items():
+                if day >= oldest:
+                    for symbol, n in counts.items():
+                        totals[symbol] = totals.get(symbol, 0) + n
+        return sorted(totals, key=lambda s: (-totals[s], s))
+
+    def save(self):
+        oldest = (date.today() - timedelta(days=self.days - 1)).isoformat()
+        with self._lock:
+            if not self._dirty:
+                return
+            self._counts = {day: counts for day, counts in self._counts.items() if day >= oldest}
+            data = json.dumps(self._counts, indent=2, sort_keys=True)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(data)
+        os.replace(tmp, self.path)
+
+
+def choose_symbols(available, top_n=WARMUP_TOP_N, explicit=WARMUP_SYMBOLS, ranked=()):
+    available = set(available)
+    order = list(explicit) if explicit else [*ranked, *DEFAULT_ORDER, *sorted(available)]
+    chosen = []
+    for symbol in order:
+        if symbol in available and symbol not in chosen:
+            chosen.append(symbol)
+    return chosen if explicit else chosen[:top_n]
+
+
+class Warmup:
+    def __init__(self, models_dir=MODELS_DIR, scalers_dir=SCALERS_DIR, data_dir=DATA_DIR):
+        self.models_dir = models_dir
+        self.scalers_dir = scalers_dir
+        self.data_dir = data_dir
+        self.state = "pending"
+        self.symbols = []
+        self.warmed = []
+        self.failed = {}
+        self.started_at = None
+        self.seconds = None
+        self.symbol_seconds = {}
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def warm_symbol(self, symbol):
+        from feature_store import last_window
+        from forecast_engine import get_forward
+        from model_registry import registry
+
+        loaded = registry.get(symbol, self.models_dir, self.scalers_dir)
+        _, lookback, n_features = loaded.model.input_shape
+        # Forward pe zerouri: trace-ul are batch variabil, deci servește orice batch ulterior
+        get_forward(loaded.model)(np.zeros((1, lookback, n_features), dtype=np.float32))
+        # Reconstruiește .npy-ul de features dacă CSV-ul e mai nou, tot înainte de trafic
+        last_window(symbol, lookback, self.data_dir)
+
+    def run(self, symbols):
+        self.state = "warming"
+        self.symbols = list(symbols)
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        start = time.perf_counter()
+        if self.symbols:
+            for name in WARMUP_MODULES:
+                importlib.import_module(name)
+        for symbol in self.symbols:
+            t = time.perf_counter()
+            try:
+                self.warm_symbol(symbol)
+                self.warmed.append(symbol)
+            except Exception as e:
+                # Un model stricat nu blochează pornirea; îl servește (sau refuză) cererea
+                self.failed[symbol] = str(e)
+                print(f"⚠️  Warmup {symbol}: {e}")
+            self.symbol_seconds[symbol] = round(time.perf_counter() - t, 3)
+        self.seconds = round(time.perf_counter() - start, 3)
+        self.state = "ready"
+        self._ready.set()
+        print(f"🔥 Warmup: {len(self.warmed)}/{len(self.symbols)} modele în {self.seconds:.1f}s")
+
+    def start(self, symbols):
+        # În fundal: serverul acceptă deja / și /ready, dar /ready răspunde 503 până la final
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, args=(symbols,), name="warmup", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "symbols": self.symbols,
+            "warmed": len(self.warmed),
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "symbol_seconds": self.symbol_seconds,
+        }
+
+
+hits = SymbolHits()
+warmup = Warmup()
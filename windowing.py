@@ -0,0 +1,74 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Ferestrele de antrenare (lookback pași → prețul următor) fără copii: X e o vedere
+# sliding_window_view peste seria scalată, iar pipeline-ul tf.data amestecă doar
+# indicii ferestrelor și copiază din vedere câte un lot, la cerere. Memoria rămâne
+# O(serie) în loc de O(serie × lookback), ceea ce contează pe istoricele orare.
+
+
+def count(data, lookback=30):
+    return max(len(data) - lookback, 0)
+
+
+def windows(data, lookback=30, target_column=0):
+    # X[i] = data[i:i + lookback], y[i] = data[i + lookback, target_column]; ambele sunt vederi
+    data = np.asarray(data)
+    if count(data, lookback) == 0:
+        return np.empty((0, lookback, data.shape[1]), dtype=data.dtype), np.empty(0, dtype=data.dtype)
+    X = sliding_window_view(data[:-1], lookback, axis=0).transpose(0, 2, 1)
+    return X, data[lookback:, target_column]
+
+
+def dataset(data, lookback=30, batch_size=32, shuffle=True, seed=None, target_column=0):
+    # Loturi (X, y) ca model.fit(X, y, batch_size=..., shuffle=True), dar fără X materializat:
+    # se amestecă doar indicii ferestrelor, la fiecare epocă
+    import tensorflow as tf
+
+    series = np.ascontiguousarray(data, dtype=np.float32)
+    n = count(series, lookback)
+    if n == 0:
+        raise ValueError(f"prea puține rânduri ({len(series)}) pentru lookback {lookback}")
+    X, y = windows(series, lookback, target_column)
+
+    ds = tf.data.Dataset.range(n)
+    if shuffle:
+        ds = ds.shuffle(n, seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(lambda idx: _take(X, y, idx), num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def multi_dataset(series, lookback=30, batch_size=32, shuffle=True, seed=None, target_column=0):
+    # Ferestrele mai multor serii (câte una per simbol) într-un singur pipeline. Nicio
+    # fereastră nu trece granița dintre serii; lotul vine cu indicele seriei: ((X, ids), y)
+    import tensorflow as tf
+
+    series = [np.asarray(s, dtype=np.float32) for s in series]
+    counts = [count(s, lookback) for s in series]
+    if sum(counts) == 0:
+        raise ValueError(f"prea puține rânduri pentru lookback {lookback}")
+    offsets = np.cumsum([0] + [len(s) for s in series[:-1]])
+    starts = np.concatenate([offset + np.arange(n) for offset, n in zip(offsets, counts)]).astype(np.int64)
+    ids = np.repeat(np.arange(len(series), dtype=np.int32), counts)
+    # O singură vedere peste seriile lipite; starts păstrează doar ferestrele din interiorul unei serii
+    X, y = windows(np.concatenate(series), lookback, target_column)
+
+    def take(start, k):
+        batch, target = _take(X, y, start)
+        return (batch, k), target
+
+    ds = tf.data.Dataset.from_tensor_slices((starts, ids))
+    if shuffle:
+        ds = ds.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(take, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def _take(X, y, idx):
+    # Lotul X[idx], y[idx] copiat din vederi (numpy, în afara grafului); doar lotul se materializează
+    import tensorflow as tf
+
+    batch, target = tf.numpy_function(lambda i: (X[i], y[i]), [idx], (tf.float32, tf.float32))
+    batch.set_shape((None,) + X.shape[1:])
+    target.set_shape((None,))
+    return batch, target